@@ -0,0 +1,73 @@
+"""Allocations made per node while loading a large, valid config
+
+Reports the memory blocks and bytes still allocated per node after loading
+(with and without ``release_yaml_nodes``), and how many nodes share the empty
+error list::
+
+    python -m benchmarks.allocations [number of list items]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+import tracemalloc
+
+from configyaml.config.base import _NO_ERRORS
+
+from .schemas import Loader, generate_items
+
+
+class ReleasingLoader(Loader):
+    release_yaml_nodes = True
+
+
+def generate(items):
+    # most items have empty labels
+    return 'items:\n' + generate_items(items, empty_labels=True)
+
+
+def walk(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node._child_nodes())
+
+
+def measure(loader_class, text):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    loader = loader_class(text)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    assert loader.is_valid()
+
+    stats = after.compare_to(before, 'filename')
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    return loader, blocks, size
+
+
+def main(items=20000):
+    text = generate(items)
+
+    # the yaml node graph is kept by the tree, so it's counted too
+    loader, blocks, size = measure(Loader, text)
+
+    nodes = list(walk(loader.config_root))
+    shared_errors = sum(1 for node in nodes if node._errors is _NO_ERRORS)
+
+    print('{} nodes'.format(len(nodes)))
+    print('{:>10.1f} blocks/node'.format(blocks / float(len(nodes))))
+    print('{:>10.1f} bytes/node'.format(size / float(len(nodes))))
+    print('{:>10} nodes share the empty error list'.format(shared_errors))
+
+    del loader
+    loader, blocks, size = measure(ReleasingLoader, text)
+    print('with release_yaml_nodes:')
+    print('{:>10.1f} blocks/node'.format(blocks / float(len(nodes))))
+    print('{:>10.1f} bytes/node'.format(size / float(len(nodes))))
+
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,83 @@
+"""Import time of configyaml modules, from ``python -X importtime``
+
+Each run imports the module in a new interpreter, so nothing is imported
+already. Reports the modules that took the longest, counting what they
+imported::
+
+    python -m benchmarks.importtime [MODULE ...] [--runs N] [--limit N]
+    python -m benchmarks.importtime configyaml.cli --budget 150
+
+With ``--budget``, exits with 1 if importing any of the modules takes longer
+than that many milliseconds.
+"""
+from __future__ import division, print_function, unicode_literals
+
+import argparse
+import subprocess
+import sys
+
+
+def measure(module, runs=3):  # type: (str, int) -> dict
+    """The cumulative import time of every module imported by ``module``, in seconds
+
+    Each time is the best of ``runs`` interpreters, and ``module`` is in the
+    result with the time of the whole import. Modules the interpreter imported
+    before it (for ``site``) aren't.
+
+    :rtype: dict
+    """
+    best = {}
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+            stderr=subprocess.STDOUT,
+        ).decode('utf-8')
+
+        # each import is listed after the imports nested in it, indented deeper
+        imports = []
+        for line in output.splitlines():
+            if line.startswith('import time:') and 'cumulative' not in line:
+                _, cumulative, name = line[len('import time:'):].split('|')
+                nested = len(name) - len(name.lstrip()) > 1
+                imports.append((name.strip(), nested, int(cumulative) / 1e6))
+
+        # the last top level import is module, after the ones nested in it
+        for index, (name, nested, seconds) in enumerate(reversed(imports)):
+            if index and not nested:
+                break
+            if name not in best or seconds < best[name]:
+                best[name] = seconds
+
+    return best
+
+
+def print_slowest(module, times, limit):
+    print('{} {:.1f}ms'.format(module, times[module] * 1000))
+    slowest = sorted((x for x in times.items() if x[0] != module), key=lambda x: x[1], reverse=True)
+    for name, seconds in slowest[:limit]:
+        print('  {:<40} {:>8.1f}ms'.format(name, seconds * 1000))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=['configyaml', 'configyaml.loader', 'configyaml.validator', 'configyaml.cli'])
+    parser.add_argument('--runs', type=int, default=3, help='interpreters to take the best time of')
+    parser.add_argument('--limit', type=int, default=10, help='how many of the slowest imports to list')
+    parser.add_argument('--budget', type=float, help='fail if a module takes longer than this many ms to import')
+    args = parser.parse_args(argv)
+
+    over = []
+    for module in args.modules:
+        times = measure(module, args.runs)
+        print_slowest(module, times, args.limit)
+        if args.budget is not None and times[module] * 1000 > args.budget:
+            over.append(module)
+
+    for module in over:
+        print('{} takes longer than {}ms to import'.format(module, args.budget))
+
+    return 1 if over else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
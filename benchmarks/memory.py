@@ -0,0 +1,65 @@
+"""Memory used per config node, with and without __slots__
+
+Builds the same list of dicts with node classes that have a __dict__ (the
+library's classes, and subclasses of them) and with slotted subclasses of
+their ``Slotted`` variants, and reports the memory allocated per node::
+
+    python -m benchmarks.memory [number of list items]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+import tracemalloc
+
+from configyaml import config
+
+from .schemas import Items
+
+
+def rebuilt(cls, slots):
+    """``cls`` and its fields' classes, subclassing the configyaml classes directly
+
+    With ``slots`` every class subclasses the ``Slotted`` variant and declares
+    ``__slots__``, and without it none do.
+    """
+    base = next(c for c in cls.__mro__ if c.__module__.startswith('configyaml.'))
+    if slots:
+        base = getattr(config, 'Slotted' + base.__name__)
+    attributes = {'__slots__': ()} if slots else {}
+    if '_dict_fields' in vars(cls):
+        attributes['_dict_fields'] = dict(
+            (key, dict(field, **{'class': rebuilt(field['class'], slots)})) for key, field in cls._dict_fields.items()
+        )
+    if '_list_item_class' in vars(cls):
+        attributes['_list_item_class'] = rebuilt(cls._list_item_class, slots)
+    return type(str(cls.__name__), (base,), attributes)
+
+
+def measure(root_class, value):
+    """Return the bytes allocated per node when building value with root_class"""
+    # the value itself is allocated before measuring
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    root = root_class(value=value, context={})
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    nodes = 1 + len(root) * 3
+    return allocated / float(nodes)
+
+
+def main(items=20000):
+    value = [{'name': 'item {}'.format(i), 'count': i} for i in range(items)]
+
+    with_dict = measure(rebuilt(Items, slots=False), value)
+    slotted = measure(rebuilt(Items, slots=True), value)
+
+    print('{} nodes'.format(1 + items * 3))
+    print('{:<12} {:>10.1f} bytes/node'.format('__dict__', with_dict))
+    print('{:<12} {:>10.1f} bytes/node'.format('__slots__', slotted))
+    print('{:<12} {:>10.1f} bytes/node ({:.0%})'.format('saved', with_dict - slotted, 1 - slotted / with_dict))
+
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
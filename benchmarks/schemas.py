@@ -0,0 +1,55 @@
+"""The node classes and generated configs shared by the benchmarks
+
+A list of small mappings (``Items``), optionally under an ``items`` key
+(``Root``), is the shape most of the benchmarks measure.
+"""
+from __future__ import unicode_literals
+
+from configyaml.config import DictNode, IntegerNode, ListNode, StringNode, WildcardDictNode
+from configyaml.loader import ConfigLoader
+
+
+class Labels(WildcardDictNode):
+    _dict_fields = {
+        '*': {'class': StringNode},
+    }
+
+
+class Item(DictNode):
+    _dict_fields = {
+        'name': {'class': StringNode, 'required': True},
+        'count': {'class': IntegerNode},
+        'labels': {'class': Labels},
+    }
+
+
+class Items(ListNode):
+    _list_item_class = Item
+
+
+class Root(DictNode):
+    _dict_fields = {
+        'items': {'class': Items},
+    }
+
+
+class Loader(ConfigLoader):
+    config_root_class = Root
+
+
+def generate_items(size, invalid_every=0, empty_labels=False):
+    """A list of ``size`` items
+
+    Every ``invalid_every``-th count is a string (none are with 0). Every 10th
+    item has labels, and the others have empty ones with ``empty_labels``.
+    """
+    lines = []
+    for i in range(size):
+        invalid = invalid_every and i % invalid_every == 0
+        lines.append('- name: item {}'.format(i))
+        lines.append('  count: {}'.format('lots' if invalid else i))
+        if i % 10 == 0:
+            lines.append('  labels: {a: b, c: d}')
+        elif empty_labels:
+            lines.append('  labels: {}')
+    return '\n'.join(lines)
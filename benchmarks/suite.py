@@ -0,0 +1,298 @@
+"""Benchmarks of loading configs of different shapes, to catch performance regressions
+
+Each shape is a generated config (with some errors in it) and the node classes
+to load it with. For every shape this times loading, collecting ``errors``,
+``as_dict()`` and ``as_text()`` (the best of several runs), and measures the
+memory still allocated by a loaded config::
+
+    python -m benchmarks.suite [--size N] [--shape NAME ...]
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json [--threshold 1.25]
+
+With ``--compare``, exits with 1 if any time or memory result is more than
+``--threshold`` times the one in the baseline (run both on the same machine).
+"""
+from __future__ import division, print_function, unicode_literals
+
+import argparse
+import gc
+import json
+import sys
+import timeit
+import tracemalloc
+
+from configyaml.config import DictNode, IntegerNode, ListNode, StringNode
+from configyaml.loader import ConfigLoader
+
+from .schemas import Items, Labels, generate_items
+
+
+class WideLoader(ConfigLoader):
+    config_root_class = Labels
+
+
+def generate_wide(size):
+    """A single wildcard mapping with ``size`` keys"""
+    lines = []
+    for i in range(size):
+        # every 50th value is a list, which isn't a valid string
+        lines.append('key{}: {}'.format(i, '[x]' if i % 50 == 0 else 'value {}'.format(i)))
+    return '\n'.join(lines)
+
+
+class Nested(DictNode):
+    pass
+
+
+# refers to itself, so declared after the class
+Nested._dict_fields = {
+    'name': {'class': StringNode},
+    'count': {'class': IntegerNode},
+    'child': {'class': Nested},
+}
+
+
+class Chains(ListNode):
+    _list_item_class = Nested
+
+
+class DeepLoader(ConfigLoader):
+    config_root_class = Chains
+
+
+def generate_deep(size, depth=50):
+    """Chains of mappings nested ``depth`` levels deep, about ``size`` nodes in total"""
+    lines = []
+    for chain in range(max(size // (depth * 3), 1)):
+        for level in range(depth):
+            indent = '  ' * (level + 1)
+            lines.append('{}name: level {}'.format('- ' if level == 0 else indent, level))
+            # the last level's count is a string
+            lines.append('{}count: {}'.format(indent, 'many' if level == depth - 1 else level))
+            if level < depth - 1:
+                lines.append('{}child:'.format(indent))
+    return '\n'.join(lines)
+
+
+def generate_nesting(size):
+    """Chains of mappings nested as many levels deep as the recursion limit"""
+    return generate_deep(size, depth=sys.getrecursionlimit())
+
+
+class LongLoader(ConfigLoader):
+    config_root_class = Items
+
+
+def generate_long(size):
+    """A list of ``size`` small mappings"""
+    # every 50th count is a string
+    return generate_items(size, invalid_every=50)
+
+
+class Strings(ListNode):
+    _list_item_class = StringNode
+
+
+class VariablesLoader(ConfigLoader):
+    config_root_class = Strings
+
+
+VARIABLES = dict(('var{}'.format(i), 'value {}'.format(i)) for i in range(100))
+
+
+def generate_variables(size):
+    """A list of ``size`` strings, most of them variables (some undefined)"""
+    lines = []
+    for i in range(size):
+        if i % 50 == 0:
+            lines.append('- $missing{}'.format(i))
+        elif i % 5:
+            lines.append('- $var{}'.format(i % 100))
+        else:
+            lines.append('- plain {}'.format(i))
+    return '\n'.join(lines)
+
+
+class Dependency(DictNode):
+    _dict_fields = {
+        'name': {'class': StringNode, 'required': True},
+    }
+
+
+class Dependencies(ListNode):
+    _list_item_class = Dependency
+
+
+class DependencyName(StringNode):
+    """A reference to a dependency, checked against the injected context"""
+    def _validate_value(self):
+        if self._value not in self._context.get('dependency_names', ()):
+            self._add_error(title='Unknown dependency', description='Must be the name of a dependency')
+
+
+class Notification(DictNode):
+    _dict_fields = {
+        'dependency': {'class': DependencyName, 'required': True},
+        'channel': {'class': StringNode},
+    }
+
+
+class Notifications(ListNode):
+    _list_item_class = Notification
+
+
+class ContextRoot(DictNode):
+    _dict_fields = {
+        'dependencies': {'class': Dependencies, 'default': []},
+        'notifications': {'class': Notifications, 'default': []},
+    }
+
+    def _context_to_inject(self):
+        return {'dependency_names': set(d.name._value for d in self.dependencies._children)}
+
+
+class ContextLoader(ConfigLoader):
+    config_root_class = ContextRoot
+
+
+def generate_context(size):
+    """Half dependencies, half notifications referring to them (through context)"""
+    half = max(size // 2, 1)
+    lines = ['dependencies:']
+    for i in range(half):
+        lines.append('- name: dep{}'.format(i))
+    lines.append('notifications:')
+    for i in range(half):
+        # every 50th refers to a dependency that doesn't exist
+        lines.append('- dependency: dep{}'.format(i + half if i % 50 == 0 else i))
+        lines.append('  channel: chan{}'.format(i % 7))
+    return '\n'.join(lines)
+
+
+# name: (loader class, generate(size), loader keyword arguments)
+SHAPES = {
+    'wide': (WideLoader, generate_wide, {}),
+    'deep': (DeepLoader, generate_deep, {}),
+    'nesting': (DeepLoader, generate_nesting, {}),
+    'long': (LongLoader, generate_long, {}),
+    'variables': (VariablesLoader, generate_variables, {'variables': VARIABLES}),
+    'context': (ContextLoader, generate_context, {}),
+}
+
+
+def count_nodes(loader):
+    count = 0
+    stack = [loader.config_root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node._child_nodes())
+    return count
+
+
+def best_time(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def run_shape(name, size, repeat=5):  # type: (str, int, int) -> dict
+    """Time and measure one shape, returning the results by metric"""
+    loader_class, generate, kwargs = SHAPES[name]
+    text = generate(size)
+
+    def load():
+        return loader_class(text, **dict(kwargs))
+
+    loader = load()
+    assert loader.config_root is not None, 'the {} config should load'.format(name)
+
+    def errors():
+        loader.invalidate_errors()
+        return loader.errors
+
+    results = {
+        'nodes': count_nodes(loader),
+        'errors': len(loader.errors),
+        'load_seconds': best_time(load, repeat),
+        'errors_seconds': best_time(errors, repeat),
+        'as_dict_seconds': best_time(loader.as_dict, repeat),
+        'as_text_seconds': best_time(loader.as_text, repeat),
+    }
+
+    del loader
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    loader = load()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results['retained_bytes'] = current - before
+    results['peak_bytes'] = peak - before
+    return results
+
+
+def run(shapes, size, repeat=5):  # type: (list, int, int) -> dict
+    return dict((name, run_shape(name, size, repeat)) for name in shapes)
+
+
+# the results compared against a baseline (the others describe the config)
+COMPARED = ('load_seconds', 'errors_seconds', 'as_dict_seconds', 'as_text_seconds', 'retained_bytes', 'peak_bytes')
+
+
+def compare(results, baseline, threshold):  # type: (dict, dict, float) -> list
+    """Return (shape, metric, ratio) for each result over ``threshold`` times the baseline"""
+    regressions = []
+    for name, metrics in sorted(results.items()):
+        for metric in COMPARED:
+            previous = baseline.get(name, {}).get(metric)
+            if previous:
+                ratio = metrics[metric] / previous
+                if ratio > threshold:
+                    regressions.append((name, metric, ratio))
+    return regressions
+
+
+def print_results(results):
+    print('{:<10} {:>7} {:>6} {:>9} {:>9} {:>9} {:>9} {:>10} {:>10}'.format(
+        'shape', 'nodes', 'errors', 'load', 'errors', 'as_dict', 'as_text', 'bytes', 'peak'))
+    for name, r in sorted(results.items()):
+        print('{:<10} {:>7} {:>6} {:>8.1f}ms {:>8.1f}ms {:>8.1f}ms {:>8.1f}ms {:>10} {:>10}'.format(
+            name, r['nodes'], r['errors'],
+            r['load_seconds'] * 1000, r['errors_seconds'] * 1000,
+            r['as_dict_seconds'] * 1000, r['as_text_seconds'] * 1000,
+            r['retained_bytes'], r['peak_bytes'],
+        ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=5000, help='roughly the number of nodes in each config')
+    parser.add_argument('--repeat', type=int, default=5, help='runs to take the best time of')
+    parser.add_argument('--shape', action='append', choices=sorted(SHAPES), help='only run these shapes')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='compare with the results in this JSON file')
+    parser.add_argument('--threshold', type=float, default=1.25, help='the ratio to the baseline that fails --compare')
+    args = parser.parse_args(argv)
+
+    results = run(args.shape or sorted(SHAPES), args.size, args.repeat)
+    print_results(results)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        regressions = compare(results, baseline, args.threshold)
+        for name, metric, ratio in regressions:
+            print('{} {} is {:.2f}x the baseline'.format(name, metric, ratio))
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,29 @@
 # -*- coding: utf-8 -*-
-import pkg_resources
+import sys
 
 
 __author__ = """Dropseed"""
 __email__ = 'python@dropseed.io'
-__version__ = pkg_resources.get_distribution("configyaml").version
+
+
+def _get_version():  # type: () -> str
+    try:
+        from importlib.metadata import version
+    except ImportError:  # python < 3.8
+        import pkg_resources
+        return pkg_resources.get_distribution('configyaml').version
+
+    return version('configyaml')
+
+
+if sys.version_info >= (3, 7):
+    # looked up on first use, since reading package metadata is slow
+    def __getattr__(name):
+        if name == '__version__':
+            global __version__
+            __version__ = _get_version()
+            return __version__
+
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+else:
+    __version__ = _get_version()
@@ -0,0 +1,391 @@
+from __future__ import unicode_literals
+import hashlib
+import marshal
+import os
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+import yaml
+
+from .config.base import _copy_value
+from .parser import parse
+
+
+class LoadedConfig(namedtuple('LoadedConfig', [
+    'config_dict',
+    'config_root',
+    'errors',
+    'positions',
+    'injected_context',
+])):
+    """What a loader loaded, as kept by :class:`LoadCache`"""
+    __slots__ = ()
+
+    def copy(self, context, variables):  # type: (dict, dict) -> LoadedConfig
+        """A copy of the config dict and tree, for a loader with this context and variables
+
+        The nodes use ``context`` instead of the one they were built with, and
+        the injected context refers to the copied nodes.
+
+        :rtype: :LoadedConfig:
+        """
+        memo = {}
+        config_root = self.config_root._copy_tree(context, variables, memo) if self.config_root is not None else None
+        return LoadedConfig(
+            config_dict=_copy_value(self.config_dict, memo),
+            config_root=config_root,
+            errors=self.errors,
+            positions=self.positions,
+            injected_context=_copy_value(self.injected_context, memo),
+        )
+
+
+class LoadCache(object):
+    """A bounded, least recently used cache of loaded configs
+
+    Set an instance as ``load_cache`` on a ConfigLoader subclass to share it by
+    every instance of the class::
+
+        class MyLoader(ConfigLoader):
+            config_root_class = Root
+            load_cache = LoadCache(maxsize=64)
+
+    Configs are keyed on the loader class, a hash of the text, and the context
+    and variables they were loaded with. A hit skips parsing and validation,
+    and gives the loader its own copy of the cached config dict and tree
+    (see :meth:`LoadedConfig.copy`), which is much faster than loading it. The
+    cache keeps a copy too, so changes to a loaded tree don't reach it.
+    """
+    def __init__(self, maxsize=128, max_bytes=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes  # limit on the total length of cached texts
+
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key_for(self, loader):  # type: (ConfigLoader) -> tuple
+        """The key for a loader's text, context and variables, before it's loaded
+
+        :rtype: tuple
+        """
+        text_hash = hashlib.sha1(loader.config_text.encode('utf-8')).hexdigest()
+        return (type(loader), text_hash, fingerprint(loader.context), fingerprint(loader.variables))
+
+    def get(self, key):  # type: (tuple) -> LoadedConfig
+        """Return the cached config for the key, or None
+
+        :rtype: :LoadedConfig:
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            # most recently used last
+            del self._entries[key]
+            self._entries[key] = entry
+            return entry
+
+    def put(self, key, entry, size=0):  # type: (tuple, LoadedConfig, int) -> None
+        """Cache a loaded config, evicting the least recently used ones if needed"""
+        with self._lock:
+            if key in self._entries:
+                del self._entries[key]
+                self.size -= self._sizes.pop(key)
+
+            self._entries[key] = entry
+            self._sizes[key] = size
+            self.size += size
+
+            while self._entries and (
+                len(self._entries) > self.maxsize or (self.max_bytes is not None and self.size > self.max_bytes)
+            ):
+                evicted_key, _ = self._entries.popitem(last=False)
+                self.size -= self._sizes.pop(evicted_key)
+                self.evictions += 1
+
+    def clear(self):  # type: () -> None
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.size = 0
+
+    def stats(self):  # type: () -> dict
+        """Counts of hits, misses and evictions, and the current entries and size
+
+        :rtype: dict
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / float(lookups) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size': self.size,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _Identity(object):
+    """Hashes and compares an unhashable object by identity, keeping it alive"""
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __hash__(self):
+        return id(self.obj)
+
+    def __eq__(self, other):
+        return isinstance(other, _Identity) and other.obj is self.obj
+
+    def __ne__(self, other):
+        return not self == other
+
+
+def fingerprint(value):  # type: (Any) -> Hashable
+    """A hashable value that is equal for equal contexts or variables
+
+    Dicts, lists, tuples and sets are compared by content; any other value that
+    can't be hashed is compared by identity.
+    """
+    if isinstance(value, dict):
+        return frozenset((k, fingerprint(v)) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(fingerprint(v) for v in value)
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(fingerprint(v) for v in value)
+
+    try:
+        hash(value)
+    except TypeError:
+        return _Identity(value)
+
+    return value
+
+
+# bump when the layout of the files written by ParseCache changes
+_PARSE_CACHE_FORMAT = 1
+_SCALAR, _SEQUENCE, _MAPPING = 0, 1, 2
+_MARK_NAME = '<unicode string>'
+
+# os.rename won't replace an existing file on Windows
+_replace = getattr(os, 'replace', os.rename)
+
+
+class ParseCache(object):
+    """A directory of parsed YAML, to skip parsing texts seen by earlier processes
+
+    Set an instance as ``parse_cache`` on a ConfigLoader subclass::
+
+        class MyLoader(ConfigLoader):
+            config_root_class = Root
+            parse_cache = ParseCache('.configyaml-cache')
+
+    Each text gets a file named for a hash of the text and the versions of
+    python, PyYAML and configyaml, holding the node tree (with its marks) and,
+    when marshal can write it, the data. Files are written atomically, and any
+    file that can't be read back is deleted and the text parsed again.
+    Validation still runs on every load.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def parse(self, config_text, backend=None, timings=None):  # type: (str, str, LoadTimings) -> tuple
+        """Parse like :func:`configyaml.parser.parse`, reading and writing the cache
+
+        :rtype: tuple of (data, yaml.Node)
+        """
+        key = self.key_for(config_text)
+        path = self.path_for(key)
+
+        cached = self._read(path, key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        data, node = parse(config_text, backend=backend, timings=timings)
+        if node is not None:
+            self._write(path, key, data, node)
+
+        return data, node
+
+    def key_for(self, config_text):  # type: (str) -> str
+        """The hash of the text and everything that affects how it's parsed
+
+        :rtype: str
+        """
+        from . import __version__
+
+        key = hashlib.sha1()
+        versions = '{}:{}:{}:{}:{}'.format(
+            _PARSE_CACHE_FORMAT,
+            marshal.version,
+            '.'.join(str(x) for x in sys.version_info[:2]),
+            yaml.__version__,
+            __version__,
+        )
+        key.update(versions.encode('utf-8'))
+        key.update(b'\0')
+        key.update(config_text.encode('utf-8'))
+        return key.hexdigest()
+
+    def path_for(self, key):  # type: (str) -> str
+        return os.path.join(self.directory, key + '.marshal')
+
+    def clear(self):  # type: () -> None
+        """Delete every cached file"""
+        if not os.path.isdir(self.directory):
+            return
+
+        for name in os.listdir(self.directory):
+            if name.endswith('.marshal'):
+                _remove(os.path.join(self.directory, name))
+
+    def stats(self):  # type: () -> dict
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+        }
+
+    def _read(self, path, key):
+        try:
+            with open(path, 'rb') as f:
+                contents = f.read()
+        except (IOError, OSError):
+            return None
+
+        try:
+            stored_key, has_data, data, records = marshal.loads(contents)
+            if stored_key != key:
+                raise ValueError('Cache file is for different text')
+
+            node = _nodes_from_records(records)
+            if not has_data:
+                data = yaml.constructor.SafeConstructor().construct_document(node)
+        except Exception:
+            # truncated or otherwise corrupt, whatever marshal made of it
+            self.errors += 1
+            _remove(path)
+            return None
+
+        return data, node
+
+    def _write(self, path, key, data, node):
+        try:
+            contents = marshal.dumps((key, True, data, _records_from_nodes(node)))
+        except ValueError:
+            # values marshal can't write (like dates) are constructed from the nodes instead
+            contents = marshal.dumps((key, False, None, _records_from_nodes(node)))
+
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+        except OSError:
+            pass  # made by another process, or reported below
+
+        import tempfile  # slow to import, and only needed once there's something to write
+
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        except OSError:
+            self.errors += 1
+            return
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(contents)
+            _replace(temp_path, path)
+        except (IOError, OSError):
+            self.errors += 1
+            _remove(temp_path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _records_from_nodes(root):
+    """Flatten a yaml node graph into tuples of builtins, keeping aliased nodes shared
+
+    Each node is (kind, tag, value, start mark, end mark), with children referred
+    to by their position in the list and marks as (index, line, column).
+    """
+    indexes = {}
+    nodes = []
+
+    def index_of(node):
+        index = indexes.get(id(node))
+        if index is None:
+            index = indexes[id(node)] = len(nodes)
+            nodes.append(node)
+        return index
+
+    index_of(root)
+    records = []
+    # nodes grows as children are found
+    for node in nodes:
+        if isinstance(node, yaml.MappingNode):
+            kind = _MAPPING
+            value = tuple((index_of(k), index_of(v)) for k, v in node.value)
+        elif isinstance(node, yaml.SequenceNode):
+            kind = _SEQUENCE
+            value = tuple(index_of(x) for x in node.value)
+        else:
+            kind = _SCALAR
+            value = node.value
+
+        start, end = node.start_mark, node.end_mark
+        records.append((
+            kind,
+            node.tag,
+            value,
+            (start.index, start.line, start.column),
+            (end.index, end.line, end.column),
+        ))
+
+    return records
+
+
+def _nodes_from_records(records):  # type: (list) -> yaml.Node
+    nodes = []
+    for kind, tag, value, start, end in records:
+        start_mark = yaml.Mark(_MARK_NAME, start[0], start[1], start[2], None, None)
+        end_mark = yaml.Mark(_MARK_NAME, end[0], end[1], end[2], None, None)
+        if kind == _MAPPING:
+            nodes.append(yaml.MappingNode(tag, value, start_mark, end_mark))
+        elif kind == _SEQUENCE:
+            nodes.append(yaml.SequenceNode(tag, value, start_mark, end_mark))
+        else:
+            nodes.append(yaml.ScalarNode(tag, value, start_mark, end_mark))
+
+    # collections hold child indexes until every node exists
+    for node in nodes:
+        if isinstance(node, yaml.MappingNode):
+            node.value = [(nodes[k], nodes[v]) for k, v in node.value]
+        elif isinstance(node, yaml.SequenceNode):
+            node.value = [nodes[x] for x in node.value]
+
+    return nodes[0]
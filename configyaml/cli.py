@@ -1,14 +1,184 @@
 # -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import glob
+import importlib
+import io
+import json
+import multiprocessing
+import sys
 
 import click
 
+from .cache import ParseCache
+from .loader import ConfigLoader
+from .timings import LoadTimings
+from .validator import ConfigValidator, ValidationStats, validate_many
+
+
+def import_class(path):  # type: (str) -> type
+    """Import a class from a dotted path, as ``package.module.Class`` or ``package.module:Class``
+
+    :rtype: type
+    """
+    if ':' in path:
+        module_name, class_name = path.split(':', 1)
+    else:
+        module_name, _, class_name = path.rpartition('.')
+
+    if not module_name or not class_name:
+        raise ValueError('"{}" is not a dotted path to a class'.format(path))
+
+    module = importlib.import_module(module_name)
+    try:
+        return getattr(module, class_name)
+    except AttributeError:
+        raise ValueError('Module "{}" has no class "{}"'.format(module_name, class_name))
+
+
+def loader_for(cls):  # type: (type) -> tuple
+    """The ConfigLoader class and context to check files with, for a loader or validator class
+
+    :rtype: tuple of (ConfigLoader subclass, dict)
+    """
+    if isinstance(cls, type) and issubclass(cls, ConfigValidator):
+        if not cls.context:
+            raise ValueError('context must be defined in subclasses of ConfigValidator')
+        return cls.configyaml_class, cls.context
+
+    if isinstance(cls, type) and issubclass(cls, ConfigLoader):
+        return cls, {}
+
+    raise ValueError('{} is not a subclass of ConfigLoader or ConfigValidator'.format(cls))
+
+
+def expand_paths(patterns):  # type: (Iterable[str]) -> list
+    """Expand glob patterns (``**`` included), keeping other paths as they are
+
+    :rtype: list of str
+    """
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        if any(c in pattern for c in '*?['):
+            try:
+                matches = sorted(glob.glob(pattern, recursive=True))
+            except TypeError:  # python 2, without ** support
+                matches = sorted(glob.glob(pattern))
+        else:
+            matches = [pattern]
+
+        for path in matches:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+
+    return paths
+
+
+# loader subclasses with a ParseCache or timings, made once per process
+_loader_classes = {}
+
+
+class FileLoads(object):
+    """Loads a file with the loader class the CLI was given
+
+    Called by :func:`configyaml.validator.validate_many` in the worker
+    processes, with the path of each file.
+    """
+    def __init__(self, loader_class, context, cache_dir=None, timings=False):
+        self.loader_class = loader_class
+        self.context = context
+        self.cache_dir = cache_dir
+        self.timings = timings
+
+    def __call__(self, path):  # type: (str) -> ConfigLoader
+        with io.open(path, encoding='utf-8') as f:
+            config_text = f.read()
+
+        return self.subclass()(config_text, context=dict(self.context))
+
+    def subclass(self):  # type: () -> type
+        """The loader class, with the parse cache and timings the CLI was asked for
+
+        :rtype: type
+        """
+        if not self.cache_dir and not self.timings:
+            return self.loader_class
+
+        key = (self.loader_class, self.cache_dir, self.timings)
+        if key not in _loader_classes:
+            attributes = {}
+            if self.cache_dir:
+                attributes['parse_cache'] = ParseCache(self.cache_dir)
+            if self.timings:
+                attributes['timings_class'] = LoadTimings
+            _loader_classes[key] = type(self.loader_class.__name__, (self.loader_class,), attributes)
+
+        return _loader_classes[key]
+
 
 @click.command()
-def main(args=None):
-    """Console script for configyaml"""
-    click.echo("Replace this message by putting your code into "
-               "configyaml.cli.main")
-    click.echo("See click documentation at http://click.pocoo.org/")
+@click.argument('config_class')
+@click.argument('files', nargs=-1, required=True)
+@click.option('--jobs', '-j', type=int, default=None, help='Processes to check files with (defaults to the number of CPUs).')
+@click.option('--output', type=click.Choice(['text', 'json']), default='text', help='Annotated text of invalid files, or a JSON line per file.')
+@click.option('--include-text', is_flag=True, help='Include the text of each file (config_text) in the JSON output.')
+@click.option('--cache-dir', default=None, type=click.Path(file_okay=False), help='Keep parsed YAML in this directory between runs.')
+@click.option('--timings', is_flag=True, help='Report how long each file, and the whole run, took.')
+def main(config_class, files, jobs, output, include_text, cache_dir, timings):
+    """Validate FILES (paths or glob patterns) with CONFIG_CLASS
+
+    CONFIG_CLASS is the dotted path to a ConfigLoader or ConfigValidator
+    subclass, like ``mypackage.config.Loader`` or ``mypackage.config:Loader``.
+    Exits with 1 when any file has errors.
+    """
+    try:
+        loader_class, context = loader_for(import_class(config_class))
+    except (ImportError, ValueError) as e:
+        raise click.BadParameter(str(e), param_hint='CONFIG_CLASS')
+
+    paths = expand_paths(files)
+    if not paths:
+        raise click.BadParameter('No files matched', param_hint='FILES')
+
+    if jobs is None:
+        jobs = multiprocessing.cpu_count()
+    jobs = max(1, min(jobs, len(paths)))
+
+    stats = ValidationStats()
+    load_timings = LoadTimings() if timings else None
+    results = validate_many(
+        FileLoads(loader_class, context, cache_dir=cache_dir, timings=timings),
+        paths,
+        workers=jobs,
+        chunksize=1,
+        stats=stats,
+        include_text=output == 'text',
+        json_options={'include_text': include_text, 'default': str} if output == 'json' else None,
+    )
+
+    for result in results:
+        path = paths[result.index]
+        if result.read_error is not None:
+            click.echo('{}: could not be read: {}'.format(path, result.read_error), err=True)
+        elif output == 'json':
+            # the path goes first in the object iter_json wrote
+            click.echo('{{"path": {}, {}'.format(json.dumps(path), result.json[1:]))
+        elif result.errors:
+            click.echo('{}: {} error(s)'.format(path, len(result.errors)))
+            click.echo(result.text)
+
+        if result.timings is not None:
+            load_timings.merge(result.timings)
+            click.echo('{:.4f}s {}'.format(result.timings['phases']['load']['seconds'], path), err=True)
+
+    click.echo('Checked {} file(s), {} with errors ({} error(s))'.format(stats.count, stats.invalid, stats.errors), err=True)
+    if timings:
+        click.echo(load_timings.report(), err=True)
+        click.echo('{:.3f}s total, {:.1f} files/s with {} job(s)'.format(stats.elapsed, stats.per_second, jobs), err=True)
+
+    sys.exit(1 if stats.invalid else 0)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 from .base import AbstractNode
-from .list import ListNode
-from .dict import DictNode
-from .choice import ChoiceNode
+from .list import ListNode, SlottedListNode
+from .dict import DictNode, SlottedDictNode
+from .choice import ChoiceNode, SlottedChoiceNode
 from .nodes import (
     IntegerNode,
     PositiveIntegerNode,
@@ -10,4 +10,11 @@ from .nodes import (
     WildcardDictNode,
     TypelessNode,
     RegexNode,
+    SlottedIntegerNode,
+    SlottedPositiveIntegerNode,
+    SlottedBoolNode,
+    SlottedStringNode,
+    SlottedWildcardDictNode,
+    SlottedTypelessNode,
+    SlottedRegexNode,
 )
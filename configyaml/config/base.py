@@ -1,14 +1,198 @@
+import threading
+
 from ..errors import ConfigError
+from ..positions import Position
+
+try:
+    from types import MappingProxyType
+except ImportError:  # python 2
+    MappingProxyType = dict
+
+
+# shared by every node without errors, replaced by a list on the first _add_error
+_NO_ERRORS = ()
+# shared by the empty lookups of nodes, like the key index of a DictNode that isn't a mapping
+_EMPTY_MAPPING = MappingProxyType({})
+# holds the SubtreeReuse (see reuse.py) while a tree is rebuilt for edited text
+_rebuild = threading.local()
+# holds the LoadTimings (see timings.py) of the tree being built, when timing is on
+_timing = threading.local()
+# lazy is True while ConfigLoader builds the root of a lazy tree
+_lazy_build = threading.local()
+
+
+class _ChildQueue(list):
+    """Children created by a container that its _build_children hasn't built yet"""
+    __slots__ = ()
+
+
+def _as_node_list(children):
+    if isinstance(children, (list, tuple)):
+        return list(children)
+    elif children:
+        return list(children.values())
+
+    return []
+
+
+def _copy_value(value, memo):  # type: (Any, dict) -> Any
+    """Copy the dicts and lists of a loaded value, sharing everything else
+
+    ``memo`` maps the ids of originals to their copies, like it does for
+    ``copy.deepcopy``, so a value shared by two places is copied once. It can
+    hold copied nodes too, which replace the originals found in the value.
+    Walks with a stack, so deep values don't recurse.
+    """
+    if type(value) not in (dict, list):
+        return memo.get(id(value), value)
+
+    copied = memo.get(id(value))
+    if copied is not None:
+        return copied
+
+    copied = memo[id(value)] = type(value)()
+    stack = [(value, copied)]
+    while stack:
+        original, copied = stack.pop()
+        items = original.items() if type(original) is dict else enumerate(original)
+        for key, item in items:
+            if type(item) in (dict, list):
+                item_copy = memo.get(id(item))
+                if item_copy is None:
+                    item_copy = memo[id(item)] = type(item)()
+                    stack.append((item, item_copy))
+            else:
+                item_copy = memo.get(id(item), item)
+
+            if type(copied) is dict:
+                copied[key] = item_copy
+            else:
+                copied.append(item_copy)
+
+    return memo[id(value)]
+
 
+# slots that _copy_tree sets itself (and those that aren't attributes)
+_SLOTS_NOT_COPIED = frozenset((
+    '__dict__',
+    '__weakref__',
+    '_parent',
+    '_shared_context',
+    '_variables',
+    '_original_value',
+    '_value',
+    '_errors',
+    '_children',
+    '_timings',
+))
 
-class AbstractNode(object):
+
+class NodeMeta(type):
+    """Compiles the schema a node class declares, once, when the class is created
+
+    A class declares its schema with the class attributes named in
+    ``_schema_attributes`` (``_dict_fields`` for a DictNode, for example), so
+    mistakes in the declaration are raised as soon as the class is defined.
+    Declarations made on the instance in ``__init__`` are compiled the first
+    time they are used, and reused by the following instances.
+
+    A node class can't have a metaclass that isn't derived from this one, so
+    to use another (like ``abc.ABCMeta``), derive one from both::
+
+        class ABCNodeMeta(NodeMeta, abc.ABCMeta):
+            pass
+
+        class Check(StringNode, metaclass=ABCNodeMeta):
+            ...
+    """
+    def __init__(cls, name, bases, attrs):
+        super(NodeMeta, cls).__init__(name, bases, attrs)
+
+        # only instances with a __dict__ can declare their schema in __init__
+        cls._instance_declarations = any('__slots__' not in vars(c) for c in cls.__mro__[:-1])
+        # the slots _copy_tree copies as they are
+        cls._copied_slots = tuple(
+            name
+            for c in reversed(cls.__mro__)
+            for name in ((c.__dict__['__slots__'],) if isinstance(c.__dict__.get('__slots__'), str) else c.__dict__.get('__slots__', ()))
+            if name not in _SLOTS_NOT_COPIED
+        )
+        # whether _build_children can build the children one at a time, with
+        # _iter_create_children, or the class creates them in _create_children
+        cls._iterative_children = next(
+            ('_iter_create_children' in vars(c) for c in cls.__mro__ if '_iter_create_children' in vars(c) or '_create_children' in vars(c)),
+            True,
+        )
+        cls._compile_schema()
+
+    def __setattr__(cls, name, value):
+        super(NodeMeta, cls).__setattr__(name, value)
+
+        if name in getattr(cls, '_schema_attributes', ()):
+            # declared after the class was created (like a field of a class
+            # referring to itself), so compile it again for the subclasses too
+            classes = [cls]
+            while classes:
+                subclass = classes.pop()
+                subclass._compile_schema()
+                classes.extend(subclass.__subclasses__())
+
+    def _compile_schema(cls):
+        cls._schema = None
+        cls._instance_schema = None
+
+        schema_class = getattr(cls, '_schema_class', None)
+        if schema_class is not None and getattr(cls, cls._schema_attributes[0], None) is not None:
+            cls._schema = schema_class(*[getattr(cls, name, None) for name in cls._schema_attributes])
+
+
+# python 2 and 3 compatible way of giving AbstractNode a metaclass
+_NodeBase = NodeMeta(str('_NodeBase'), (object,), {'__slots__': ()})
+
+
+class AbstractNode(_NodeBase):
     """Configuration Base Class
 
     All nodes in the configuration inherit from this base class
     to define types of nodes and groups of nodes; it is not intended
     to be used directly, but rather to be subclassed.
 
+    The node classes have a ``__dict__``, like any class. For very large
+    configs, each has a ``Slotted`` variant (``SlottedDictNode`` for
+    ``DictNode``, ...) whose subclasses declaring ``__slots__`` (``__slots__ =
+    ()`` when they don't add attributes) have much smaller instances. Those
+    declare ``_type`` and their schema as class attributes.
+
+    A node without errors shares an empty tuple as its ``_errors``, until the
+    first :meth:`_add_error` gives it a list, so subclasses add errors with
+    :meth:`_add_error` rather than appending to ``_errors``.
+
     """
+    __slots__ = (
+        '_original_value',
+        '_value_node',
+        '_shared_context',
+        '_reads_context',
+        '_variables',
+        '_key',
+        '_parent',
+        '_errors',
+        '_errors_version',
+        '_is_variable',
+        '_value',
+        '_lazy',
+        '_timings',
+    )
+
+    # leaves have no children (containers have a slot for them), so looking
+    # them up doesn't go through __getattr__ for every leaf of a walk
+    _children = None
+    _pending_children = False
+
+    # the Schema class and declaring attributes, for nodes that have a schema
+    _schema_class = None
+    _schema_attributes = ()
+
     def __init__(self, value, value_node=None, context={}, variables={}, key=None, parent=None):
         """Initialize a node
 
@@ -21,28 +205,140 @@ class AbstractNode(object):
         """
         self._original_value = value
         self._value_node = value_node  # yaml node obj
-        self._context = context
+        self._shared_context = context
+        self._reads_context = False
         self._variables = variables
         self._key = key
         self._parent = parent
-        self._errors = []
+        # containers of a lazy tree build their children when they're first used
+        self._lazy = parent._lazy if parent is not None else getattr(_lazy_build, 'lazy', False)
+        # the LoadTimings of the tree (looked up once, by the root)
+        self._timings = timings = parent._timings if parent is not None else getattr(_timing, 'timings', None)
+        self._errors = _NO_ERRORS
+        self._errors_version = 0  # bumped on the root when errors in the tree change
+
+        if timings is not None:
+            timings.node_created(self)
 
         self._is_variable = isinstance(self._original_value, str) and self._original_value.startswith('$')
 
-        self._value = self._render_value(self._original_value)
+        if timings is not None and '_render_value' in timings.timed_methods:
+            self._value = timings.call(self, '_render_value', self._render_value, self._original_value)
+        else:
+            self._value = self._render_value(self._original_value)
 
         if self._errors:
             # if we already have errors, then just quit
             return
 
+        if parent is not None and type(parent._pending_children) is _ChildQueue:
+            # created by the parent's _build_children, which builds our children
+            # and injects our context next, instead of us recursing
+            self._validate_self()
+            parent._pending_children.append(self)
+            return
+
+        self._build()
+
+    @property
+    def _context(self):  # type: () -> dict
+        """The context dict shared by the whole tree
+
+        Reading it marks this node as depending on context, so that it is
+        revalidated when an ancestor injects more context.
+
+        :rtype: dict
+        """
+        self._reads_context = True
+        return self._shared_context
+
+    @_context.setter
+    def _context(self, context):
+        self._shared_context = context
+
+    def _build(self):  # type: () -> None
+        """Validate this node, then inject its context for descendants
+
+        Injected context only needs to reach the descendants that read context
+        during their validation, so only those are revalidated (along with their
+        own subtrees), instead of building the whole subtree a second time.
+        """
         self._validate()
+        self._inject_context()
+
+    def _inject_context(self):  # type: () -> None
+        """Inject this node's context, once it and its subtree are validated"""
+        context_to_inject = self._injected_context()
+        if context_to_inject:
+            self._shared_context.update(context_to_inject)
+            self._revalidate_context_readers()
+
+    def _injected_context(self):  # type: () -> dict
+        """Return :meth:`_context_to_inject`, timed when timing is on
 
-        # probably a nicer way to do this by breaking down the steps
-        # (creating all objects, setting context, then validating) but turned out to be a mess in 1st try
-        if self._context_to_inject():
-            self._context.update(self._context_to_inject())
-            # then we need to revalidate with that context
+        :rtype: dict
+        """
+        reads_context = self._reads_context
+        timings = self._timings
+        if timings is not None and '_context_to_inject' in timings.timed_methods:
+            context_to_inject = timings.call(self, '_context_to_inject', self._context_to_inject)
+        else:
+            context_to_inject = self._context_to_inject()
+        # reading context to decide what to inject doesn't make validation depend on it
+        self._reads_context = reads_context
+        return context_to_inject
+
+    def _revalidate_context_readers(self):  # type: () -> None
+        """Revalidate the nodes in this subtree that read the context
+
+        Before, a node that injected context built its whole subtree again,
+        so the descendants injecting context injected it again, in the order
+        they were built. The nodes are walked in that order, and the context
+        each one is revalidated with is the one it had in that second build:
+        a descendant that injects context first injects that of its own
+        descendants, then its own, over whatever came before.
+        """
+        if self._reads_context:
+            # our own validation depends on context, so the whole subtree is rebuilt
             self._validate()
+            return
+
+        context = self._shared_context
+        injects = {}  # node class: whether it has a _context_to_inject of its own
+
+        def injecting(node):
+            cls = type(node)
+            if cls not in injects:
+                injects[cls] = _function(cls._context_to_inject) is not _NO_CONTEXT_TO_INJECT
+            return injects[cls]
+
+        # children that haven't been built yet will see the context when they are
+        stack = self._built_child_nodes()
+        stack.reverse()
+        while stack:
+            node = stack.pop()
+            if node._reads_context:
+                node._build()
+                continue
+
+            if injecting(node):
+                context_to_inject = node._injected_context()
+                if context_to_inject:
+                    descendants = node._built_child_nodes()
+                    descendants.reverse()
+                    while descendants:
+                        descendant = descendants.pop()
+                        if injecting(descendant):
+                            context.update(descendant._injected_context())
+                        children = descendant._built_child_nodes()
+                        children.reverse()
+                        descendants.extend(children)
+
+                    context.update(context_to_inject)
+
+            children = node._built_child_nodes()
+            children.reverse()
+            stack.extend(children)
 
     def is_valid(self):  # type: () -> bool
         """Tests whether this node is valid (but not descendants)
@@ -74,6 +370,111 @@ class AbstractNode(object):
 
         return value
 
+    def _get_schema(self):  # type: () -> Schema
+        """Return the compiled schema for this node's declaration
+
+        That's the one compiled for the class, unless the instance declared
+        its own (in ``__init__``). Those are compared with the declarations
+        compiled before, so instances declaring the same schema share it, and
+        the instance keeps its schema with the objects it declared, so the
+        next calls only check that they're the same objects.
+
+        :rtype: :Schema:
+        """
+        cls = type(self)
+        if not cls._instance_declarations:
+            if cls._schema is None:
+                raise AttributeError('{} must be defined in subclasses of {}'.format(self._schema_attributes[0], cls.__name__))
+            return cls._schema
+
+        instance_attributes = self.__dict__
+        declared = instance_attributes.get('_declared_schema')
+        if declared is not None:
+            declaration, schema = declared
+            for name, declared_object in zip(self._schema_attributes, declaration):
+                if getattr(self, name, None) is not declared_object:
+                    break
+            else:
+                return schema
+        elif cls._schema is not None:
+            for name in self._schema_attributes:
+                if name in instance_attributes:
+                    break
+            else:
+                return cls._schema
+
+        declaration = tuple(getattr(self, name, None) for name in self._schema_attributes)
+
+        for schema in (cls._schema, cls._instance_schema):
+            if schema is not None and schema.matches(declaration):
+                break
+        else:
+            if declaration[0] is None:
+                raise AttributeError('{} must be defined in subclasses of {}'.format(self._schema_attributes[0], cls.__name__))
+
+            # declared in __init__, so compile it and keep it for the next instance
+            schema = self._schema_class(*declaration)
+            cls._instance_schema = schema
+
+        instance_attributes['_declared_schema'] = (declaration, schema)
+        return schema
+
+    def _create_child(self, field_class, value, key, value_node=None):  # type: (type, Any, Any, yaml.Node) -> AbstractNode
+        """Create a child node, sharing this node's context and variables
+
+        When rebuilding for edited text, an unchanged node from the previous
+        tree is reused instead.
+
+        :rtype: :AbstractNode:
+        """
+        reuse = getattr(_rebuild, 'reuse', None)
+        if reuse is not None:
+            previous = reuse.previous_child(self, key)
+            reused = reuse.adopt(previous, self, field_class, value, value_node)
+            if reused is not None:
+                return reused
+
+            reuse.enter(previous)
+
+        try:
+            child = field_class(
+                value=value,
+                value_node=value_node,
+                context=self._shared_context,
+                variables=self._variables,
+                key=key,
+                parent=self
+            )
+        finally:
+            if reuse is not None:
+                reuse.exit()
+
+        if reuse is not None:
+            # its children may be created after it is
+            reuse.created(child, previous)
+
+        return child
+
+    def _release_yaml_node(self, positions):  # type: (PositionTable) -> None
+        """Swap the yaml node (and those of errors) for positions in the table
+
+        Called by ConfigLoader once the tree is built, when it releases the
+        yaml node graph.
+        """
+        yaml_node = self._value_node
+        if yaml_node is None or isinstance(yaml_node, Position):
+            return
+
+        position = positions.add(yaml_node)
+        self._value_node = position
+
+        for error in self._errors:
+            if error.error_obj is yaml_node:
+                error.error_obj = position
+            elif hasattr(error.error_obj, 'start_mark') and not isinstance(error.error_obj, Position):
+                # another yaml node, like the key of an invalid key
+                error.error_obj = positions.add(error.error_obj)
+
     def _key_name(self):  # type: () -> str
         """Return the key referring to this object
 
@@ -105,21 +506,30 @@ class AbstractNode(object):
 
         :rtype: str
         """
-        if self._parent:
-            return '{}.{}'.format(self._parent._path(), self._key_name())
+        names = []
+        node = self
+        while node is not None:
+            names.append(node._key_name())
+            node = node._parent
 
-        return self._key_name()
+        names.reverse()
+        return '.'.join('{}'.format(x) for x in names)
 
     def _add_error(self, *args, **kwargs):  # type: () -> None
         """Convenience function to add an error to this object, with line numbers
 
         An error title or description should not accidentally leak self._value, for privacy/redaction purposes.
 
+        This is the way to add errors: ``self._errors`` is a shared empty tuple
+        until the first one, so it can't be appended to directly.
+
         :rtype: None
         """
-        if kwargs.get('node', None):
+        node = kwargs.pop('node', None)
+        if node:
             # if node specified and not none
             error = ConfigError.create_from_yaml_node(
+                node=node,
                 *args,
                 **kwargs
             )
@@ -134,23 +544,249 @@ class AbstractNode(object):
             # no nodes or error_obj to attach
             error = ConfigError(*args, **kwargs)
 
-        self._errors.append(error)
+        if self._errors:
+            self._errors.append(error)
+        else:
+            self._errors = [error]
+        self._errors_changed()
 
     def _get_descendants_errors(self):  # type: () -> List(ConfigError)
-        """Recursively get errors from descendants
+        """Get errors from descendants
 
         :rtype: list of :ConfigErrors:"""
         descendants_errors = []
-        if hasattr(self, '_children'):
-            if isinstance(self._children, (list, tuple)):
-                for c in self._children:
-                    descendants_errors += c._get_all_errors()
-            elif isinstance(self._children, dict):
-                for c in self._children.values():
-                    descendants_errors += c._get_all_errors()
+        for node, _, depth in self._iter_preorder(paths=False):
+            if depth:
+                descendants_errors.extend(node._errors)
 
         return descendants_errors
 
+    def _iter_preorder(self, paths=True, descend=None):  # type: (bool, Callable) -> Iterator(tuple)
+        """Yield ``(node, path, depth)`` for this node and its descendants, each node before its children
+
+        ``path`` is a tuple of the keys from this node down (starting with its
+        own key name), so ``'.'.join(str(x) for x in path)`` is ``_path()``
+        when walking from the root, and ``depth`` is 0 for this node. With
+        ``paths=False`` the paths aren't built and are None. If given,
+        ``descend(node)`` decides whether to walk the children of a node.
+
+        Walks with a stack instead of recursing, so the depth of the tree isn't
+        limited by the recursion limit. Builds the children of lazy containers.
+
+        :rtype: iterator of tuple
+        """
+        path = (self._key_name(),) if paths else None
+        yield self, path, 0
+
+        children = self._walked_children(descend)
+        if not children:
+            return
+
+        # a frame for each container on the way down, not for every node
+        stack = [(path, 1, iter(children))]
+        while stack:
+            path, depth, children = stack[-1]
+            for child in children:
+                child_path = path + (child._key_name(),) if paths else None
+                yield child, child_path, depth
+
+                # (_walked_children inlined, since this runs for every node)
+                grandchildren = child._children if descend is None or descend(child) else None
+                if grandchildren:
+                    stack.append((child_path, depth + 1, iter(_as_node_list(grandchildren))))
+                    break
+            else:
+                stack.pop()
+
+    def _iter_postorder(self, paths=True, descend=None):  # type: (bool, Callable) -> Iterator(tuple)
+        """Like :meth:`_iter_preorder`, but each node after its children
+
+        :rtype: iterator of tuple
+        """
+        path = (self._key_name(),) if paths else None
+        children = self._walked_children(descend)
+        if not children:
+            yield self, path, 0
+            return
+
+        stack = [(self, path, 0, iter(children))]
+        while stack:
+            node, path, depth, children = stack[-1]
+            for child in children:
+                child_path = path + (child._key_name(),) if paths else None
+                grandchildren = child._children if descend is None or descend(child) else None
+                if grandchildren:
+                    stack.append((child, child_path, depth + 1, iter(_as_node_list(grandchildren))))
+                    break
+
+                yield child, child_path, depth + 1
+            else:
+                stack.pop()
+                yield node, path, depth
+
+    def _walked_children(self, descend):  # type: (Callable) -> List(AbstractNode)
+        # the children a walk goes on to (building those of a lazy container)
+        if descend is not None and not descend(self):
+            return None
+
+        children = self._children
+        return _as_node_list(children) if children else None
+
+    def _copy_tree(self, context, variables, memo):  # type: (dict, dict, dict) -> AbstractNode
+        """A copy of this subtree that uses ``context`` and ``variables`` instead
+
+        Each node is copied with its attributes, and its value with
+        :func:`_copy_value`. ``memo`` gets the ids of the nodes mapped to their
+        copies, for copying what refers to them (like injected context). The
+        yaml nodes and errors are shared, since they aren't changed after
+        loading. Nodes with a context of their own get a copy of it.
+
+        :rtype: :AbstractNode:
+        """
+        contexts = {id(self._shared_context): context}
+        copies = []
+        for node, _, _ in self._iter_preorder(paths=False):
+            cls = type(node)
+            copied = cls.__new__(cls)
+            for name in cls._copied_slots:
+                try:
+                    setattr(copied, name, object.__getattribute__(node, name))
+                except AttributeError:
+                    pass
+            if cls._instance_declarations:
+                copied.__dict__.update(node.__dict__)
+
+            copied._parent = memo[id(node._parent)] if node is not self else None
+            shared_context = node._shared_context
+            if id(shared_context) not in contexts:
+                contexts[id(shared_context)] = dict(shared_context)
+            copied._shared_context = contexts[id(shared_context)]
+            copied._variables = variables if node._variables is self._variables else node._variables
+            copied._original_value = _copy_value(node._original_value, memo)
+            copied._value = _copy_value(node._value, memo)
+            copied._errors = list(node._errors) if node._errors else _NO_ERRORS
+            copied._timings = None
+
+            memo[id(node)] = copied
+            copies.append((node, copied))
+
+        # the children, once they're all copied
+        for node, copied in copies:
+            children = node._children
+            if children is None:
+                continue
+
+            if isinstance(children, list):
+                copied._children = [memo[id(x)] for x in children]
+            else:
+                copied._children = dict((key, memo[id(x)]) for key, x in children.items())
+                if type(node)._instance_declarations:
+                    # children set as attributes
+                    attributes = copied.__dict__
+                    for key, child in children.items():
+                        if attributes.get(key) is child:
+                            attributes[key] = memo[id(child)]
+
+        return memo[id(self)]
+
+    def _child_nodes(self):  # type: () -> List(AbstractNode)
+        """Return a new list of the direct children of this node
+
+        Builds the children of a lazy container that hasn't built them yet.
+
+        :rtype: list of :AbstractNode:"""
+        return _as_node_list(getattr(self, '_children', None))
+
+    def _built_child_nodes(self):  # type: () -> List(AbstractNode)
+        """Like :meth:`_child_nodes`, without building the children of a lazy container
+
+        :rtype: list of :AbstractNode:"""
+        try:
+            children = object.__getattribute__(self, '_children')
+        except AttributeError:
+            children = None
+
+        return _as_node_list(children)
+
+    def _create_children(self):  # type: () -> None
+        """Create the child nodes of a container
+
+        Containers implement :meth:`_iter_create_children` instead, which lets
+        :meth:`_build_children` build each child before creating the next. A
+        class that overrides this method creates its children here, and each
+        of them builds its own children as it's created.
+        """
+        for _ in self._iter_create_children():
+            pass
+
+    def _iter_create_children(self):  # type: () -> Iterator(AbstractNode)
+        """Create the child nodes of a container, yielding each as it's created
+
+        :rtype: iterator of :AbstractNode:
+        """
+        return iter(())
+
+    def _defer_children(self):  # type: () -> None
+        """Leave the children of a container to be created when they're first used"""
+        self._pending_children = True
+        try:
+            del self._children
+        except AttributeError:
+            pass
+
+    def _build_children(self):  # type: () -> bool
+        """Create deferred children, returning whether there were any to create
+
+        Called at the end of validating a container, or, in a lazy tree, the
+        first time the children are used. Each child is validated, its own
+        children built and its context injected before the next child is
+        created, as if every node built its children as it was created, but
+        the containers being built are kept on a stack instead of recursing.
+
+        :rtype: bool
+        """
+        if self._pending_children is not True:
+            return False
+
+        stack = []
+
+        def start(node):
+            if not node._iterative_children:
+                node._pending_children = False
+                node._create_children()
+                return False
+
+            # the children add themselves to the queue as they're created (see __init__)
+            queue = node._pending_children = _ChildQueue()
+            stack.append((node, node._iter_create_children(), queue))
+            return True
+
+        start(self)
+        while stack:
+            node, children, queue = stack[-1]
+            if queue:
+                child = queue.pop(0)
+                if child._pending_children is True and not child._lazy and start(child):
+                    continue
+
+                child._inject_context()
+            elif next(children, None) is None:
+                stack.pop()
+                node._pending_children = False
+                if stack:
+                    # (self injected when it was built)
+                    node._inject_context()
+
+        return True
+
+    def __getattr__(self, name):
+        # only called when normal attribute lookup fails, which is how a lazy
+        # container notices its children being used for the first time
+        if name == '_children' and self._build_children():
+            return self._children
+
+        raise AttributeError('\'{}\' object has no attribute \'{}\''.format(type(self).__name__, name))
+
     def _get_all_errors(self):  # type: () -> List(ConfigError)
         """Collect and return a list of all errors
 
@@ -158,17 +794,57 @@ class AbstractNode(object):
 
         :rtype: list of :ConfigErrors:
         """
-        return self._errors + self._get_descendants_errors()
+        return list(self._iter_all_errors())
+
+    def _iter_all_errors(self):  # type: () -> Iterator(ConfigError)
+        """Yield the errors of this node, then of each of its descendants in order
+
+        :rtype: iterator of :ConfigErrors:
+        """
+        for node, _, _ in self._iter_preorder(paths=False):
+            for error in node._errors:
+                yield error
+
+    def _count_all_errors(self):  # type: () -> int
+        """Count the errors of this node and its descendants, without collecting them
+
+        :rtype: int
+        """
+        return sum(len(node._errors) for node, _, _ in self._iter_preorder(paths=False))
+
+    def _errors_changed(self):  # type: () -> None
+        """Bump the error version of the tree, so cached error lists get rebuilt"""
+        root = self
+        while root._parent is not None:
+            root = root._parent
+
+        root._errors_version += 1
 
     def _validate(self):  # type: () -> None
         """Run validation, save errors to object in self._errors"""
+        self._validate_self()
+
+        if self._pending_children is True and not self._lazy:
+            self._build_children()
+
+    def _validate_self(self):  # type: () -> None
+        """Validate this node's value, leaving the children of a container to :meth:`_build_children`"""
         # class can specify it's empty obj -- list would have empty of []
-        self._errors = []
+        if self._errors:
+            self._errors_changed()
+        self._errors = _NO_ERRORS
 
-        self._validate_type()
+        timings = self._timings
+        if timings is not None and '_validate_type' in timings.timed_methods:
+            timings.call(self, '_validate_type', self._validate_type)
+        else:
+            self._validate_type()
 
         if self.is_valid():
-            self._validate_value()
+            if timings is None:
+                self._validate_value()
+            else:
+                timings.call(self, '_validate_value', self._validate_value)
 
     def _validate_type(self):  # type: () -> None
         """Validation to ensure value is the correct type"""
@@ -191,9 +867,60 @@ class AbstractNode(object):
         return {}
 
     def _as_dict(self, redact=False):  # type: () -> dict
+        """The node and its descendants as a dict
+
+        Built from the bottom up, each node from the dicts of its children by
+        :meth:`_as_dict_from_children`, with a stack of the containers on the
+        way down instead of recursing, so deep trees don't hit the recursion
+        limit. Descendants of a class that overrides ``_as_dict`` are asked for
+        theirs.
+
+        :rtype: dict
+        """
         if redact and self._should_redact():
             return self._as_redacted_dict()
 
+        children = self._children
+        if not children:
+            return self._as_dict_from_children([], redact=redact)
+
+        overrides = {}  # node class: whether it has an _as_dict of its own
+
+        # for each container on the way down: the node, its children left to
+        # walk, and the dicts of those walked
+        stack = [(self, iter(children if isinstance(children, (list, tuple)) else children.values()), [])]
+        while stack:
+            node, children, child_dicts = stack[-1]
+            for child in children:
+                cls = type(child)
+                override = overrides.get(cls)
+                if override is None:
+                    override = overrides[cls] = _function(cls._as_dict) is not _BUILT_AS_DICT
+
+                if override or (redact and child._should_redact()):
+                    child_dicts.append(child._as_dict(redact=redact))
+                    continue
+
+                grandchildren = child._children
+                if grandchildren:
+                    stack.append((child, iter(grandchildren if isinstance(grandchildren, (list, tuple)) else grandchildren.values()), []))
+                    break
+
+                child_dicts.append(child._as_dict_from_children([], redact=redact))
+            else:
+                stack.pop()
+                d = node._as_dict_from_children(child_dicts, redact=redact)
+                if not stack:
+                    return d
+                stack[-1][2].append(d)
+
+    def _as_dict_from_children(self, child_dicts, redact=False):  # type: (list, bool) -> dict
+        """The dict of this node, given the dicts of the nodes in :meth:`_child_nodes`, in order
+
+        Containers override this to put their children in.
+
+        :rtype: dict
+        """
         d = {}
         d['value'] = self._value
         if self._errors:
@@ -216,3 +943,12 @@ class AbstractNode(object):
         d.update(self._as_dict_to_inject(redact=True))
 
         return d
+
+
+def _function(method):
+    # the function behind a method looked up on a class (an unbound method in python 2)
+    return getattr(method, '__func__', method)
+
+
+_BUILT_AS_DICT = _function(AbstractNode._as_dict)
+_NO_CONTEXT_TO_INJECT = _function(AbstractNode._context_to_inject)
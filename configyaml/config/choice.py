@@ -1,21 +1,31 @@
 from .base import AbstractNode
+from .schema import ChoiceSchema
 
 
-class ChoiceNode(AbstractNode):
+class SlottedChoiceNode(AbstractNode):
+    """A :class:`ChoiceNode` without a ``__dict__``, for subclasses that declare ``__slots__``"""
+    __slots__ = ()
+    _schema_class = ChoiceSchema
+    _schema_attributes = ('_choices',)
+
     _choices = None
+    _type = str
 
     def __init__(self, *args, **kwargs):
-        self._type = str
-
         if not self._choices:
             # class should specify self._choices = []  # list of choices that the str can be
             raise AttributeError('_choices must be defined in subclasses of ConfigBaseChoices')
 
-        super(ChoiceNode, self).__init__(*args, **kwargs)
+        super(SlottedChoiceNode, self).__init__(*args, **kwargs)
 
     def _validate_value(self):
-        if self._value not in self._choices:
+        schema = self._get_schema()
+        if self._value not in schema.choice_set:
             self._add_error(
                 title='Invalid choice',
-                description='Must be one of {}'.format(', '.join(self._choices)),
+                description=schema.description,
             )
+
+
+class ChoiceNode(SlottedChoiceNode):
+    """A node that must validate as one of ``_choices``"""
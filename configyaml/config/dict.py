@@ -1,90 +1,185 @@
-from .base import AbstractNode
+import copy
 
+import yaml
+
+from .base import AbstractNode, _EMPTY_MAPPING
+from .schema import DictSchema
+
+
+STR_TAG = 'tag:yaml.org,2002:str'
+
+# defaults that are copied for each node, so nodes don't share them
+_MUTABLE_DEFAULTS = (dict, list, set)
+
+
+class SlottedDictNode(AbstractNode):
+    """A :class:`DictNode` without a ``__dict__``, for subclasses that declare ``__slots__``
+
+    They declare their fields as a class attribute, and their children are
+    available as attributes through ``__getattr__``.
+    """
+    __slots__ = ('_children', '_pending_children', '_key_index', '_key_index_node')
+
+    _schema_class = DictSchema
+    _schema_attributes = ('_dict_fields',)
+    _type = dict
+    # whether children are available as attributes (node.FIELD_NAME)
+    _children_as_attributes = True
 
-class DictNode(AbstractNode):
     def __init__(self, *args, **kwargs):
-        self._type = dict
+        self._pending_children = False
         self._children = {}
-        super(DictNode, self).__init__(*args, **kwargs)
+        self._key_index = _EMPTY_MAPPING
+        self._key_index_node = None
+        super(SlottedDictNode, self).__init__(*args, **kwargs)
 
     def _validate_value(self):
-        self._validate_required_keys()
-        self._set_default_fields()
-
-        for key, value in self._value.items():
+        self._children = {}
+        schema = self._get_schema()
+        self._validate_required_keys(schema)
 
-            if key in self._dict_fields:
-                # get class for key
-                field_class = self._dict_fields[key]['class']
-                field = field_class(
-                    value=self._value[key],
-                    value_node=self._find_node_for_key_value(key),
-                    context=self._context,
-                    variables=self._variables,
-                    key=key,
-                    parent=self
-                )
+        field_classes = schema.field_classes
 
-                # set self.FIELD_NAME so we can get children directly
-                # these will only be keys we specify, so should be safe names
-                self.__dict__[key] = field
-                self._children[key] = field
-            else:
+        for key in self._value:
+            if key not in field_classes:
                 # cannot use key
                 self._add_error(
                     node=self._find_node_for_key(key),
                     title='Invalid key',
-                    description='Available fields are: {}'.format(', '.join(sorted(self._dict_fields.keys()))),
+                    description='Available fields are: {}'.format(schema.available_fields),
                 )
 
-    def _validate_required_keys(self):
-        required_keys = [k for k, v in self._dict_fields.items() if v.get('required', False)]
-        for k in required_keys:
+        self._defer_children()
+
+    def _iter_create_children(self):
+        self._children = {}
+        schema = self._get_schema()
+        for field in self._iter_default_fields(schema):
+            yield field
+
+        field_classes = schema.field_classes
+
+        for key, value in self._value.items():
+            if key in field_classes:
+                field = self._create_child(
+                    field_classes[key],
+                    value=value,
+                    key=key,
+                    value_node=self._find_node_for_key_value(key),
+                )
+
+                self._add_child(key, field)
+                yield field
+
+    def _validate_required_keys(self, schema=None):
+        for k in (schema or self._get_schema()).required:
             if k not in self._value:
                 self._add_error(
                     title='Required field is missing',
                     description='{} is a required field'.format(k)
                 )
 
-    def _set_default_fields(self):
-        for k, v in self._dict_fields.items():
-            if 'default' in v:
-                default = v['default']
-                instance = v['class'](
-                    value=default,
-                    context=self._context,
-                    variables=self._variables,
-                    key=k,
-                    parent=self
-                )
-                self.__dict__[k] = instance
-                self._children[k] = instance
+    def _set_default_fields(self, schema=None):
+        for _ in self._iter_default_fields(schema):
+            pass
+
+    def _iter_default_fields(self, schema=None):
+        for k, field_class, default in (schema or self._get_schema()).defaults:
+            if isinstance(default, _MUTABLE_DEFAULTS):
+                default = copy.deepcopy(default)
+            instance = self._create_child(field_class, value=default, key=k)
+            self._add_child(k, instance)
+            yield instance
+
+    def _defer_children(self):
+        instance_dict = getattr(self, '__dict__', None)
+        if instance_dict and self._children_as_attributes:
+            # attributes of the previous children would hide the new ones from __getattr__
+            for key in self._get_schema().fields:
+                instance_dict.pop(key, None)
+
+        super(SlottedDictNode, self)._defer_children()
+
+    def _add_child(self, key, field):
+        self._children[key] = field
+
+        if self._children_as_attributes:
+            # set self.FIELD_NAME so we can get children directly
+            # these will only be keys we specify, so should be safe names
+            # (nodes declared with __slots__ have no __dict__, and use __getattr__ instead)
+            instance_dict = getattr(self, '__dict__', None)
+            if instance_dict is not None:
+                instance_dict[key] = field
+
+    def __getattr__(self, name):
+        # only called when normal attribute lookup fails
+        if name != '_children' and self._children_as_attributes and not name.startswith('__'):
+            try:
+                children = self._children
+            except AttributeError:
+                # not validated (yet)
+                children = _EMPTY_MAPPING
+
+            if name in children:
+                return children[name]
+
+        return super(SlottedDictNode, self).__getattr__(name)
 
     def _find_node_for_key_value(self, key):
-        if not self._value_node:
-            return None
-
-        for children in self._value_node.value:
-            # value would be the second ScalarNode
-            if len(children) > 1:
-                key_node = children[0]
-                if key_node.value == key:
-                    return children[1]  # return the following value node
+        pair = self._key_node_index().get(key)
+        if pair:
+            return pair[1]  # the value node
 
         return None
 
     def _find_node_for_key(self, key):
-        if not self._value_node:
-            return None
-
-        for children in self._value_node.value:
-            # key would be the first ScalarNode
-            key_node = children[0]
-            if key_node.value == key:
-                return key_node
+        pair = self._key_node_index().get(key)
+        if pair:
+            return pair[0]  # the key node
 
         return None
 
+    def _key_node_index(self):  # type: () -> dict
+        """Map each key of the yaml mapping to its (key node, value node)
+
+        Built once per mapping node. Keys are constructed like PyYAML constructs
+        them, so non-string keys (ints, bools...) match the keys in self._value,
+        and a repeated key maps to its last occurrence, which is the one whose
+        value was loaded.
+
+        :rtype: dict
+        """
+        if self._key_index_node is self._value_node:
+            return self._key_index
+
+        index = _EMPTY_MAPPING
+        if isinstance(self._value_node, yaml.MappingNode):
+            index = {}
+            constructor = None
+            for key_node, value_node in self._value_node.value:
+                if key_node.tag == STR_TAG:
+                    key = key_node.value
+                else:
+                    if constructor is None:
+                        constructor = yaml.constructor.SafeConstructor()
+                    try:
+                        key = constructor.construct_object(key_node, deep=True)
+                        hash(key)
+                    except (yaml.YAMLError, TypeError):
+                        # not a key PyYAML could have loaded into the dict
+                        continue
+
+                index[key] = (key_node, value_node)
+
+        self._key_index = index
+        self._key_index_node = self._value_node
+        return index
+
+    def _release_yaml_node(self, positions):
+        super(SlottedDictNode, self)._release_yaml_node(positions)
+        self._key_index = _EMPTY_MAPPING
+        self._key_index_node = self._value_node
+
     def get(self, key, default):
         return self._children.get(key, default)
 
@@ -94,17 +189,14 @@ class DictNode(AbstractNode):
     def __len__(self):
         return len(self._children)
 
-    def _as_dict(self, redact=False):
-        if redact and self._should_redact():
-            return self._as_redacted_dict()
-
-        d = {}
-        for k in self._dict_fields.keys():
-            child = self.get(k, None)
-            if child:
-                d[k] = child._as_dict(redact=redact)
-            else:
-                d[k] = None
+    def _as_dict_from_children(self, child_dicts, redact=False):
+        # every field, null unless it has a child
+        fields = self._get_schema().fields
+        d = dict.fromkeys(fields)
+        d.update(zip(self._children, child_dicts))
+        if len(d) > len(fields):
+            # children a subclass added for keys that aren't fields aren't output
+            d = dict((key, d[key]) for key in fields)
 
         if self._errors:
             d['errors'] = [x.as_dict() for x in self._errors]
@@ -112,3 +204,22 @@ class DictNode(AbstractNode):
         d.update(self._as_dict_to_inject(redact=redact))
 
         return d
+
+
+class DictNode(SlottedDictNode):
+    """A node for a mapping with a known set of keys
+
+    Declare the fields as a class attribute (or set it on the instance in
+    ``__init__``, before calling super)::
+
+        _dict_fields = {
+            'name': {
+                'class': StringNode,
+                'required': True,
+            },
+            'enabled': {
+                'class': BoolNode,
+                'default': True,
+            },
+        }
+    """
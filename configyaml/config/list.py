@@ -1,44 +1,55 @@
 import yaml
 
 from .base import AbstractNode
+from .schema import ListSchema
 
 
-class ListNode(AbstractNode):
+class SlottedListNode(AbstractNode):
+    """A :class:`ListNode` without a ``__dict__``, for subclasses that declare ``__slots__``"""
+    __slots__ = ('_children', '_pending_children')
+    _schema_class = ListSchema
+    _schema_attributes = ('_list_item_class', '_min_items_required')
+
     _list_item_class = None
+    # by default, don't have to have anything
+    # set to 1 to require at least 1 item
+    _min_items_required = 0
+    _type = list
 
     def __init__(self, *args, **kwargs):
-        self._type = list
+        self._pending_children = False
         self._children = []  # so we can append, etc
 
-        if not hasattr(self, '_min_items_required'):
-            # by default, don't have to have anything
-            # set to 1 in custom __init__ to require at least 1 item
-            self._min_items_required = 0
-
         if not self._list_item_class:
             raise AttributeError('_list_item_class must be defined in subclasses of ListNode')
 
-        super(ListNode, self).__init__(*args, **kwargs)
+        super(SlottedListNode, self).__init__(*args, **kwargs)
 
     def _validate_value(self):
-        if len(self._value) < self._min_items_required:
+        schema = self._get_schema()
+
+        if len(self._value) < schema.min_items:
             self._add_error(
                 title='Minimum items requirement not met',
-                description='Must have at least {} item(s)'.format(self._min_items_required)
+                description='Must have at least {} item(s)'.format(schema.min_items)
             )
 
+        self._defer_children()
+
+    def _iter_create_children(self):
+        schema = self._get_schema()
+        self._children = []
+
         for index, item in enumerate(self._value):
-            field_class = self._list_item_class
-            field = field_class(
+            field = self._create_child(
+                schema.item_class,
                 value=item,
+                key=index,
                 value_node=self._find_node_for_list_index(index),
-                context=self._context,
-                variables=self._variables,
-                parent=self,
-                key=index
             )
 
             self._children.append(field)
+            yield field
 
     def _find_node_for_list_index(self, index):
         if not self._value_node:
@@ -59,12 +70,9 @@ class ListNode(AbstractNode):
     def __len__(self):
         return len(self._children)
 
-    def _as_dict(self, redact=False):
-        if redact and self._should_redact():
-            return self._as_redacted_dict()
-
+    def _as_dict_from_children(self, child_dicts, redact=False):
         d = {
-            'items': [x._as_dict(redact=redact) for x in self._children],
+            'items': child_dicts,
         }
 
         if self._errors:
@@ -72,3 +80,7 @@ class ListNode(AbstractNode):
 
         d.update(self._as_dict_to_inject(redact=redact))
         return d
+
+
+class ListNode(SlottedListNode):
+    """A node for a list, each item a node of ``_list_item_class``"""
@@ -1,47 +1,53 @@
 import re
 
 from .base import AbstractNode
-from .dict import DictNode
+from .dict import DictNode, SlottedDictNode
+from .regex import RegexCache
 
 
-class WildcardDictNode(DictNode):
-    """A dictionary node where nearly any key is valid
+class SlottedWildcardDictNode(SlottedDictNode):
+    """A :class:`WildcardDictNode` without a ``__dict__``, for subclasses that declare ``__slots__``"""
+    __slots__ = ()
+    # children can be any key, so they aren't available as attributes
+    _children_as_attributes = False
 
-       The only invalid keys are:
-       - an actual asterisk '*'
-       - a key that begins with '_'
-       """
     def _validate_value(self):
-        for key, value in self._value.items():
+        self._children = {}
+
+        for key in self._value:
             # where key name doesn't matter (ex. groups)
             key_valid, explanation = self._key_name_is_valid(key)
-            if key_valid:
-                field_class = self._dict_fields['*']['class']
-                field = field_class(
-                    value=value,
-                    value_node=self._find_node_for_key_value(key),
-                    context=self._context,
-                    variables=self._variables,
-                    key=key,
-                    parent=self
-                )
-
-                # don't set __dict__ if they can use any key
-                self._children[key] = field
-            else:
+            if not key_valid:
                 self._add_error(
                     node=self._find_node_for_key(key),
                     title='Invalid field name',
                     description=explanation
                 )
 
-    def _as_dict(self, redact=False):
-        if redact and self._should_redact():
-            return self._as_redacted_dict()
+        self._defer_children()
+
+    def _iter_create_children(self):
+        self._children = {}
+        field_class = None
 
-        d = {}
-        for group_name in self._children.keys():
-            d[group_name] = self[group_name]._as_dict(redact=redact)
+        for key, value in self._value.items():
+            if self._key_name_is_valid(key)[0]:
+                if field_class is None:
+                    field_class = self._get_schema().field_classes['*']
+
+                field = self._create_child(
+                    field_class,
+                    value=value,
+                    key=key,
+                    value_node=self._find_node_for_key_value(key),
+                )
+
+                # not set as an attribute, since they can use any key
+                self._add_child(key, field)
+                yield field
+
+    def _as_dict_from_children(self, child_dicts, redact=False):
+        d = dict(zip(self._children.keys(), child_dicts))
 
         if self._errors:
             d['errors'] = [x.as_dict() for x in self._errors]
@@ -54,54 +60,98 @@ class WildcardDictNode(DictNode):
         if key == '*':
             return False, 'Field name cannot be "*"'
 
-        if key.startswith('_'):
+        if isinstance(key, str) and key.startswith('_'):
             return False, 'Cannot start field name with a "_"'
 
         return True, 'Valid'
 
 
-class BoolNode(AbstractNode):
+class WildcardDictNode(SlottedWildcardDictNode, DictNode):
+    """A dictionary node where nearly any key is valid
+
+       The only invalid keys are:
+       - an actual asterisk '*'
+       - a key that begins with '_'
+       """
+
+
+class SlottedBoolNode(AbstractNode):
+    """A :class:`BoolNode` without a ``__dict__``"""
+    __slots__ = ()
+    _type = bool
+
+
+class BoolNode(SlottedBoolNode):
     """A node that must validate as a bool"""
-    def __init__(self, *args, **kwargs):
-        self._type = bool
-        super(BoolNode, self).__init__(*args, **kwargs)
 
 
-class StringNode(AbstractNode):
+class SlottedStringNode(AbstractNode):
+    """A :class:`StringNode` without a ``__dict__``"""
+    __slots__ = ()
+    _type = str
+
+
+class StringNode(SlottedStringNode):
     """A node that must validate as a string"""
-    def __init__(self, *args, **kwargs):
-        self._type = str
-        super(StringNode, self).__init__(*args, **kwargs)
 
 
-class RegexNode(StringNode):
-    """A node that must validate as a regular expression"""
+class SlottedRegexNode(SlottedStringNode):
+    """A :class:`RegexNode` without a ``__dict__``"""
+    __slots__ = ('regex',)
+    # compiled patterns (and errors) shared by instances, None to compile every time
+    regex_cache = RegexCache()
+
     def __init__(self, *args, **kwargs):
         self.regex = None
-        super(RegexNode, self).__init__(*args, **kwargs)
+        super(SlottedRegexNode, self).__init__(*args, **kwargs)
 
     def _validate_value(self):
-        try:
-            self.regex = re.compile(self._value)
-        except re.error as e:
-            self._add_error(title='Invalid regex', description=str(e))
+        if self.regex_cache is not None:
+            self.regex, error = self.regex_cache.compile(self._value)
+        else:
+            try:
+                self.regex, error = re.compile(self._value), None
+            except re.error as e:
+                error = str(e)
+
+        if error is not None:
+            self._add_error(title='Invalid regex', description=error)
+
+
+class RegexNode(SlottedRegexNode, StringNode):
+    """A node that must validate as a regular expression"""
 
 
-class IntegerNode(AbstractNode):
+class SlottedIntegerNode(AbstractNode):
+    """An :class:`IntegerNode` without a ``__dict__``"""
+    __slots__ = ()
+    _type = int
+
+
+class IntegerNode(SlottedIntegerNode):
     """A node that must validate as an integer"""
-    def __init__(self, *args, **kwargs):
-        self._type = int
-        super(IntegerNode, self).__init__(*args, **kwargs)
 
 
-class PositiveIntegerNode(IntegerNode):
-    """A node that must validate as a positive integer"""
+class SlottedPositiveIntegerNode(SlottedIntegerNode):
+    """A :class:`PositiveIntegerNode` without a ``__dict__``"""
+    __slots__ = ()
+
     def _validate_value(self):
         if self._value < 0:
             self._add_error(title="Invalid Value", description="Must be a positive integer")
 
 
-class TypelessNode(AbstractNode):
-    """A node that does not have to validate as any specific type"""
+class PositiveIntegerNode(SlottedPositiveIntegerNode, IntegerNode):
+    """A node that must validate as a positive integer"""
+
+
+class SlottedTypelessNode(AbstractNode):
+    """A :class:`TypelessNode` without a ``__dict__``"""
+    __slots__ = ()
+
     def _validate_type(self):
         pass
+
+
+class TypelessNode(SlottedTypelessNode):
+    """A node that does not have to validate as any specific type"""
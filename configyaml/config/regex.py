@@ -0,0 +1,78 @@
+import re
+import threading
+from collections import OrderedDict
+
+
+class RegexCache(object):
+    """A bounded, least recently used cache of compiled regular expressions
+
+    Shared by every :class:`~configyaml.config.RegexNode` through
+    ``RegexNode.regex_cache``, so a pattern repeated across a config is only
+    compiled once (``re`` has its own cache, but it's small and shared with
+    everything else). Invalid patterns are cached too, as their error message.
+    Set ``regex_cache`` on a subclass to give it another size, or to None to
+    compile every time::
+
+        class Pattern(RegexNode):
+            regex_cache = RegexCache(maxsize=10000)
+    """
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def compile(self, pattern):  # type: (str) -> tuple
+        """Return ``(regex, None)`` for a valid pattern, or ``(None, error message)``
+
+        :rtype: tuple
+        """
+        with self._lock:
+            entry = self._entries.get(pattern)
+            if entry is not None:
+                self.hits += 1
+                # most recently used last
+                del self._entries[pattern]
+                self._entries[pattern] = entry
+                return entry
+
+            self.misses += 1
+
+        try:
+            entry = (re.compile(pattern), None)
+        except re.error as e:
+            entry = (None, str(e))
+
+        with self._lock:
+            self._entries[pattern] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return entry
+
+    def clear(self):  # type: () -> None
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):  # type: () -> dict
+        """Counts of hits, misses and evictions, and the current entries
+
+        :rtype: dict
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / float(lookups) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,187 @@
+import yaml
+
+from .base import AbstractNode, _rebuild
+
+
+class SubtreeReuse(object):
+    """Hands nodes of a previous tree to the build of a tree for edited text
+
+    While active (``with reuse:``), ``AbstractNode._create_child`` asks it for
+    the previous node at the same path. That node and its subtree are adopted
+    instead of being built again when:
+
+    - it has the same class and an equal value
+    - the text of its yaml region is the same, starting at the same column
+      (it can move to other lines)
+    - no node in its subtree reads or injects context
+
+    Validation is assumed to depend only on a node's value, variables and context,
+    which is what the nodes of this package rely on. Adopted nodes are given the
+    matching nodes of the new yaml tree, and the lines of their errors are moved
+    to where the region is now.
+    """
+    def __init__(self, previous_root, previous_text, text):
+        self.previous_text = previous_text
+        self.text = text
+        self.reused = 0  # subtrees adopted
+
+        self._used = set()
+        # previous node of each node being built, and of the one about to be
+        self._previous = {}
+        self._stack = [previous_root]
+        self._outer = None
+
+    def __enter__(self):
+        self._outer = getattr(_rebuild, 'reuse', None)
+        _rebuild.reuse = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _rebuild.reuse = self._outer
+
+    def previous_child(self, parent, key):  # type: (AbstractNode, Any) -> AbstractNode
+        """The node that was at ``key`` under the previous counterpart of ``parent``
+
+        :rtype: :AbstractNode:
+        """
+        if id(parent) in self._previous:
+            previous_parent = self._previous[id(parent)]
+        else:
+            # the first child of a new node, so the stack has its counterpart
+            previous_parent = self._stack[-1]
+            self._previous[id(parent)] = previous_parent
+
+        if previous_parent is None:
+            return None
+
+        try:
+            # children a lazy tree hasn't built can't be reused anyway
+            children = object.__getattribute__(previous_parent, '_children')
+        except AttributeError:
+            return None
+
+        if not children:
+            return None
+
+        if isinstance(children, (list, tuple)):
+            child = children[key] if isinstance(key, int) and 0 <= key < len(children) else None
+        else:
+            child = children.get(key)
+
+        if child is None or child._key != key:
+            return None
+
+        return child
+
+    def adopt(self, previous, parent, field_class, value, value_node):  # type: (...) -> AbstractNode
+        """Return the previous node moved under ``parent``, or None if it can't be reused
+
+        :rtype: :AbstractNode:
+        """
+        if previous is None or type(previous) is not field_class or id(previous) in self._used:
+            return None
+
+        previous_node = previous._value_node
+        if not isinstance(value_node, yaml.Node) or not isinstance(previous_node, yaml.Node):
+            return None
+
+        start, end = previous_node.start_mark, previous_node.end_mark
+        new_start, new_end = value_node.start_mark, value_node.end_mark
+        if (
+            start.column != new_start.column or
+            self.previous_text[start.index:end.index] != self.text[new_start.index:new_end.index]
+        ):
+            return None
+
+        if type(previous._original_value) is not type(value) or previous._original_value != value:
+            return None
+
+        new_yaml_nodes = _pair_yaml_nodes(previous_node, value_node)
+        if new_yaml_nodes is None:
+            return None
+
+        nodes = []
+        stack = [previous]
+        while stack:
+            node = stack.pop()
+            if node._reads_context or type(node)._context_to_inject is not AbstractNode._context_to_inject:
+                return None
+
+            if node._value_node is not None and id(node._value_node) not in new_yaml_nodes:
+                return None
+
+            for error in node._errors:
+                if isinstance(error.error_obj, yaml.Node) and id(error.error_obj) not in new_yaml_nodes:
+                    # an error placed outside of the region won't move with it
+                    return None
+
+            nodes.append(node)
+            # unbuilt children will be built from the new yaml nodes
+            stack.extend(node._built_child_nodes())
+
+        # the text is the same, so the new yaml nodes differ only in their lines
+        line_offset = new_start.line - start.line
+        for node in nodes:
+            if node._value_node is not None:
+                node._value_node = new_yaml_nodes[id(node._value_node)]
+
+            for error in node._errors:
+                if isinstance(error.error_obj, yaml.Node):
+                    error.error_obj = new_yaml_nodes[id(error.error_obj)]
+                if line_offset:
+                    _move_error(error, line_offset)
+
+        previous._parent = parent
+        self._used.add(id(previous))
+        self.reused += 1
+        return previous
+
+    def enter(self, previous):  # type: (AbstractNode) -> None
+        """Make ``previous`` the counterpart of the node about to be built"""
+        self._stack.append(previous)
+
+    def exit(self):  # type: () -> None
+        self._stack.pop()
+
+    def created(self, node, previous):  # type: (AbstractNode, AbstractNode) -> None
+        """Keep ``previous`` as the counterpart of ``node``, for children created after it"""
+        self._previous.setdefault(id(node), previous)
+
+
+def _pair_yaml_nodes(previous, new):  # type: (yaml.Node, yaml.Node) -> dict
+    """Map the ids of the yaml nodes under ``previous`` to the same nodes under ``new``
+
+    Returns None if the trees differ, or an alias leads outside of the region.
+    """
+    start, end = previous.start_mark.index, previous.end_mark.index
+    pairs = {}
+    stack = [(previous, new)]
+    while stack:
+        previous, new = stack.pop()
+        if id(previous) in pairs:
+            continue
+
+        if type(previous) is not type(new) or previous.start_mark.index < start or previous.end_mark.index > end:
+            return None
+
+        pairs[id(previous)] = new
+        if isinstance(previous, yaml.MappingNode):
+            if len(previous.value) != len(new.value):
+                return None
+            for (key_node, value_node), (new_key_node, new_value_node) in zip(previous.value, new.value):
+                stack.append((key_node, new_key_node))
+                stack.append((value_node, new_value_node))
+        elif isinstance(previous, yaml.SequenceNode):
+            if len(previous.value) != len(new.value):
+                return None
+            stack.extend(zip(previous.value, new.value))
+
+    return pairs
+
+
+def _move_error(error, line_offset):
+    if error.line is not None:
+        error.line += line_offset
+        error.start_line = error.line
+    if error.end_line is not None:
+        error.end_line += line_offset
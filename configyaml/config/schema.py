@@ -0,0 +1,84 @@
+import warnings
+
+from .base import AbstractNode
+
+
+class Schema(object):
+    """A node declaration, checked and compiled once
+
+    Node classes name the attributes they are declared with in
+    ``_schema_attributes``; the values of those attributes are the declaration
+    a schema is compiled from.
+    """
+    def __init__(self, *declaration):
+        self.declaration = declaration
+
+    def matches(self, declaration):  # type: (tuple) -> bool
+        """Whether this schema was compiled from the given declaration
+
+        :rtype: bool
+        """
+        if all(a is b for a, b in zip(self.declaration, declaration)):
+            return True
+
+        return self.declaration == declaration
+
+
+def _check_node_class(node_class, name):
+    if not isinstance(node_class, type) or not issubclass(node_class, AbstractNode):
+        raise TypeError('{} must be a subclass of AbstractNode, not {!r}'.format(name, node_class))
+
+
+class DictSchema(Schema):
+    """Compiled ``_dict_fields`` of a DictNode"""
+    field_options = ('class', 'required', 'default')
+
+    def __init__(self, dict_fields):
+        super(DictSchema, self).__init__(dict_fields)
+
+        if not isinstance(dict_fields, dict):
+            raise TypeError('_dict_fields must be a dict')
+
+        for key, field in dict_fields.items():
+            if not isinstance(field, dict) or 'class' not in field:
+                raise TypeError('_dict_fields[{!r}] must be a dict with a "class"'.format(key))
+
+            _check_node_class(field['class'], '_dict_fields[{!r}]["class"]'.format(key))
+
+            unknown_options = set(field.keys()) - set(self.field_options)
+            if unknown_options:
+                # ignored, like they always were, but likely a typo
+                warnings.warn('_dict_fields[{!r}] has unknown options: {}'.format(key, ', '.join(sorted(unknown_options))), stacklevel=2)
+
+        self.fields = dict_fields
+        self.field_classes = dict((k, v['class']) for k, v in dict_fields.items())
+        self.required = tuple(k for k, v in dict_fields.items() if v.get('required', False))
+        self.defaults = tuple((k, v['class'], v['default']) for k, v in dict_fields.items() if 'default' in v)
+        self.available_fields = ', '.join(sorted(dict_fields.keys()))
+
+
+class ListSchema(Schema):
+    """Compiled ``_list_item_class`` and ``_min_items_required`` of a ListNode"""
+    def __init__(self, list_item_class, min_items_required):
+        super(ListSchema, self).__init__(list_item_class, min_items_required)
+
+        _check_node_class(list_item_class, '_list_item_class')
+
+        if not isinstance(min_items_required, int) or min_items_required < 0:
+            raise TypeError('_min_items_required must be a positive integer')
+
+        self.item_class = list_item_class
+        self.min_items = min_items_required
+
+
+class ChoiceSchema(Schema):
+    """Compiled ``_choices`` of a ChoiceNode"""
+    def __init__(self, choices):
+        super(ChoiceSchema, self).__init__(choices)
+
+        if not choices:
+            raise AttributeError('_choices must be defined in subclasses of ConfigBaseChoices')
+
+        self.choices = tuple(choices)
+        self.choice_set = frozenset(self.choices)
+        self.description = 'Must be one of {}'.format(', '.join(self.choices))
@@ -1,4 +1,5 @@
 from __future__ import unicode_literals
+import copy
 
 
 class ConfigError(object):
@@ -19,6 +20,19 @@ class ConfigError(object):
     def __str__(self):
         return self.title
 
+    def moved(self, line_offset):  # type: (int) -> ConfigError
+        """A copy of the error, ``line_offset`` lines further down
+
+        :rtype: :ConfigError:
+        """
+        error = copy.copy(self)
+        if error.line is not None:
+            error.line += line_offset
+            error.start_line = error.line
+        if error.end_line is not None:
+            error.end_line += line_offset
+        return error
+
     def as_dict(self):
         return {
             'title': self.title,
@@ -51,6 +65,11 @@ class ConfigError(object):
 
     @classmethod
     def create_from_yaml_node(cls, node, *args, **kwargs):
+        """Create an error at the marks of a yaml node
+
+        ``node`` can be a yaml node, or a ``configyaml.positions.Position``
+        once the loader has released the node graph.
+        """
         if 'error_obj' not in kwargs:
             # if no error_obj specified, use node
             kwargs['error_obj'] = node
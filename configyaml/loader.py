@@ -1,25 +1,150 @@
 from __future__ import unicode_literals
+import io
+from collections import namedtuple
+
 import yaml
 
+from .cache import LoadedConfig
+from .config.base import _lazy_build
+from .config.reuse import SubtreeReuse
 from .errors import ConfigError
+from .parser import parse, split_documents
+from .positions import PositionTable
+from .serialize import iter_json
+from .source import _LINE_BREAKS, FileSource
+from .timings import NO_TIMINGS
+
+
+class LoadedDocument(namedtuple('LoadedDocument', ['index', 'line_offset', 'loader', 'errors'])):
+    """One document of :meth:`ConfigLoader.iter_documents`
+
+    ``loader`` loaded the text of the document alone, so its errors and
+    ``as_text()`` count lines from the start of the document. ``errors`` are
+    copies of its errors with lines counted from the start of the stream
+    (``line_offset`` is the line the document starts on).
+    """
+    __slots__ = ()
+
+    @property
+    def config_root(self):
+        return self.loader.config_root
+
+    def is_valid(self):  # type: () -> bool
+        return not self.errors
 
 
 class ConfigLoader(object):
     config_root_class = None
+    # None uses libyaml when available, or force with 'c' or 'python'
+    yaml_backend = None
+    # swap the PyYAML node graph for a compact PositionTable once the tree is built
+    release_yaml_nodes = False
+    # a LoadCache shared by instances, to skip parsing and validating repeated texts
+    load_cache = None
+    # a ParseCache directory, to skip parsing texts seen by earlier processes
+    parse_cache = None
+    # set to LoadTimings (or a subclass) to record how long each load takes in loader.timings
+    timings_class = None
+    # only build and validate the children of a dict or list when they're first used;
+    # errors, as_dict() and as_text() build the rest of the tree, in the order of the
+    # config (nodes built later see the context as it is then, not as it was at load)
+    lazy = False
 
-    def __init__(self, config_text, context={}, variables={}):
+    def __init__(self, config_text, context=None, variables=None):
         if not self.config_root_class:
             raise AttributeError('config_root_class must defined in subclasses of ConfigLoader')
 
+        self.source = None
         self.config_text = config_text
         self.config_dict = None
         self.config_root = None
-        self.context = context
-        self.variables = variables
+        self.positions = None
+        self.timings = None
+        # nodes inject into the context, so a shared default would leak between loads
+        self.context = context if context is not None else {}
+        self.variables = variables if variables is not None else {}
+        # what the context was before the tree injected into it
+        self._original_context = dict(self.context)
 
         self._errors = []
+        self._all_errors = None
+        self._all_errors_version = None
         self.load()
 
+    @classmethod
+    def from_path(cls, path, context=None, variables=None):  # type: (str, dict, dict) -> ConfigLoader
+        """Load a config file, keeping its bytes instead of its text
+
+        The parser reads the file's bytes a chunk at a time and ``as_text()``
+        decodes them a line at a time, so the loader doesn't keep a copy of the
+        text (see :class:`configyaml.source.FileSource`). ``config_text`` is
+        decoded from the bytes each time it's used, and with a ``load_cache`` or
+        ``parse_cache`` the text is decoded to key the caches.
+
+        :rtype: :ConfigLoader:
+        """
+        return cls(FileSource.from_path(path), context=context, variables=variables)
+
+    @classmethod
+    def from_stream(cls, fileobj, context=None, variables=None):  # type: (IO, dict, dict) -> ConfigLoader
+        """Load a config from an open file
+
+        A file on disk that hasn't been read from yet is kept as bytes, like
+        with :meth:`from_path`. Other streams (pipes, ``io.StringIO``, ...) are
+        read into a text.
+
+        :rtype: :ConfigLoader:
+        """
+        try:
+            source = FileSource(fileobj) if fileobj.tell() == 0 else None
+        except (AttributeError, IOError, OSError, ValueError):
+            # not a file with a descriptor (io.UnsupportedOperation is an OSError and a ValueError)
+            source = None
+
+        return cls(source if source is not None else fileobj.read(), context=context, variables=variables)
+
+    @property
+    def config_text(self):  # type: () -> str
+        """The text of the config, decoded from the bytes each time for a loader with a ``source``"""
+        if self.source is not None:
+            return self.source.read_text()
+        return self._config_text
+
+    @config_text.setter
+    def config_text(self, config_text):
+        # a FileSource is kept and read from, instead of its text
+        if isinstance(config_text, FileSource):
+            self.source, self._config_text = config_text, None
+        else:
+            self.source, self._config_text = None, config_text
+
+    @classmethod
+    def iter_documents(cls, stream, context=None, variables=None):
+        """Load each document of a multi-document YAML stream, one at a time
+
+        ``stream`` is a text, or a file (or any iterable of lines) that is
+        read a line at a time, so memory is bounded by the largest document as
+        long as the documents aren't kept. Each document is loaded by its own
+        instance of the class, with a copy of ``context``, so context injected by
+        one document doesn't leak into the next.
+
+        :rtype: iterator of :LoadedDocument:
+        """
+        if isinstance(stream, bytes):
+            stream = stream.decode('utf-8')
+        if isinstance(stream, str):
+            # newline='' splits lines on the same breaks as the yaml reader, and keeps them
+            stream = io.StringIO(stream, newline='')
+
+        for index, (line_offset, text) in enumerate(split_documents(stream)):
+            loader = cls(
+                text,
+                context=dict(context) if context is not None else None,
+                variables=variables,
+            )
+            errors = [error.moved(line_offset) for error in loader.errors]
+            yield LoadedDocument(index, line_offset, loader, errors)
+
     def load(self):
         """
         - should not be empty
@@ -28,16 +153,79 @@ class ConfigLoader(object):
           getting objects out of those, processing grammar if necessary, validating other settings
           errors coming all the way back up
         """
-        if not isinstance(self.config_text, str):
-            self.config_text = self.config_text.decode('utf-8')
+        self.timings = self.timings_class() if self.timings_class is not None else None
 
-        if not self.config_text.strip():
+        with self._phase('load'):
+            self._load_config()
+
+    def _phase(self, name):
+        return (self.timings or NO_TIMINGS).phase(name)
+
+    def _load_config(self):
+        self.invalidate_errors()
+        self._errors = []
+        self.config_dict = None
+        self.config_root = None
+        self.positions = None
+
+        if self.source is None and not isinstance(self._config_text, str):
+            self._config_text = self._config_text.decode('utf-8')
+
+        if self.source is not None:
+            is_blank = self.source.is_blank()
+        else:
+            is_blank = not self._config_text.strip()
+
+        if is_blank:
             self._errors.append(ConfigError(title='YAML is empty', description='Your configuration file appears to be empty.'))
             return
 
-        # simple way to check that yaml itself is valid
+        if self.load_cache is None:
+            self._load()
+            return
+
+        with self._phase('cache'):
+            cache_key = self.load_cache.key_for(self)
+            cached = self.load_cache.get(cache_key)
+
+        if cached is not None:
+            self._load_cached(cached)
+            return
+
+        original_context = dict(self.context)
+        self._load()
+
+        with self._phase('cache'):
+            injected_context = dict(
+                (k, v) for k, v in self.context.items()
+                if k not in original_context or original_context[k] is not v
+            )
+            loaded = LoadedConfig(
+                config_dict=self.config_dict,
+                config_root=self.config_root,
+                errors=tuple(self._errors),
+                positions=self.positions,
+                injected_context=injected_context,
+            )
+            self.load_cache.put(
+                cache_key,
+                # the nodes' context is replaced by that of each loader it's copied for
+                loaded.copy({}, self.variables),
+                size=len(self.source) if self.source is not None else len(self._config_text),
+            )
+
+    def _load(self):
+        # parse once, getting both the values and the node tree (for line numbers)
+        node_tree = None
+        parse_function = self.parse_cache.parse if self.parse_cache is not None else parse
         try:
-            self.config_dict = yaml.safe_load(self.config_text)
+            with self._phase('parse'):
+                self.config_dict, node_tree = parse_function(
+                    # the parse cache is keyed on the text
+                    self.source if self.source is not None and self.parse_cache is None else self.config_text,
+                    backend=self.yaml_backend,
+                    timings=self.timings,
+                )
         except yaml.YAMLError as e:
             error = ConfigError.create_from_yaml_error(e)
             self._errors.append(error)
@@ -45,30 +233,201 @@ class ConfigLoader(object):
 
         if self.config_dict:
             # we have valid yaml with data, so start checking the components
-            node_tree = yaml.compose(self.config_text)
             # give it the parsed settings, and the node info
-            self.config_root = self.config_root_class(
-                value=self.config_dict,
-                value_node=node_tree,
-                context=self.context,
-                variables=self.variables,
-            )
+            # a tree in the load cache is shared between loaders, and releasing the
+            # yaml nodes walks the whole tree, so those are always built in full
+            self._build(node_tree, lazy=self.lazy and self.load_cache is None and not self.release_yaml_nodes)
+
+            if self.release_yaml_nodes:
+                with self._phase('release'):
+                    self._release_yaml_nodes()
+
+    def _build(self, node_tree, lazy=False):  # type: (yaml.Node, bool) -> None
+        previous_lazy = getattr(_lazy_build, 'lazy', False)
+        _lazy_build.lazy = lazy
+        try:
+            with self.timings or NO_TIMINGS, self._phase('build'):
+                self.config_root = self.config_root_class(
+                    value=self.config_dict,
+                    value_node=node_tree,
+                    context=self.context,
+                    variables=self.variables,
+                )
+        finally:
+            _lazy_build.lazy = previous_lazy
+
+    def _build_in_full(self):  # type: () -> None
+        """Build the children a lazy tree hasn't built yet
+
+        The tree is walked in the order of the config, and each container
+        still waiting to build its children builds them all, like an eager
+        load would from there. Nodes that were already built are kept as they
+        are, along with the context injected so far.
+        """
+        if self.config_root is None or not self.config_root._lazy:
+            return
+
+        stack = [self.config_root]
+        while stack:
+            node = stack.pop()
+            # so the children it builds (and theirs) aren't lazy either
+            node._lazy = False
+            node._build_children()
+
+            children = node._built_child_nodes()
+            children.reverse()
+            stack.extend(children)
+
+    def update(self, config_text):  # type: (str) -> list
+        """Load edited text, reusing the nodes of the parts that didn't change
+
+        The text is parsed again, but subtrees whose text, value and class are
+        the same as before are moved into the new tree instead of being built
+        and validated again (see :class:`configyaml.config.reuse.SubtreeReuse`).
+        The context is reset to what was given to the loader first.
+
+        Without a previous tree, or with ``load_cache`` or ``release_yaml_nodes``
+        (their trees can't be changed), it's the same as a full load.
+
+        :rtype: list of :ConfigError:, the new errors
+        """
+        previous_root = self.config_root
+        previous_text = self.config_text
+        self.config_text = config_text
+
+        self.context.clear()
+        self.context.update(self._original_context)
+
+        if (
+            previous_root is None or
+            self.load_cache is not None or
+            self.release_yaml_nodes or
+            not isinstance(previous_root._value_node, yaml.Node)
+        ):
+            self.load()
+            return self.errors
+
+        if not isinstance(self.config_text, str):
+            self.config_text = self.config_text.decode('utf-8')
+
+        with SubtreeReuse(previous_root, previous_text, self.config_text):
+            self.load()
+
+        return self.errors
+
+    def apply_edit(self, start, end, replacement):  # type: (int, int, str) -> list
+        """Replace ``config_text[start:end]`` with ``replacement``, and :meth:`update`
+
+        :rtype: list of :ConfigError:, the new errors
+        """
+        return self.update(self.config_text[:start] + replacement + self.config_text[end:])
+
+    def _load_cached(self, cached):  # type: (LoadedConfig) -> None
+        cached = cached.copy(self.context, self.variables)
+        self.config_dict = cached.config_dict
+        self.config_root = cached.config_root
+        self.positions = cached.positions
+        self._errors = list(cached.errors)
+        self.context.update(cached.injected_context)
+
+    def _release_yaml_nodes(self):
+        """Replace the yaml nodes of the tree with positions in self.positions
+
+        The node graph references marks and the parser's text buffers, so for a
+        long-lived config it's most of the memory used. Errors keep their line
+        and column numbers, and nodes can still add errors afterwards.
+        """
+        positions = PositionTable()
+        stack = [self.config_root]
+        while stack:
+            node = stack.pop()
+            # children of a lazy tree are built from the yaml nodes, so before releasing them
+            children = node._child_nodes()
+            node._release_yaml_node(positions)
+            stack.extend(children)
+
+        self.positions = positions
 
     @property
     def errors(self):
+        """All errors, from parsing and from every node of the tree
+
+        The list is collected once and cached. It is rebuilt after the tree is
+        reloaded or a node adds an error, and can be dropped with
+        :meth:`invalidate_errors` after changing the tree some other way.
+        Treat it as read-only.
+        """
+        self._build_in_full()
+        errors = self._cached_errors()
+
+        if errors is None:
+            with self._phase('errors'):
+                errors = list(self._errors)
+                if self.config_root:
+                    errors.extend(self.config_root._iter_all_errors())
+
+            self._all_errors = errors
+            self._all_errors_version = self._tree_errors_version()
+
+        return errors
+
+    @property
+    def error_count(self):  # type: () -> int
+        """The number of errors, without collecting them into a list"""
+        self._build_in_full()
+        errors = self._cached_errors()
+        if errors is not None:
+            return len(errors)
+
+        with self._phase('errors'):
+            count = len(self._errors)
+            if self.config_root:
+                count += self.config_root._count_all_errors()
+
+        return count
+
+    def has_errors(self):  # type: () -> bool
+        """Whether there are any errors, stopping at the first one found
+
+        :rtype: bool
+        """
+        self._build_in_full()
+        errors = self._cached_errors()
+        if errors is not None:
+            return bool(errors)
+
+        if self._errors:
+            return True
+
         if self.config_root:
-            return self._errors + self.config_root._get_all_errors()
+            for _ in self.config_root._iter_all_errors():
+                return True
+
+        return False
+
+    def _tree_errors_version(self):
+        return self.config_root._errors_version if self.config_root else None
+
+    def _cached_errors(self):
+        if self._all_errors is not None and self._all_errors_version == self._tree_errors_version():
+            return self._all_errors
+
+        return None
 
-        return self._errors
+    def invalidate_errors(self):  # type: () -> None
+        """Drop the cached list of errors, so the next access collects them again"""
+        self._all_errors = None
+        self._all_errors_version = None
 
     def is_valid(self):
-        return not self.errors
+        return not self.has_errors()
 
     def __getitem__(self, key):
         # just pass off as dict right now
         return self.config_dict[key]
 
     def as_dict(self, redact=False):
+        self._build_in_full()
         d = {
             'config_text': self.config_text,
             'config': self.config_root._as_dict(redact=redact) if self.config_root else None,
@@ -77,46 +436,99 @@ class ConfigLoader(object):
             d['errors'] = [x.as_dict() for x in self.errors]
         return d
 
+    def iter_json(self, redact=False, include_text=True, omit_valid_leaves=False, default=None):
+        """Yield the JSON of :meth:`as_dict` in chunks, without building the dict
+
+        ``include_text=False`` leaves out ``config_text``, and
+        ``omit_valid_leaves`` the leaf nodes without errors (see
+        :func:`configyaml.serialize.iter_json`).
+
+        :rtype: iterator of str
+        """
+        self._build_in_full()
+        return iter_json(
+            self,
+            redact=redact,
+            include_text=include_text,
+            omit_valid_leaves=omit_valid_leaves,
+            default=default,
+        )
+
+    def write_json(self, fileobj, **kwargs):  # type: (IO, ...) -> None
+        """Write :meth:`iter_json` to a file-like object"""
+        for chunk in self.iter_json(**kwargs):
+            fileobj.write(chunk)
+
     def as_text(self):
         if self.is_valid():
             return self.config_text
 
+        return ''.join(self.iter_text())
+
+    def iter_text(self):
+        """Yield the text of :meth:`as_text` in pieces, a line (or error block) at a time
+
+        :rtype: iterator of str
+        """
+        if self.is_valid():
+            for line in self._iter_lines(keepends=True):
+                yield line
+            return
+
+        errors_by_line = {}
+        for error in self.errors:
+            errors_by_line.setdefault(error.line, []).append(error)
+
+        for index, line in enumerate(self._iter_lines(keepends=False)):
+            yield line if index == 0 else '\n' + line
+
+            errors_on_line = errors_by_line.get(index)
+            if errors_on_line:
+                yield '\n' + self._format_line_errors(line, errors_on_line)
+
+    def _iter_lines(self, keepends):
+        if self.source is None:
+            for line in self.config_text.splitlines(keepends):
+                yield line
+        elif keepends:
+            for line in self.source.iter_lines():
+                yield line
         else:
-            output = []
-            errored_lines = set([x.line for x in self.errors])
-
-            for index, line in enumerate(self.config_text.splitlines()):
-                output.append(line)
-                if index in errored_lines:
-                    errors_on_line = [x for x in self.errors if x.line == index]
-                    # If there is more than one error on a line, try to group them by title and place in a
-                    # single comment block
-                    if len(errors_on_line) > 1:
-                        error_str = """# {line}\n# ^\n# --------\n""".format(line=line)
-                        unique_titles = set([x.title for x in errors_on_line])
-
-                        for t in sorted(unique_titles):
-                            error_str += """# {title}\n""".format(title=t)
-                            for d in sorted([x.description for x in errors_on_line if x.title == t]):
-                                error_str += """# - {description}\n""".format(description=d)
-
-                        error_str += """# --------"""
-                    else:
-                        e = errors_on_line[0]
-                        num_markers = 1 if not e.end_column else e.end_column - e.start_column
-                        markers = '^' * num_markers
-                        error_str = """\
+            for line in self.source.iter_lines():
+                yield line.rstrip(_LINE_BREAKS)
+
+    def write_text(self, fileobj):  # type: (IO) -> None
+        """Write :meth:`as_text` to a file-like object, without building the whole string"""
+        for piece in self.iter_text():
+            fileobj.write(piece)
+
+    def _format_line_errors(self, line, errors_on_line):  # type: (str, list) -> str
+        # If there is more than one error on a line, try to group them by title and place in a
+        # single comment block
+        if len(errors_on_line) > 1:
+            error_str = """# {line}\n# ^\n# --------\n""".format(line=line)
+            unique_titles = set([x.title for x in errors_on_line])
+
+            for t in sorted(unique_titles):
+                error_str += """# {title}\n""".format(title=t)
+                for d in sorted([x.description for x in errors_on_line if x.title == t]):
+                    error_str += """# - {description}\n""".format(description=d)
+
+            error_str += """# --------"""
+        else:
+            e = errors_on_line[0]
+            num_markers = 1 if not e.end_column else e.end_column - e.start_column
+            markers = '^' * num_markers
+            error_str = """\
 # {line}
 # {markers}
 # --------
 # {title}
 # - {description}
-# --------""".format(           line=line,
-                            markers=markers.rjust(e.start_column + 1),
-                            title=e.title,
-                            description=e.description,
-                        )
-                    output.append(error_str)
-
-            text = '\n'.join([str(x) for x in output])
-            return text
+# --------""".format(line=line,
+                   markers=markers.rjust(e.start_column + 1),
+                   title=e.title,
+                   description=e.description,
+                   )
+
+        return error_str
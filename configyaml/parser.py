@@ -0,0 +1,177 @@
+from __future__ import unicode_literals
+import yaml
+
+from .source import _LINE_BREAKS, FileSource
+from .timings import NO_TIMINGS
+
+
+BACKEND_C = 'c'
+BACKEND_PYTHON = 'python'
+
+HAS_LIBYAML = getattr(yaml, '__with_libyaml__', False)
+
+
+def resolve_backend(backend=None):  # type: (str) -> str
+    """Return the backend to parse with
+
+    ``None`` picks the libyaml (C) backend when PyYAML was built with it, and
+    falls back to the pure python one otherwise.
+
+    :rtype: str
+    """
+    if backend is None:
+        return BACKEND_C if HAS_LIBYAML else BACKEND_PYTHON
+
+    if backend == BACKEND_C and not HAS_LIBYAML:
+        raise ValueError('The "c" YAML backend requires PyYAML to be built with libyaml')
+
+    if backend not in (BACKEND_C, BACKEND_PYTHON):
+        raise ValueError('Unknown YAML backend "{}", must be one of: {}, {}'.format(backend, BACKEND_C, BACKEND_PYTHON))
+
+    return backend
+
+
+def parse(config_text, backend=None, timings=None):  # type: (str, str, LoadTimings) -> tuple
+    """Parse YAML text a single time, returning the python data and the node tree
+
+    The python values are constructed from the same composed node graph that the
+    config nodes use for line/column information, so the text is only scanned once.
+
+    Merge keys (``<<``) are flattened into the mapping node during construction,
+    so merged keys point at the node they were merged from.
+
+    Nodes and errors are the same regardless of backend: when libyaml fails,
+    the text is parsed again in python to produce PyYAML's error (libyaml words
+    its errors differently), and end marks that libyaml reports past the end of
+    the text are moved back to where the python parser puts them.
+
+    ``config_text`` can also be a :class:`~configyaml.source.FileSource`,
+    which the parsers read a chunk at a time instead of as a whole string.
+
+    ``timings`` records the ``compose`` and ``construct`` phases.
+
+    :rtype: tuple of (data, yaml.Node)
+    """
+    timings = timings or NO_TIMINGS
+
+    if resolve_backend(backend) == BACKEND_PYTHON:
+        return _parse_with(yaml.SafeLoader, _reader_for(config_text), timings)
+
+    try:
+        data, node = _parse_with(yaml.CSafeLoader, _reader_for(config_text), timings)
+    except yaml.YAMLError:
+        # errors are the rare case, so let the python parser describe them
+        return _parse_with(yaml.SafeLoader, _reader_for(config_text), timings)
+
+    if node is not None:
+        if not isinstance(config_text, FileSource):
+            _fix_end_of_stream_marks(node, config_text)
+        elif not config_text.ends_with_line_break():
+            # only the last line is looked at, but the marks count characters, not bytes
+            _fix_end_of_stream_marks(node, config_text.read_text())
+
+    return data, node
+
+
+def _reader_for(config_text):
+    if isinstance(config_text, FileSource):
+        return config_text.open()
+    return config_text
+
+
+def split_documents(lines):  # type: (Iterable[str]) -> Iterator[tuple]
+    """Split a multi-document YAML stream into the text of each document
+
+    ``lines`` is any iterable of lines with their line breaks, like an open
+    file, and is read one line at a time, so only the current document is
+    held in memory. Yields ``(line_offset, text)``, where ``line_offset`` is
+    the zero based line of the stream the document's text starts on.
+
+    A document starts at a ``---`` marker line, which is kept in its text,
+    and ends at the next one or at a ``...`` marker line. Blank lines and
+    comments before a document belong to it, as do directives, which also end
+    the document before. Those after the content of a document belong to the
+    document before, unless it ended with ``...``. YAML doesn't allow a marker
+    inside a document, even in a block scalar, so lines are enough to split on.
+
+    :rtype: iterator of (int, str)
+    """
+    document = []
+    line_offset = 0
+    has_content = False
+
+    for number, line in enumerate(lines):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+
+        if _is_marker(line, '---'):
+            if has_content:
+                yield line_offset, ''.join(document)
+                document = []
+                line_offset = number
+            has_content = True
+        elif line.startswith('%') and has_content:
+            # a directive is for the next document
+            yield line_offset, ''.join(document)
+            document = []
+            line_offset = number
+            has_content = False
+        elif _is_marker(line, '...') and has_content:
+            document.append(line)
+            yield line_offset, ''.join(document)
+            document = []
+            line_offset = number + 1
+            has_content = False
+            continue
+        elif not has_content:
+            stripped = line.strip()
+            has_content = bool(stripped) and stripped[0] not in '#%'
+
+        document.append(line)
+
+    if has_content:
+        yield line_offset, ''.join(document)
+
+
+def _is_marker(line, marker):  # type: (str, str) -> bool
+    return line.startswith(marker) and (len(line) == 3 or line[3] in ' \t\r\n')
+
+
+def _parse_with(loader_class, config_text, timings):
+    loader = loader_class(config_text)
+    try:
+        with timings.phase('compose'):
+            node = loader.get_single_node()
+        if node is None:
+            return None, None
+
+        with timings.phase('construct'):
+            return loader.construct_document(node), node
+    finally:
+        loader.dispose()
+
+
+def _fix_end_of_stream_marks(node, config_text):
+    """Move end marks libyaml puts on the line after the last one
+
+    When the text doesn't end with a line break, libyaml reports collections that
+    end with the stream at column 0 of the following line. Only the last child of
+    each collection can reach the end of the stream, so this follows that spine.
+    """
+    length = len(config_text)
+    if not length or config_text[-1] in _LINE_BREAKS:
+        return
+
+    last_line_start = max(config_text.rfind(c) for c in _LINE_BREAKS) + 1
+
+    while node is not None and node.end_mark.index == length:
+        mark = node.end_mark
+        if mark.column == 0 and length != last_line_start:
+            node.end_mark = yaml.Mark(mark.name, mark.index, mark.line - 1, length - last_line_start, None, None)
+
+        if isinstance(node, yaml.MappingNode) and node.value:
+            node = node.value[-1][1]
+        elif isinstance(node, yaml.SequenceNode) and node.value:
+            node = node.value[-1]
+        else:
+            node = None
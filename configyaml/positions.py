@@ -0,0 +1,62 @@
+from __future__ import unicode_literals
+from array import array
+from collections import namedtuple
+
+
+Mark = namedtuple('Mark', ['line', 'column'])
+
+
+class PositionTable(object):
+    """Start and end marks of yaml nodes, packed into a single array
+
+    Lets a loaded config drop the PyYAML node graph (and the marks and text
+    buffers it references) while keeping line/column information for errors.
+    """
+    __slots__ = ('_data',)
+
+    def __init__(self):
+        # start line, start column, end line, end column for each node
+        self._data = array('l')
+
+    def add(self, yaml_node):  # type: (yaml.Node) -> Position
+        """Store the marks of a yaml node, and return its position in the table
+
+        :rtype: :Position:
+        """
+        index = len(self._data)
+        self._data.extend((
+            yaml_node.start_mark.line,
+            yaml_node.start_mark.column,
+            yaml_node.end_mark.line,
+            yaml_node.end_mark.column,
+        ))
+        return Position(self, index)
+
+    def __len__(self):
+        return len(self._data) // 4
+
+
+class Position(object):
+    """The marks of one node in a :PositionTable:
+
+    Has the ``start_mark`` and ``end_mark`` of a yaml node, so it can be used
+    wherever the node was (``ConfigError.create_from_yaml_node``, ``_add_error``).
+    """
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    @property
+    def start_mark(self):  # type: () -> Mark
+        data = self._table._data
+        return Mark(data[self._index], data[self._index + 1])
+
+    @property
+    def end_mark(self):  # type: () -> Mark
+        data = self._table._data
+        return Mark(data[self._index + 2], data[self._index + 3])
+
+    def __repr__(self):
+        return '<Position start={} end={}>'.format(tuple(self.start_mark), tuple(self.end_mark))
@@ -0,0 +1,236 @@
+"""Write ``ConfigLoader.as_dict()`` as JSON without building the dict
+
+:func:`iter_json` walks the node tree with a stack of iterators instead of
+recursing, and yields the JSON text in chunks as it goes, so only the
+current path through the tree is held, not a nested copy of all of it.
+"""
+from __future__ import unicode_literals
+import json
+
+from .config.base import AbstractNode
+from .config.base import _function
+from .config.dict import DictNode
+from .config.list import ListNode
+from .config.nodes import WildcardDictNode
+
+# join the pieces into chunks of about this many characters
+CHUNK_SIZE = 64 * 1024
+
+
+# the _as_dict_from_children implementations written out here; subtrees of
+# classes that override them, _as_dict (or _as_redacted_dict) are encoded
+# from what _as_dict returns
+_AS_DICT = _function(AbstractNode._as_dict)
+_LEAF = _function(AbstractNode._as_dict_from_children)
+_DICT = _function(DictNode._as_dict_from_children)
+_WILDCARD = _function(WildcardDictNode._as_dict_from_children)
+_LIST = _function(ListNode._as_dict_from_children)
+_REDACTED = _function(AbstractNode._as_redacted_dict)
+_NO_INJECTION = _function(AbstractNode._as_dict_to_inject)
+
+
+def iter_json(loader, redact=False, include_text=True, omit_valid_leaves=False, default=None, chunk_size=CHUNK_SIZE):
+    """Yield the JSON of ``loader.as_dict(redact=redact)`` in chunks of text
+
+    With ``include_text=False`` the ``config_text`` is left out, and with
+    ``omit_valid_leaves`` so are the leaf nodes without errors, and the fields
+    that weren't given: dropped from dicts, and ``null`` in lists (so the
+    indexes of the items don't change). ``default`` is passed to the JSON
+    encoder, for values it can't encode (like dates).
+
+    :rtype: iterator of str
+    """
+    encode = json.JSONEncoder(default=default).encode
+    walker = _Walker(encode, redact, omit_valid_leaves)
+
+    def document():
+        yield '{'
+        if include_text:
+            yield '"config_text": '
+            yield encode(loader.config_text)
+            yield ', '
+
+        yield '"config": '
+        yield walker.write(loader.config_root) if loader.config_root else 'null'
+
+        errors = loader.errors
+        if errors:
+            yield ', "errors": '
+            yield encode([x.as_dict() for x in errors])
+        yield '}'
+
+    pieces = []
+    size = 0
+    stack = [document()]
+    while stack:
+        for piece in stack[-1]:
+            if not isinstance(piece, str):
+                # a container node, to write out before going on
+                stack.append(walker.parts(piece))
+                break
+
+            pieces.append(piece)
+            size += len(piece)
+            if size >= chunk_size:
+                yield ''.join(pieces)
+                pieces = []
+                size = 0
+        else:
+            stack.pop()
+
+    if pieces:
+        yield ''.join(pieces)
+
+
+# how a node class is written out
+_KIND_LEAF = 'leaf'
+_KIND_DICT = 'dict'
+_KIND_WILDCARD = 'wildcard'
+_KIND_LIST = 'list'
+_KIND_OTHER = 'other'  # encoded from what its _as_dict returns
+
+
+class _Walker(object):
+    def __init__(self, encode, redact, omit_valid_leaves):
+        self.encode = encode
+        self.redact = redact
+        self.omit_valid_leaves = omit_valid_leaves
+        self._kinds = {}  # node class: (kind, whether it injects fields)
+        self._keys = {}  # field name: encoded object key
+
+    def kind(self, cls):  # type: (type) -> tuple
+        kind = self._kinds.get(cls)
+        if kind is None:
+            implementation = _function(cls._as_dict_from_children)
+            if _function(cls._as_dict) is not _AS_DICT:
+                name = _KIND_OTHER
+            elif implementation is _LEAF:
+                name = _KIND_LEAF
+            elif implementation is _DICT:
+                name = _KIND_DICT
+            elif implementation is _WILDCARD:
+                name = _KIND_WILDCARD
+            elif implementation is _LIST:
+                name = _KIND_LIST
+            else:
+                name = _KIND_OTHER
+
+            kind = self._kinds[cls] = (name, _function(cls._as_dict_to_inject) is not _NO_INJECTION)
+
+        return kind
+
+    def write(self, node):  # type: (AbstractNode) -> Any
+        """The JSON of a node as text, or the node itself for a container to walk"""
+        if node is None:
+            return 'null'
+
+        kind, injects = self.kind(type(node))
+        if self.redact and node._should_redact():
+            if _function(type(node)._as_redacted_dict) is not _REDACTED:
+                return self.encode(node._as_redacted_dict())
+            return ''.join(self._object(node, [('value', '"[REDACTED]"'), ('redacted', 'true')], injects))
+
+        if kind is _KIND_LEAF:
+            if not node._errors and not injects:
+                return '{"value": %s}' % self.encode(node._value)
+            return ''.join(self._object(node, [('value', self.encode(node._value))], injects))
+        elif kind is _KIND_OTHER:
+            return self.encode(node._as_dict(redact=self.redact))
+
+        return node
+
+    def parts(self, node):  # type: (AbstractNode) -> Iterator[str]
+        """The JSON of a container node, in pieces (and the containers in it)"""
+        kind, injects = self.kind(type(node))
+        if kind is _KIND_DICT:
+            return self._object(node, self._dict_fields(node), injects)
+        elif kind is _KIND_WILDCARD:
+            return self._object(node, self._wildcard_fields(node), injects)
+
+        return self._object(node, [('items', self._list_items(node))], injects)
+
+    def key(self, name):  # type: (Any) -> str
+        if not isinstance(name, str):
+            # not cached, since True and 1 are the same dict key
+            return self.encode(_key(name)) + ': '
+
+        key = self._keys.get(name)
+        if key is None:
+            key = self._keys[name] = self.encode(name) + ': '
+        return key
+
+    def _object(self, node, fields, injects):
+        yield '{'
+        separator = ''
+        for name, value in fields:
+            if isinstance(value, AbstractNode):
+                value = self.write(value)
+
+            if isinstance(value, str):
+                yield separator + self.key(name) + value
+            else:
+                yield separator + self.key(name)
+                if isinstance(value, AbstractNode):
+                    yield value
+                else:
+                    for piece in value:
+                        yield piece
+            separator = ', '
+
+        if node._errors:
+            yield separator + '"errors": ' + self.encode([x.as_dict() for x in node._errors])
+            separator = ', '
+
+        if injects:
+            for name, value in node._as_dict_to_inject(redact=self.redact).items():
+                yield separator + self.key(name) + self.encode(value)
+                separator = ', '
+
+        yield '}'
+
+    def _is_omitted(self, child):
+        if not self.omit_valid_leaves:
+            return False
+        return not child or (self.kind(type(child))[0] is _KIND_LEAF and not child._errors)
+
+    def _dict_fields(self, node):
+        for name in node._get_schema().fields.keys():
+            child = node.get(name, None)
+            if not self._is_omitted(child):
+                # like DictNode._as_dict_from_children, missing (or falsy) fields are null,
+                # while empty containers are written as {} or []
+                yield name, child if child else 'null'
+
+    def _wildcard_fields(self, node):
+        for name, child in node._children.items():
+            if not self._is_omitted(child):
+                yield name, child
+
+    def _list_items(self, node):
+        yield '['
+        separator = ''
+        for child in node._children:
+            value = 'null' if self._is_omitted(child) else self.write(child)
+            if isinstance(value, str):
+                yield separator + value
+            else:
+                yield separator
+                yield value
+            separator = ', '
+        yield ']'
+
+
+def _key(name):
+    # object keys the way json.dumps writes keys that aren't strings
+    if isinstance(name, str):
+        return name
+    elif name is True:
+        return 'true'
+    elif name is False:
+        return 'false'
+    elif name is None:
+        return 'null'
+    elif isinstance(name, (int, float)):
+        return json.dumps(name)
+
+    raise TypeError('keys must be str, int, float, bool or None, not {}'.format(type(name).__name__))
@@ -0,0 +1,89 @@
+from __future__ import unicode_literals
+import io
+import os
+import re
+import stat
+
+_NOT_WHITESPACE = re.compile(br'\S')
+# characters the pure python reader treats as line breaks
+_LINE_BREAKS = '\n\r\x85\u2028\u2029'
+# the same line breaks in the utf-8 bytes (an encoded character can't
+# contain another's encoding), with \r\n as a single one like the reader
+_LINE_BREAK = re.compile(b'|'.join([b'\r\n'] + [re.escape(x.encode('utf-8')) for x in _LINE_BREAKS]))
+_ENCODED_LINE_BREAKS = tuple(x.encode('utf-8') for x in _LINE_BREAKS)
+
+
+class FileSource(object):
+    """The bytes of a config file, instead of its text decoded into a string
+
+    The file is read once, so the source doesn't change (or disappear) if the
+    file is edited after it's loaded. The parser reads the bytes through
+    :meth:`open` a chunk at a time, and the lines for ``as_text()`` are
+    decoded one at a time with :meth:`iter_lines`, so a loader made with
+    :meth:`ConfigLoader.from_path` keeps the bytes of the file but not its
+    text. :meth:`read_text` decodes all of it, for what needs the text as a
+    whole (like ``update()`` and the caches).
+    """
+    def __init__(self, fileobj):  # type: (IO) -> None
+        """Read an open file, raising ValueError if it isn't a regular file"""
+        self.name = getattr(fileobj, 'name', None)
+
+        if not stat.S_ISREG(os.fstat(fileobj.fileno()).st_mode):
+            raise ValueError('Only regular files are kept as bytes')
+
+        # read through the descriptor, whatever the mode of the file object
+        with io.open(fileobj.fileno(), 'rb', closefd=False) as f:
+            self.buffer = f.read()
+
+    @classmethod
+    def from_path(cls, path):  # type: (str) -> FileSource
+        with open(path, 'rb') as f:
+            return cls(f)
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def open(self):  # type: () -> _BufferReader
+        """A new reader over the bytes, from the start"""
+        return _BufferReader(self.buffer)
+
+    def read_text(self):  # type: () -> str
+        """Decode the whole file
+
+        :rtype: str
+        """
+        return self.buffer.decode('utf-8')
+
+    def iter_lines(self):  # type: () -> Iterator[str]
+        """Yield the decoded lines, with their line breaks (those of the yaml reader)
+
+        :rtype: iterator of str
+        """
+        start = 0
+        for line_break in _LINE_BREAK.finditer(self.buffer):
+            yield self.buffer[start:line_break.end()].decode('utf-8')
+            start = line_break.end()
+
+        if start < len(self.buffer):
+            yield self.buffer[start:].decode('utf-8')
+
+    def is_blank(self):  # type: () -> bool
+        return _NOT_WHITESPACE.search(self.buffer) is None
+
+    def ends_with_line_break(self):  # type: () -> bool
+        return self.buffer.endswith(_ENCODED_LINE_BREAKS)
+
+
+class _BufferReader(object):
+    """A file-like reader of a buffer, with a position of its own"""
+    __slots__ = ('buffer', 'position')
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.position = 0
+
+    def read(self, size=-1):
+        end = len(self.buffer) if size is None or size < 0 else min(self.position + size, len(self.buffer))
+        data = self.buffer[self.position:end]
+        self.position = end
+        return data
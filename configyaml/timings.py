@@ -0,0 +1,314 @@
+from __future__ import unicode_literals
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .config.base import _timing
+
+try:
+    from time import perf_counter as clock
+except ImportError:  # python 2
+    from time import time as clock
+
+
+class LoadTimings(object):
+    """Wall time and counts of the phases of a load, and of the node classes built
+
+    Enable it with ``timings_class`` on a ConfigLoader subclass, and read
+    ``loader.timings`` after loading::
+
+        class MyLoader(ConfigLoader):
+            config_root_class = Root
+            timings_class = LoadTimings
+
+        print(MyLoader(text).timings.report())
+
+    Phases are ``load`` (the whole of it), ``cache``, ``parse`` (split into
+    ``compose`` and ``construct``), ``build`` (creating and validating the
+    nodes), ``release`` and ``errors`` (collecting them, which happens when
+    they are first used). Node classes get their number of instances and the
+    time spent in their ``_validate_value``, which counts creating their
+    children but not the children's own ``_validate_value``.
+
+    It only adds a few clock reads per node, so it can be left enabled. Override
+    :meth:`record_phase` and :meth:`record_node_call` to send the timings
+    elsewhere as they are recorded.
+
+    Nodes record into the timings that are active (``with timings:``) in
+    their thread while they're built.
+    """
+    # the node methods timed, besides _validate_value which always is
+    timed_methods = frozenset()
+
+    def __init__(self):
+        self.phases = OrderedDict()  # phase name: [count, seconds]
+        self.node_classes = {}  # node class: {'instances': count, method name: [calls, seconds]}
+        # time spent in the nested calls of the call being timed
+        self._nested = 0.0
+        self._outer = []
+
+    def __enter__(self):
+        self._outer.append(getattr(_timing, 'timings', None))
+        _timing.timings = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _timing.timings = self._outer.pop()
+
+    @contextmanager
+    def phase(self, name):
+        start = clock()
+        try:
+            yield
+        finally:
+            self.record_phase(name, clock() - start)
+
+    def record_phase(self, name, seconds):  # type: (str, float) -> None
+        entry = self.phases.get(name)
+        if entry is None:
+            self.phases[name] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def node_created(self, node):  # type: (AbstractNode) -> None
+        stats = self.node_classes.get(type(node))
+        if stats is None:
+            stats = self.node_classes[type(node)] = {'instances': 0}
+        stats['instances'] += 1
+
+    def call(self, node, name, func, *args):
+        """Call ``func``, a method of ``node`` called ``name``, and record its own time"""
+        outer = self._nested
+        self._nested = 0.0
+        start = clock()
+        try:
+            return func(*args)
+        finally:
+            elapsed = clock() - start
+            self.record_node_call(node, name, elapsed - self._nested)
+            self._nested = outer + elapsed
+
+    def record_node_call(self, node, name, seconds):  # type: (AbstractNode, str, float) -> None
+        stats = self.node_classes.get(type(node))
+        if stats is None:
+            stats = self.node_classes[type(node)] = {'instances': 0}
+
+        entry = stats.get(name)
+        if entry is None:
+            stats[name] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def merge(self, timings):  # type: (dict) -> None
+        """Add the :meth:`as_dict` of the timings of another load (from another process, say)
+
+        Its node classes are kept by their dotted names.
+        """
+        for name, phase in timings['phases'].items():
+            entry = self.phases.get(name)
+            if entry is None:
+                entry = self.phases[name] = [0, 0.0]
+            entry[0] += phase['count']
+            entry[1] += phase['seconds']
+
+        for name, node_stats in timings['node_classes'].items():
+            stats = self.node_classes.get(name)
+            if stats is None:
+                stats = self.node_classes[name] = {'instances': 0}
+
+            for method, value in node_stats.items():
+                if method == 'instances':
+                    stats['instances'] += value
+                    continue
+
+                entry = stats.get(method)
+                if entry is None:
+                    entry = stats[method] = [0, 0.0]
+                entry[0] += value['calls']
+                entry[1] += value['seconds']
+
+    def as_dict(self):  # type: () -> dict
+        """The timings as plain data (node classes by dotted name)
+
+        :rtype: dict
+        """
+        node_classes = {}
+        for cls, stats in self.node_classes.items():
+            node_classes[class_name(cls)] = dict(
+                (name, value if name == 'instances' else {'calls': value[0], 'seconds': value[1]})
+                for name, value in stats.items()
+            )
+
+        return {
+            'phases': OrderedDict(
+                (name, {'count': count, 'seconds': seconds}) for name, (count, seconds) in self.phases.items()
+            ),
+            'node_classes': node_classes,
+        }
+
+    def report(self):  # type: () -> str
+        """A table of the phases, and of the node classes by time spent validating
+
+        :rtype: str
+        """
+        width = max([len('node class')] + [len(class_name(cls)) for cls in self.node_classes])
+        row = '{:<%d} {:>8} {:>12}' % width
+        timed_row = '{:<%d} {:>8} {:>12.3f}' % width
+
+        lines = [row.format('phase', 'count', 'ms')]
+        for name, (count, seconds) in self.phases.items():
+            lines.append(timed_row.format(name, count, seconds * 1000))
+
+        lines.append('')
+        lines.append(row.format('node class', 'nodes', 'validate ms'))
+        rows = sorted(
+            self.node_classes.items(),
+            key=lambda item: item[1].get('_validate_value', (0, 0))[1],
+            reverse=True,
+        )
+        for cls, stats in rows:
+            seconds = stats.get('_validate_value', (0, 0))[1]
+            lines.append(timed_row.format(class_name(cls), stats['instances'], seconds * 1000))
+
+        return '\n'.join(lines)
+
+
+class NodeProfiler(LoadTimings):
+    """Time spent in each step of building nodes, by node class and by path
+
+    Times ``_render_value``, ``_validate_type``, ``_validate_value`` and
+    ``_context_to_inject``, each without the time of the timed calls nested in
+    it (a dict validating its children, for example, still counts creating
+    them), to find the schema nodes that make a load slow. Use it as a loader's ``timings_class``, or around
+    any loading::
+
+        with NodeProfiler(collapse_indexes=True) as profiler:
+            MyLoader(text)
+
+        print(profiler.report(by='path', limit=20))
+
+    Paths are those of ``_path()``. With ``collapse_indexes``, list indexes are
+    replaced by ``*`` so the items of a list are added up together. It
+    slows loading down noticeably, so only turn it on to investigate.
+    """
+    timed_methods = frozenset(['_render_value', '_validate_type', '_validate_value', '_context_to_inject'])
+    methods = ('_render_value', '_validate_type', '_validate_value', '_context_to_inject')
+
+    def __init__(self, collapse_indexes=False):
+        super(NodeProfiler, self).__init__()
+        self.collapse_indexes = collapse_indexes
+        self.paths = {}  # path: {method name: [calls, seconds]}
+
+    def record_node_call(self, node, name, seconds):
+        super(NodeProfiler, self).record_node_call(node, name, seconds)
+
+        path = self.path_of(node)
+        stats = self.paths.get(path)
+        if stats is None:
+            stats = self.paths[path] = {}
+
+        entry = stats.get(name)
+        if entry is None:
+            stats[name] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def path_of(self, node):  # type: (AbstractNode) -> str
+        """The ``_path()`` of a node, with list indexes as ``*`` when collapsing them
+
+        :rtype: str
+        """
+        names = []
+        while node is not None:
+            key = node._key_name()
+            if self.collapse_indexes and isinstance(key, int) and not isinstance(key, bool):
+                key = '*'
+            names.append(key)
+            node = node._parent
+
+        names.reverse()
+        return '.'.join(str(name) for name in names)
+
+    def rows(self, by='class'):  # type: (str) -> list
+        """Totals by node class name or by path, the most time first
+
+        Each row is a dict of the ``name``, the ``calls`` and ``seconds`` of all
+        the timed methods, and the ``seconds`` of each method by its name.
+
+        :rtype: list of dict
+        """
+        if by == 'class':
+            groups = [(class_name(cls), stats) for cls, stats in self.node_classes.items()]
+        elif by == 'path':
+            groups = list(self.paths.items())
+        else:
+            raise ValueError('by must be "class" or "path"')
+
+        rows = []
+        for name, stats in groups:
+            row = {'name': name, 'calls': 0, 'seconds': 0.0}
+            for method in self.methods:
+                calls, seconds = stats.get(method, (0, 0.0))
+                row['calls'] += calls
+                row['seconds'] += seconds
+                row[method] = seconds
+            rows.append(row)
+
+        rows.sort(key=lambda row: (-row['seconds'], row['name']))
+        return rows
+
+    def as_dict(self):
+        d = super(NodeProfiler, self).as_dict()
+        d['classes'] = self.rows(by='class')
+        d['paths'] = self.rows(by='path')
+        return d
+
+    def report(self, by='class', limit=None):  # type: (str, int) -> str
+        """A table of :meth:`rows`, with the time of each method in ms
+
+        :rtype: str
+        """
+        rows = self.rows(by=by)[:limit]
+        width = max([len(by)] + [len(row['name']) for row in rows])
+        methods = [method.strip('_') for method in self.methods]
+
+        header = ['{:<{}}'.format(by, width), '{:>8}'.format('calls'), '{:>10}'.format('total ms')]
+        header.extend(methods)
+        lines = [' '.join(header)]
+
+        for row in rows:
+            columns = [
+                '{:<{}}'.format(row['name'], width),
+                '{:>8}'.format(row['calls']),
+                '{:>10.3f}'.format(row['seconds'] * 1000),
+            ]
+            for method, title in zip(self.methods, methods):
+                columns.append('{:>{}.3f}'.format(row[method] * 1000, len(title)))
+            lines.append(' '.join(columns))
+
+        return '\n'.join(lines)
+
+
+class _NoTimings(object):
+    """Stands in for a LoadTimings when timing is off"""
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+NO_TIMINGS = _NoTimings()
+
+
+def class_name(cls):  # type: (type) -> str
+    if isinstance(cls, str):
+        # merged from as_dict()
+        return cls
+    return '{}.{}'.format(cls.__module__, cls.__name__)
@@ -1,6 +1,59 @@
+import time
+from collections import namedtuple
+
 from .loader import ConfigLoader
 
 
+class ValidationResult(namedtuple('ValidationResult', ['index', 'errors', 'text', 'data', 'timings', 'read_error', 'json'])):
+    """The result for one text of :func:`validate_many`
+
+    ``index`` is the position of the text in the input, and ``errors`` a list
+    of ``ConfigError.as_dict()`` dicts (plain data, so it can cross processes).
+    When asked for, ``text`` is the annotated ``as_text()`` of an invalid
+    config, ``data`` its ``as_dict()`` and ``json`` its ``iter_json()`` text.
+    ``timings`` is the
+    ``LoadTimings.as_dict()`` of loaders with ``timings_class``, and
+    ``read_error`` why the input couldn't be read (which is an error too).
+    """
+    __slots__ = ()
+
+    def __new__(cls, index, errors, text=None, data=None, timings=None, read_error=None, json=None):
+        return super(ValidationResult, cls).__new__(cls, index, errors, text, data, timings, read_error, json)
+
+    def is_valid(self):  # type: () -> bool
+        return not self.errors
+
+
+class ValidationStats(object):
+    """Throughput of a :meth:`ConfigValidator.validate_many` run, updated as results arrive"""
+    def __init__(self):
+        self.count = 0
+        self.invalid = 0
+        self.errors = 0
+        self.started = None
+        self.elapsed = 0.0
+
+    @property
+    def per_second(self):  # type: () -> float
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+    def add(self, result):  # type: (ValidationResult) -> None
+        self.count += 1
+        if result.errors:
+            self.invalid += 1
+            self.errors += len(result.errors)
+        self.elapsed = time.time() - self.started
+
+    def as_dict(self):  # type: () -> dict
+        return {
+            'count': self.count,
+            'invalid': self.invalid,
+            'errors': self.errors,
+            'elapsed': self.elapsed,
+            'per_second': self.per_second,
+        }
+
+
 class ConfigValidator(object):
     """A stripped down class for performing validation only (uses dummy context)"""
     configyaml_class = ConfigLoader
@@ -9,7 +62,8 @@ class ConfigValidator(object):
     def __init__(self, config_text):
         if not self.context:
             raise AttributeError('self.context must be defined in subclasses of ConfigValidator')
-        self.loader = self.configyaml_class(config_text=config_text, context=self.context)
+        # a copy, so context injected by one config doesn't leak into the next
+        self.loader = self.configyaml_class(config_text=config_text, context=dict(self.context))
         self.errors = self.loader.errors
 
     def is_valid(self):
@@ -17,3 +71,99 @@ class ConfigValidator(object):
 
     def as_dict(self):
         return self.loader.as_dict()
+
+    @classmethod
+    def validate_many(cls, config_texts, **kwargs):
+        """Validate many texts, spread over a pool of worker processes
+
+        See :func:`validate_many`, which this calls with a loader of this
+        validator class. The class has to be importable by the workers
+        (defined at the top level of a module).
+
+        :rtype: iterator of :ValidationResult:
+        """
+        return validate_many(_ValidatorLoads(cls), config_texts, **kwargs)
+
+
+class _ValidatorLoads(object):
+    """Loads a text with a ConfigValidator subclass (picklable, for the workers)"""
+    def __init__(self, validator_class):
+        self.validator_class = validator_class
+
+    def __call__(self, config_text):  # type: (str) -> ConfigLoader
+        return self.validator_class(config_text).loader
+
+
+def validate_many(loader_for, items, workers=None, ordered=True, chunksize=16, stats=None, include_text=False, include_data=False, json_options=None):
+    """Load and validate many items, spread over a pool of worker processes
+
+    ``loader_for(item)`` returns the loader of an item (a text, or a path for
+    a loader that reads files). It's called in the workers, so it has to be
+    picklable, like a class or function at the top level of a module, or an
+    instance of one. If it raises IOError, OSError or UnicodeDecodeError, the
+    result has the ``read_error``.
+
+    Yields a :class:`ValidationResult` for each item, in the order of
+    ``items``, or as they complete with ``ordered=False``. Items are read from
+    the iterable as the workers need them. ``include_text`` and
+    ``include_data`` add the annotated text of invalid configs and
+    ``as_dict()`` to the results, and ``json_options`` (a dict of
+    :meth:`ConfigLoader.iter_json` arguments, like ``{'include_text': False}``)
+    the JSON text, which is written without building the dict.
+
+    ``workers`` defaults to the number of CPUs, and 1 validates in this process.
+    Pass a :class:`ValidationStats` as ``stats`` to follow the throughput.
+
+    :rtype: iterator of :ValidationResult:
+    """
+    # only imported here, since it's slow to import and most users validate one text at a time
+    import multiprocessing
+
+    if stats is not None:
+        stats.started = time.time()
+
+    tasks = ((loader_for, index, item, include_text, include_data, json_options) for index, item in enumerate(items))
+
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    if workers <= 1:
+        for task in tasks:
+            result = _validate(task)
+            if stats is not None:
+                stats.add(result)
+            yield result
+        return
+
+    pool = multiprocessing.Pool(workers)
+    try:
+        imap = pool.imap if ordered else pool.imap_unordered
+        for result in imap(_validate, tasks, chunksize):
+            if stats is not None:
+                stats.add(result)
+            yield result
+
+        pool.close()
+    finally:
+        # stops the workers if the results weren't all consumed
+        pool.terminate()
+        pool.join()
+
+
+def _validate(task):  # type: (tuple) -> ValidationResult
+    loader_for, index, item, include_text, include_data, json_options = task
+    try:
+        loader = loader_for(item)
+    except (IOError, OSError, UnicodeDecodeError) as e:
+        read_error = str(e)
+        return ValidationResult(index, [{'title': 'Could not be read', 'description': read_error}], read_error=read_error)
+
+    errors = [x.as_dict() for x in loader.errors]
+    return ValidationResult(
+        index,
+        errors,
+        text=loader.as_text() if include_text and errors else None,
+        data=loader.as_dict() if include_data else None,
+        timings=loader.timings.as_dict() if loader.timings is not None else None,
+        json=''.join(loader.iter_json(**json_options)) if json_options is not None else None,
+    )
@@ -0,0 +1,21 @@
+from __future__ import unicode_literals
+
+import pytest
+
+from benchmarks import suite
+
+
+@pytest.mark.parametrize('shape', sorted(suite.SHAPES))
+def test_benchmark_shapes_run(shape):
+    results = suite.run_shape(shape, size=300, repeat=1)
+    assert results['nodes'] > 100
+    assert results['errors'] > 0
+    assert results['retained_bytes'] > 0
+
+
+def test_benchmark_compare():
+    baseline = {'wide': {'load_seconds': 1.0, 'retained_bytes': 100}}
+    results = {'wide': dict((metric, 1.0) for metric in suite.COMPARED)}
+    results['wide']['retained_bytes'] = 200
+
+    assert suite.compare(results, baseline, threshold=1.25) == [('wide', 'retained_bytes', 2.0)]
@@ -0,0 +1,318 @@
+from __future__ import unicode_literals
+
+import datetime
+import os
+
+import yaml
+
+from configyaml import cache as cache_module
+from configyaml import loader as loader_module
+from configyaml.cache import LoadCache, ParseCache, fingerprint
+from configyaml.parser import parse
+from configyaml.config import DictNode
+from configyaml.config import ListNode
+from configyaml.config import RegexNode
+from configyaml.config import StringNode
+from configyaml.config.regex import RegexCache
+from configyaml.loader import ConfigLoader
+
+
+class Name(StringNode):
+    def _context_to_inject(self):
+        return {'name': self}
+
+
+class Root(DictNode):
+    _dict_fields = {
+        'name': {
+            'class': Name,
+        },
+    }
+
+
+class CachedLoader(ConfigLoader):
+    config_root_class = Root
+    load_cache = LoadCache(maxsize=2)
+
+
+def count_parses(monkeypatch, module=loader_module):
+    calls = []
+    yaml_parse = module.parse
+
+    def counting_parse(*args, **kwargs):
+        calls.append(args)
+        return yaml_parse(*args, **kwargs)
+
+    monkeypatch.setattr(module, 'parse', counting_parse)
+    return calls
+
+
+def marks(node):
+    found = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        found.append((
+            node.tag,
+            (node.start_mark.index, node.start_mark.line, node.start_mark.column),
+            (node.end_mark.index, node.end_mark.line, node.end_mark.column),
+        ))
+        if isinstance(node, yaml.MappingNode):
+            for k, v in node.value:
+                stack.extend((v, k))
+        elif isinstance(node, yaml.SequenceNode):
+            stack.extend(reversed(node.value))
+    return found
+
+
+PARSE_TEXT = """\
+base: &base
+  name: foo
+  tags: [a, b]
+child:
+  <<: *base
+  count: 1
+"""
+
+
+def test_repeated_load_hits_cache(monkeypatch):
+    CachedLoader.load_cache = LoadCache(maxsize=2)
+    calls = count_parses(monkeypatch)
+
+    first = CachedLoader('name: foo')
+    second = CachedLoader('name: foo')
+    assert len(calls) == 1
+    assert second.config_root is not first.config_root
+    assert second.as_dict() == first.as_dict()
+    assert second.context['name'] is second.config_root.name
+    assert first.context['name'] is first.config_root.name
+    assert CachedLoader.load_cache.stats()['hits'] == 1
+    assert CachedLoader.load_cache.stats()['misses'] == 1
+
+
+class Tags(ListNode):
+    _list_item_class = StringNode
+
+
+class TaggedRoot(DictNode):
+    _dict_fields = {
+        'name': {
+            'class': Name,
+        },
+        'tags': {
+            'class': Tags,
+        },
+    }
+
+
+class TaggedLoader(ConfigLoader):
+    config_root_class = TaggedRoot
+
+
+def test_cache_hits_are_copies():
+    TaggedLoader.load_cache = LoadCache()
+
+    first = TaggedLoader('name: foo\ntags: [a, b]', context={'user': 'a'})
+    first.config_root.tags._children.append(first.config_root.name)
+    first.config_dict['tags'].append('c')
+
+    second = TaggedLoader('name: foo\ntags: [a, b]', context={'user': 'a'})
+    third = TaggedLoader('name: foo\ntags: [a, b]', context={'user': 'a'})
+    assert TaggedLoader.load_cache.stats()['hits'] == 2
+    assert len(second.config_root.tags) == 2
+    assert second.config_dict == {'name': 'foo', 'tags': ['a', 'b']}
+
+    root = second.config_root
+    # values are still the parts of the config dict they came from
+    assert root._value is second.config_dict
+    assert root.tags._value is second.config_dict['tags']
+    assert root.tags[0]._parent is root.tags
+
+    second.config_dict['tags'].append('c')
+    assert third.config_dict['tags'] == ['a', 'b']
+
+    # each tree reads the context of its own loader
+    assert root._context is second.context
+    assert root.tags[0]._context is second.context
+    assert second.context['name'] is root.name
+    assert third.context['name'] is third.config_root.name
+    second.context['user'] = 'b'
+    assert third.config_root._context['user'] == 'a'
+
+
+def test_cached_errors_are_per_loader():
+    CachedLoader.load_cache = LoadCache()
+
+    first = CachedLoader('name: [1]\nother: 2')
+    second = CachedLoader('name: [1]\nother: 2')
+    assert first.error_count == second.error_count == 2
+    assert second.as_text() == first.as_text()
+
+    second._errors.append(None)
+    assert len(first._errors) == 0
+
+
+def test_cache_keyed_on_context_and_variables():
+    CachedLoader.load_cache = LoadCache()
+
+    CachedLoader('name: foo', context={'user': 'a'})
+    CachedLoader('name: foo', context={'user': 'b'})
+    CachedLoader('name: foo', variables={'x': [1, {'y': 2}]})
+    CachedLoader('name: foo', variables={'x': [1, {'y': 2}]})
+    assert CachedLoader.load_cache.stats()['misses'] == 3
+    assert CachedLoader.load_cache.stats()['hits'] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = LoadCache(maxsize=2, max_bytes=100)
+    cache.put('a', 1, size=10)
+    cache.put('b', 2, size=10)
+    cache.get('a')
+    cache.put('c', 3, size=10)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.stats()['evictions'] == 1
+    assert cache.size == 20
+
+    cache.put('d', 4, size=95)
+    assert len(cache) == 1
+    assert cache.size == 95
+
+
+def test_fingerprint_unhashable_by_identity():
+    class Unhashable(object):
+        __hash__ = None
+
+    obj = Unhashable()
+    assert fingerprint({'a': obj}) == fingerprint({'a': obj})
+    assert fingerprint({'a': obj}) != fingerprint({'a': Unhashable()})
+    assert fingerprint([1, 2]) != fingerprint((1, 2))
+
+
+def test_parse_cache_round_trip(tmpdir, monkeypatch):
+    cache = ParseCache(str(tmpdir))
+    calls = count_parses(monkeypatch, cache_module)
+
+    cache.parse(PARSE_TEXT)
+    data, node = cache.parse(PARSE_TEXT)
+    assert len(calls) == 1
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'errors': 0}
+
+    expected_data, expected_node = parse(PARSE_TEXT)
+    assert data == expected_data
+    assert marks(node) == marks(expected_node)
+
+
+def test_parse_cache_keeps_aliases_shared(tmpdir):
+    cache = ParseCache(str(tmpdir))
+    cache.parse(PARSE_TEXT)
+    _, node = cache.parse(PARSE_TEXT)
+    base = node.value[0][1]
+    assert node.value[0][1].value[1][1] is node.value[1][1].value[1][1] is base.value[1][1]
+
+
+def test_parse_cache_constructs_unmarshallable_values(tmpdir):
+    cache = ParseCache(str(tmpdir))
+    cache.parse('day: 2019-09-02')
+    data, _ = cache.parse('day: 2019-09-02')
+    assert data == {'day': datetime.date(2019, 9, 2)}
+    assert cache.hits == 1
+
+
+def test_parse_cache_corrupt_file(tmpdir, monkeypatch):
+    cache = ParseCache(str(tmpdir))
+    cache.parse(PARSE_TEXT)
+    path = cache.path_for(cache.key_for(PARSE_TEXT))
+
+    with open(path, 'r+b') as f:
+        f.truncate(20)
+
+    calls = count_parses(monkeypatch, cache_module)
+    assert cache.parse(PARSE_TEXT)[0] == parse(PARSE_TEXT)[0]
+    assert len(calls) == 1
+    assert cache.errors == 1
+    assert os.path.exists(path)
+
+    cache.clear()
+    assert os.listdir(str(tmpdir)) == []
+
+
+def test_parse_cache_key_includes_versions(monkeypatch, tmpdir):
+    cache = ParseCache(str(tmpdir))
+    key = cache.key_for(PARSE_TEXT)
+    monkeypatch.setattr(cache_module.yaml, '__version__', '0.0')
+    assert cache.key_for(PARSE_TEXT) != key
+
+
+def test_loader_parse_cache(tmpdir):
+    class ParseCachedLoader(ConfigLoader):
+        config_root_class = Root
+        parse_cache = ParseCache(str(tmpdir.join('cache')))
+
+    text = 'name: [1]\nother: 2'
+    first = ParseCachedLoader(text)
+    second = ParseCachedLoader(text)
+    assert ParseCachedLoader.parse_cache.hits == 1
+    assert second.config_root is not first.config_root
+    assert [e.as_dict() for e in second.errors] == [e.as_dict() for e in first.errors]
+
+
+def test_regex_cache_compiles_once():
+    cache = RegexCache()
+    regex, error = cache.compile('a+b')
+    assert error is None
+    assert regex.match('aab')
+
+    assert cache.compile('a+b')[0] is regex
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'evictions': 0, 'entries': 1}
+
+
+def test_regex_cache_keeps_errors():
+    cache = RegexCache()
+    regex, error = cache.compile('[')
+    assert regex is None
+    assert error in ('unexpected end of regular expression', 'unterminated character set at position 0')
+
+    assert cache.compile('[') == (None, error)
+    assert cache.hits == 1
+
+
+def test_regex_cache_evicts_least_recently_used():
+    cache = RegexCache(maxsize=2)
+    cache.compile('a')
+    cache.compile('b')
+    cache.compile('a')
+    cache.compile('c')
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    cache.compile('a')
+    assert cache.hits == 2
+    cache.compile('b')
+    assert cache.misses == 4
+
+
+def test_regex_nodes_share_the_cache():
+    class Pattern(RegexNode):
+        regex_cache = RegexCache()
+
+    class Patterns(ListNode):
+        _list_item_class = Pattern
+
+    class PatternsLoader(ConfigLoader):
+        config_root_class = Patterns
+
+    loader = PatternsLoader('- a.*\n- "["\n- a.*\n- "["\n')
+    assert [x.title for x in loader.errors] == ['Invalid regex', 'Invalid regex']
+
+    first, _, third, _ = loader.config_root
+    assert first.regex is third.regex
+    assert Pattern.regex_cache.stats()['hits'] == 2
+
+
+def test_regex_node_without_cache():
+    class Pattern(RegexNode):
+        regex_cache = None
+
+    assert Pattern(value='a.*').regex.match('abc')
+    assert [x.title for x in Pattern(value='[')._errors] == ['Invalid regex']
@@ -8,6 +8,8 @@ test_configyaml
 Tests for `configyaml` module.
 """
 
+import json
+
 import pytest
 
 from contextlib import contextmanager
@@ -15,6 +17,10 @@ from click.testing import CliRunner
 
 from configyaml import configyaml
 from configyaml import cli
+from configyaml.config import DictNode
+from configyaml.config import StringNode
+from configyaml.loader import ConfigLoader
+from configyaml.validator import ConfigValidator
 
 
 # @pytest.fixture
@@ -39,3 +45,81 @@ from configyaml import cli
 #     help_result = runner.invoke(cli.main, ['--help'])
 #     assert help_result.exit_code == 0
 #     assert '--help  Show this message and exit.' in help_result.output
+
+
+class Root(DictNode):
+    _dict_fields = {
+        'name': {
+            'class': StringNode,
+            'required': True,
+        },
+    }
+
+
+class Loader(ConfigLoader):
+    config_root_class = Root
+
+
+class Validator(ConfigValidator):
+    configyaml_class = Loader
+    context = {'dummy': True}
+
+
+@pytest.fixture
+def config_files(tmpdir):
+    tmpdir.join('valid.yml').write('name: foo\n')
+    tmpdir.mkdir('nested').join('invalid.yml').write('name: [foo]\n')
+    return tmpdir
+
+
+def test_cli_valid_files(config_files):
+    runner = CliRunner()
+    result = runner.invoke(cli.main, ['tests.test_configyaml.Loader', str(config_files.join('valid.yml'))])
+    assert result.exit_code == 0
+    assert result.output == 'Checked 1 file(s), 0 with errors (0 error(s))\n'
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_cli_invalid_files(config_files, jobs):
+    runner = CliRunner()
+    pattern = str(config_files.join('**', '*.yml'))
+    result = runner.invoke(cli.main, ['tests.test_configyaml:Validator', pattern, '--jobs', jobs])
+    assert result.exit_code == 1
+    assert 'invalid.yml: 1 error(s)\nname: [foo]\n# ' in result.output
+    assert 'valid.yml:' not in result.output.replace('invalid.yml:', '')
+    assert 'Checked 2 file(s), 1 with errors (1 error(s))' in result.output
+
+
+def test_cli_json_output(config_files, tmpdir):
+    runner = CliRunner()
+    cache_dir = str(tmpdir.join('cache'))
+    args = ['tests.test_configyaml.Loader', str(config_files.join('*.yml')), '--output', 'json', '--cache-dir', cache_dir, '--timings']
+
+    for _ in range(2):
+        result = runner.invoke(cli.main, args)
+        assert result.exit_code == 0
+        lines = result.output.splitlines()
+        data = json.loads(lines[0])
+        assert data['config'] == {'name': {'value': 'foo'}}
+        assert data['path'].endswith('.yml')
+        assert 'config_text' not in data
+        assert 's total' in lines[-1]
+        assert any(line.startswith('phase ') for line in lines)
+
+    assert len(tmpdir.join('cache').listdir()) == 1
+
+    result = runner.invoke(cli.main, args[:-3] + ['--include-text'])
+    assert json.loads(result.output.splitlines()[0])['config_text'] == 'name: foo\n'
+
+
+def test_cli_bad_arguments(config_files):
+    runner = CliRunner()
+    result = runner.invoke(cli.main, ['tests.test_configyaml.Missing', str(config_files.join('valid.yml'))])
+    assert result.exit_code == 2
+
+    result = runner.invoke(cli.main, ['tests.test_configyaml.Loader', str(config_files.join('*.json'))])
+    assert result.exit_code == 2
+
+    result = runner.invoke(cli.main, ['tests.test_configyaml.Loader', str(config_files.join('missing.yml'))])
+    assert result.exit_code == 1
+    assert 'could not be read' in result.output
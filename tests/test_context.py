@@ -0,0 +1,153 @@
+from __future__ import unicode_literals
+
+from configyaml.config import DictNode
+from configyaml.config import ListNode
+from configyaml.config import StringNode
+from configyaml.loader import ConfigLoader
+
+
+class CountingStringNode(StringNode):
+    instances = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingStringNode.instances += 1
+        super(CountingStringNode, self).__init__(*args, **kwargs)
+
+
+class DependencyList(ListNode):
+    def __init__(self, *args, **kwargs):
+        self._list_item_class = StringNode
+        super(DependencyList, self).__init__(*args, **kwargs)
+
+
+class NotificationNode(StringNode):
+    """Must name one of the dependencies injected by the root"""
+    def _validate_value(self):
+        names = [x._value for x in self._context.get('dependencies', [])]
+        if self._value not in names:
+            self._add_error(title='Unknown dependency', description='Must be a listed dependency')
+
+
+class NotificationList(ListNode):
+    def __init__(self, *args, **kwargs):
+        self._list_item_class = NotificationNode
+        super(NotificationList, self).__init__(*args, **kwargs)
+
+
+class Root(DictNode):
+    def __init__(self, *args, **kwargs):
+        self._dict_fields = {
+            'notifications': {
+                'class': NotificationList,
+            },
+            'dependencies': {
+                'class': DependencyList,
+            },
+            'name': {
+                'class': CountingStringNode,
+            },
+        }
+        super(Root, self).__init__(*args, **kwargs)
+
+    def _context_to_inject(self):
+        return {'dependencies': self.dependencies}
+
+
+class RootLoader(ConfigLoader):
+    config_root_class = Root
+
+
+def test_injected_context_reaches_readers():
+    text = """\
+notifications:
+- a
+- c
+dependencies:
+- a
+- b
+name: test"""
+    loader = RootLoader(text, context={})
+    assert len(loader.errors) == 1
+    assert loader.errors[0].title == 'Unknown dependency'
+    assert loader.errors[0].line == 2
+
+    assert loader.context['dependencies'] is loader.config_root.dependencies
+    assert loader.config_root.notifications._parent is loader.config_root
+
+
+def test_injected_context_skips_nodes_that_dont_read_it():
+    CountingStringNode.instances = 0
+    RootLoader('name: test\ndependencies: [a]', context={})
+    assert CountingStringNode.instances == 1
+
+
+class Nested(DictNode):
+    def __init__(self, *args, **kwargs):
+        self._dict_fields = {
+            'name': {
+                'class': CountingStringNode,
+            },
+            'child': {
+                'class': Nested,
+            },
+        }
+        super(Nested, self).__init__(*args, **kwargs)
+
+    def _context_to_inject(self):
+        return {'depth': self._key_name()}
+
+
+def test_nested_context_injection_is_not_exponential():
+    value = {'name': 'bottom'}
+    for _ in range(12):
+        value = {'name': 'level', 'child': value}
+
+    CountingStringNode.instances = 0
+    node = Nested(value=value, context={})
+    assert CountingStringNode.instances == 13
+    assert not node._get_all_errors()
+
+
+class EnvNode(StringNode):
+    pass
+
+
+class EnvReader(StringNode):
+    def _validate_value(self):
+        if self._value != self._context.get('env'):
+            self._add_error(title='Wrong env', description='context env is {!r}'.format(self._context.get('env')))
+
+
+class EnvChild(DictNode):
+    _dict_fields = {
+        'env': {'class': EnvNode},
+    }
+
+    def _context_to_inject(self):
+        return {'env': self.env._value}
+
+
+class EnvRoot(DictNode):
+    _dict_fields = {
+        'env': {'class': EnvNode},
+        'child': {'class': EnvChild},
+        'check': {'class': EnvReader},
+    }
+
+    def _context_to_inject(self):
+        return {'env': self.env._value}
+
+
+class EnvLoader(ConfigLoader):
+    config_root_class = EnvRoot
+
+
+def test_nested_injection_of_the_same_key():
+    # the child injects its env after the root does, like when the root
+    # built its subtree again with its own context injected
+    loader = EnvLoader('env: prod\nchild: {env: dev}\ncheck: prod\n', context={})
+    assert [x.description for x in loader.errors] == ["context env is 'dev'"]
+    assert loader.context['env'] == 'dev'
+
+    loader = EnvLoader('env: prod\ncheck: prod\nchild: {env: dev}\n', context={})
+    assert not loader.errors
@@ -1,7 +1,10 @@
 from __future__ import unicode_literals
 
+import json
+
 from configyaml.config import DictNode
 from configyaml.config import AbstractNode
+from configyaml.loader import ConfigLoader
 
 
 class DummyFoo(AbstractNode):
@@ -141,3 +144,55 @@ def test_required_as_dict():
     assert not config.is_valid()
     assert config._errors[0].title == 'Required field is missing'
     assert config._as_dict() == {'foo': None, 'errors': [{'title': 'Required field is missing', 'description': 'foo is a required field', 'start_line': None, 'start_column': None, 'end_line': None, 'end_column': None}]}
+
+
+class DummyConfigExtraChild(DummyConfig):
+    def _validate_value(self):
+        super(DummyConfigExtraChild, self)._validate_value()
+        # a child for a key that isn't a field
+        self._children['extra'] = DummyFoo(value='x', parent=self)
+
+
+class DummyExtraChildLoader(ConfigLoader):
+    config_root_class = DummyConfigExtraChild
+
+
+def test_as_dict_only_has_fields():
+    loader = DummyExtraChildLoader('foo: bar\n')
+    assert loader.config_root['extra']._value == 'x'
+    assert loader.as_dict()['config'] == {'foo': {'value': 'bar'}}
+    assert json.loads(''.join(loader.iter_json())) == loader.as_dict()
+
+
+class DummyLoader(ConfigLoader):
+    config_root_class = DummyConfig
+
+
+def test_duplicate_key_uses_loaded_value_node():
+    loader = DummyLoader('foo: bar\nfoo: 2')
+    assert loader['foo'] == 2
+    assert len(loader.errors) == 1
+    assert loader.errors[0].description == 'foo must be a str'
+    assert loader.errors[0].line == 1
+
+
+def test_non_string_key_node():
+    loader = DummyLoader('foo: bar\n1: baz')
+    assert len(loader.errors) == 1
+    assert loader.errors[0].title == 'Invalid key'
+    assert (loader.errors[0].line, loader.errors[0].column) == (1, 0)
+
+
+def test_key_node_index_built_once():
+    loader = DummyLoader('foo: bar')
+    index = loader.config_root._key_node_index()
+    assert loader.config_root._key_node_index() is index
+    assert index['foo'][0].value == 'foo'
+    assert index['foo'][1].value == 'bar'
+
+
+def test_variable_dict_has_no_key_nodes():
+    loader = DummyLoader('$var', variables={'var': {'foo': 'bar', 'nope': 1}})
+    assert len(loader.errors) == 1
+    assert loader.errors[0].title == 'Invalid key'
+    assert loader.errors[0].line == 0
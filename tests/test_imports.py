@@ -1,4 +1,11 @@
 # everything here should import correctly
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks import importtime
+
 
 from configyaml.loader import ConfigLoader
 from configyaml.validator import ConfigValidator
@@ -13,3 +20,49 @@ from configyaml.config import BoolNode
 from configyaml.config import StringNode
 from configyaml.config import WildcardDictNode
 from configyaml.config import RegexNode
+
+
+@pytest.mark.parametrize('module', [
+    'configyaml.loader',
+    'configyaml.cache',
+    'configyaml.parser',
+    'configyaml.timings',
+    'configyaml.validator',
+    'configyaml.cli',
+    'configyaml.config',
+])
+def test_imports_first(module):
+    # in a new process, so modules imported by other tests don't hide import cycles
+    subprocess.check_call([sys.executable, '-c', 'import {}'.format(module)])
+
+
+def imported_by(module):  # type: (str) -> set
+    """The modules in sys.modules after importing module in a new interpreter"""
+    output = subprocess.check_output([
+        sys.executable, '-c', 'import sys, {}; print("\\n".join(sys.modules))'.format(module),
+    ])
+    return set(output.decode('utf-8').split())
+
+
+def test_import_skips_slow_modules():
+    # __version__ is read from the package metadata when it's first used
+    modules = imported_by('configyaml')
+    assert 'pkg_resources' not in modules
+    assert 'click' not in modules
+    assert 'yaml' not in modules
+
+    modules = imported_by('configyaml.validator')
+    assert 'pkg_resources' not in modules
+    assert 'click' not in modules
+    assert 'multiprocessing' not in modules
+
+
+def test_import_time():
+    # only reported (pytest -s), since the time depends on the machine
+    times = importtime.measure('configyaml.validator', runs=1)
+    print('importing configyaml.validator took {:.1f}ms'.format(times['configyaml.validator'] * 1000))
+
+
+def test_version():
+    import configyaml
+    assert configyaml.__version__ == configyaml._get_version()
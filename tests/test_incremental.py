@@ -0,0 +1,157 @@
+from __future__ import unicode_literals
+
+from configyaml.config import DictNode
+from configyaml.config import IntegerNode
+from configyaml.config import ListNode
+from configyaml.config import StringNode
+from configyaml.config import WildcardDictNode
+from configyaml.loader import ConfigLoader
+
+
+class Labels(WildcardDictNode):
+    _dict_fields = {
+        '*': {
+            'class': StringNode,
+        },
+    }
+
+
+class Item(DictNode):
+    _dict_fields = {
+        'name': {
+            'class': StringNode,
+            'required': True,
+        },
+        'count': {
+            'class': IntegerNode,
+        },
+        'labels': {
+            'class': Labels,
+        },
+    }
+
+
+class Items(ListNode):
+    _list_item_class = Item
+
+
+class Owner(StringNode):
+    def _validate_value(self):
+        if self._value not in self._context.get('owners', ()):
+            self._add_error(title='Unknown owner', description='Must be one of the owners')
+
+
+class Root(DictNode):
+    _dict_fields = {
+        'items': {
+            'class': Items,
+        },
+        'owner': {
+            'class': Owner,
+        },
+    }
+
+
+class Loader(ConfigLoader):
+    config_root_class = Root
+
+
+TEXT = """\
+items:
+- name: first
+  count: 1
+- name: second
+  count: two
+  labels:
+    a: [1]
+- name: third
+  labels: {b: x}
+"""
+
+
+def assert_same_as_fresh(loader, **kwargs):
+    fresh = Loader(loader.config_text, **kwargs)
+    assert [e.as_dict() for e in loader.errors] == [e.as_dict() for e in fresh.errors]
+    assert loader.as_dict() == fresh.as_dict()
+    assert loader.as_text() == fresh.as_text()
+
+
+def test_update_reuses_unchanged_subtrees():
+    loader = Loader(TEXT)
+    second = loader.config_root['items'][1]
+    third = loader.config_root['items'][2]
+
+    errors = loader.update(TEXT.replace('count: 1', 'count: 10'))
+    assert errors == loader.errors
+    assert loader.config_root['items'][1] is second
+    assert loader.config_root['items'][2] is third
+    assert second._parent is loader.config_root['items']
+    assert_same_as_fresh(loader)
+
+
+def test_update_moves_errors_of_reused_subtrees():
+    loader = Loader(TEXT)
+    second = loader.config_root['items'][1]
+
+    loader.update(TEXT.replace('  count: 1\n', '  count: 1\n  labels:\n    c: y\n'))
+    assert loader.config_root['items'][1] is second
+    assert [e.line for e in loader.errors] == [6, 8]
+    assert_same_as_fresh(loader)
+
+
+def test_update_rebuilds_changed_and_moved_nodes():
+    loader = Loader(TEXT)
+    second = loader.config_root['items'][1]
+
+    # re-indented, so the region moves columns
+    loader.update(TEXT.replace('- name: second\n  count: two\n  labels:\n    a: [1]\n', '-   name: second\n    count: two\n'))
+    assert loader.config_root['items'][1] is not second
+    assert_same_as_fresh(loader)
+
+    loader.update('items: []\n')
+    assert len(loader.config_root['items']) == 0
+    assert_same_as_fresh(loader)
+
+
+def test_update_rebuilds_context_readers():
+    context = {'owners': ['me']}
+    loader = Loader(TEXT + 'owner: me\n', context=context)
+    owner = loader.config_root.owner
+    assert owner.is_valid()
+
+    loader.update(TEXT + '\nowner: me\n')
+    assert loader.config_root.owner is not owner
+    assert_same_as_fresh(loader, context={'owners': ['me']})
+
+
+def test_apply_edit():
+    loader = Loader(TEXT)
+    start = TEXT.index('two')
+    errors = loader.apply_edit(start, start + len('two'), '2')
+    assert [e.title for e in errors] == ['a has an invalid type']
+    assert_same_as_fresh(loader)
+
+
+def test_update_sequence_of_edits():
+    loader = Loader(TEXT)
+    text = TEXT
+    for old, new in [
+        ('first', 'firsts'),
+        ('items:\n', '\n\nitems:\n'),
+        ('b: x', 'b: x, c: [2]'),
+        ('- name: first\n  count: 1\n', ''),
+        ('third', '3'),
+    ]:
+        text = text.replace(old, new)
+        loader.update(text)
+        assert_same_as_fresh(loader)
+
+
+def test_update_invalid_yaml():
+    loader = Loader(TEXT)
+    loader.update('items: [')
+    assert loader.config_root is None
+    assert [e.title for e in loader.errors] == ['Basic YAML parsing error']
+
+    loader.update(TEXT)
+    assert_same_as_fresh(loader)
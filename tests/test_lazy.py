@@ -0,0 +1,248 @@
+from __future__ import unicode_literals
+
+from configyaml.config import DictNode
+from configyaml.config import IntegerNode
+from configyaml.config import ListNode
+from configyaml.config import StringNode
+from configyaml.config import WildcardDictNode
+from configyaml.loader import ConfigLoader
+from configyaml.timings import LoadTimings
+
+
+class Labels(WildcardDictNode):
+    _dict_fields = {
+        '*': {
+            'class': StringNode,
+        },
+    }
+
+    def _key_name_is_valid(self, key):
+        if key.startswith('_'):
+            return False, 'Cannot start with _'
+        return True, None
+
+
+class Item(DictNode):
+    _dict_fields = {
+        'name': {
+            'class': StringNode,
+            'required': True,
+        },
+        'count': {
+            'class': IntegerNode,
+            'default': 1,
+        },
+        'labels': {
+            'class': Labels,
+        },
+    }
+
+
+class Items(ListNode):
+    _list_item_class = Item
+    _min_items_required = 1
+
+
+class Owners(ListNode):
+    _list_item_class = StringNode
+
+
+class Owner(StringNode):
+    def _validate_value(self):
+        if self._value not in self._context.get('owners', ()):
+            self._add_error(title='Unknown owner', description='Must be one of the owners')
+
+
+class Root(DictNode):
+    _dict_fields = {
+        'owners': {
+            'class': Owners,
+            'default': [],
+        },
+        'items': {
+            'class': Items,
+        },
+        'owner': {
+            'class': Owner,
+        },
+    }
+
+    def _context_to_inject(self):
+        return {'owners': set(x._value for x in self.owners)}
+
+
+class Loader(ConfigLoader):
+    config_root_class = Root
+    timings_class = LoadTimings
+
+
+class LazyLoader(Loader):
+    lazy = True
+
+
+TEXT = """\
+owners: [ann, bob]
+items:
+- name: one
+  count: many
+- name: two
+  labels:
+    a: b
+    _c: d
+- count: 3
+owner: carl
+typo: true
+"""
+
+
+# nodes built after the load are only counted while the timings are active
+def instances(loader, node_class):
+    return loader.timings.node_classes.get(node_class, {}).get('instances', 0)
+
+
+def test_lazy_builds_children_when_used():
+    loader = LazyLoader(TEXT)
+
+    # the root built its children to read the owners it injects, but no deeper
+    assert instances(loader, Items) == 1
+    assert instances(loader, Item) == 0
+
+    with loader.timings:
+        items = loader.config_root['items']
+        assert instances(loader, Item) == 0
+
+        item = items[1]
+        assert instances(loader, Item) == 3
+        assert instances(loader, Labels) == 0
+
+        assert item.name._value == 'two'
+        assert instances(loader, Labels) == 1
+
+        assert dict(item.labels._children)['a']._value == 'b'
+
+
+def test_lazy_own_errors_without_building_children():
+    class ItemsLoader(LazyLoader):
+        config_root_class = Items
+
+    loader = ItemsLoader('- name: one\n  typo: 1\n- count: 3\n')
+    assert not loader.config_root._errors
+    assert instances(loader, Item) == 0
+
+    item = loader.config_root[0]
+    assert [x.title for x in item._errors] == ['Invalid key']
+    assert [x.title for x in loader.config_root[1]._errors] == ['Required field is missing']
+    assert not item._built_child_nodes()
+
+
+def test_lazy_errors_match_eager():
+    lazy = LazyLoader(TEXT)
+    eager = Loader(TEXT)
+
+    with lazy.timings:
+        assert lazy.error_count == eager.error_count == 5
+    assert instances(lazy, Labels) == 1
+    assert [x.as_dict() for x in lazy.errors] == [x.as_dict() for x in eager.errors]
+
+
+def test_lazy_output_matches_eager():
+    assert LazyLoader(TEXT).as_dict() == Loader(TEXT).as_dict()
+    assert LazyLoader(TEXT).as_text() == Loader(TEXT).as_text()
+
+
+def test_lazy_has_errors():
+    assert LazyLoader(TEXT).has_errors()
+    assert not LazyLoader('items:\n- name: one\n').has_errors()
+
+
+def test_lazy_context_reader():
+    loader = LazyLoader('owners: [ann]\nowner: ann\n')
+    assert loader.config_root.owner._value == 'ann'
+    assert not loader.errors
+
+
+def test_lazy_own_errors_of_containers():
+    loader = LazyLoader('items: []\n')
+    assert [x.title for x in loader.errors] == ['Minimum items requirement not met']
+
+
+def test_lazy_update():
+    loader = LazyLoader(TEXT)
+    loader.config_root['items'][0]
+
+    loader.update(TEXT.replace('count: many', 'count: 2'))
+    assert loader.error_count == 4
+    assert loader.config_root['items'][0].count._value == 2
+
+
+def test_lazy_release_yaml_nodes():
+    class ReleasingLoader(LazyLoader):
+        release_yaml_nodes = True
+
+    loader = ReleasingLoader(TEXT)
+    assert [x.as_dict() for x in loader.errors] == [x.as_dict() for x in Loader(TEXT).errors]
+
+
+class Name(StringNode):
+    def _context_to_inject(self):
+        return {'names': [self._value]}
+
+
+class Reader(StringNode):
+    def _validate_value(self):
+        if self._value not in self._context.get('names', ()):
+            self._add_error(title='Unknown name', description='Must be the name')
+
+
+class Readers(ListNode):
+    _list_item_class = Reader
+
+
+class ReadersRoot(DictNode):
+    # in an eager load, the readers are built before the name is injected
+    _dict_fields = {
+        'uses': {
+            'class': Readers,
+        },
+        'name': {
+            'class': Name,
+        },
+        'other': {
+            'class': Readers,
+        },
+    }
+
+
+class ReadersLoader(ConfigLoader):
+    config_root_class = ReadersRoot
+
+
+class LazyReadersLoader(ReadersLoader):
+    lazy = True
+
+
+def test_lazy_builds_the_rest_in_place():
+    text = 'uses: [a]\nname: a\nother: [b]\n'
+    assert [x.line for x in ReadersLoader(text).errors] == [0, 2]
+
+    loader = LazyReadersLoader(text, context={'user': 'x'})
+    root = loader.config_root
+    uses = root.uses
+    assert not uses._built_child_nodes()
+
+    # the first readers are built after the name was injected, unlike in an eager load
+    assert [x.line for x in loader.errors] == [2]
+    assert loader.config_root is root
+    assert root.uses is uses
+    assert loader.context == {'user': 'x', 'names': ['a']}
+    assert not root._lazy and not uses[0]._lazy
+
+
+def test_lazy_builds_the_rest_in_config_order():
+    loader = LazyReadersLoader('uses: [a]\nname: a\nother: [b]\n')
+    reader = loader.config_root.other[0]
+    assert [x.title for x in reader._errors] == ['Unknown name']
+
+    loader.as_dict()
+    assert loader.config_root.other[0] is reader
+    assert [x.title for x in loader.errors] == ['Unknown name']
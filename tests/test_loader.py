@@ -1,11 +1,15 @@
 from __future__ import unicode_literals
 
+import io
+
 import pytest
 
 from configyaml.config import ListNode
 from configyaml.loader import ConfigLoader
 from configyaml.config import DictNode
 from configyaml.config import AbstractNode
+from configyaml.errors import ConfigError
+from configyaml.parser import HAS_LIBYAML
 
 
 class DummyFoo(AbstractNode):
@@ -96,3 +100,228 @@ def test_asserts_on_invalid_subclass():
     value = ['a', 'b']
     with pytest.raises(AttributeError):
         InvalidLoader(value)
+
+
+def test_errors_cached():
+    loader = DummyComplexLoader("{ 'foo': [], 'bar': 1}")
+    assert loader.errors is loader.errors
+    assert loader.error_count == 2
+    assert loader.has_errors()
+    assert not loader.is_valid()
+
+
+def test_errors_count_without_collecting():
+    loader = DummyComplexLoader("{ 'foo': [], 'bar': 1}")
+    assert loader._all_errors is None
+    assert loader.error_count == 2
+    assert loader.has_errors()
+    assert loader._all_errors is None
+
+
+def test_errors_rebuilt_after_node_adds_error():
+    loader = DummyLoader("{ 'foo': 'bar'}")
+    assert loader.errors == []
+
+    loader.config_root.foo._add_error(title='Not allowed', description='bar is reserved')
+    assert loader.error_count == 1
+    assert [x.title for x in loader.errors] == ['Not allowed']
+    assert not loader.is_valid()
+
+
+def test_invalidate_errors():
+    loader = DummyLoader("{ 'foo': 'bar'}")
+    assert loader.errors == []
+
+    loader._errors.append(ConfigError(title='Extra'))
+    assert loader.is_valid()
+
+    loader.invalidate_errors()
+    assert not loader.is_valid()
+    assert loader.error_count == 1
+
+
+STREAM = """\
+# two configs
+---
+foo: bar
+---
+foo: [1]
+---
+foo: [
+"""
+
+
+def test_iter_documents():
+    documents = list(DummyLoader.iter_documents(STREAM))
+    assert [(x.index, x.line_offset) for x in documents] == [(0, 0), (1, 3), (2, 5)]
+
+    assert documents[0].is_valid()
+    assert documents[0].config_root.foo._value == 'bar'
+
+    # the loader counts lines from the start of its document, the errors from the start of the stream
+    assert documents[1].loader.errors[0].line == 1
+    assert [(x.title, x.line) for x in documents[1].errors] == [('foo has an invalid type', 4)]
+    assert [(x.title, x.line) for x in documents[2].errors] == [('Basic YAML parsing error', 7)]
+
+
+def test_iter_documents_reads_lines_as_needed():
+    read = []
+
+    def lines():
+        for line in STREAM.splitlines(True):
+            read.append(line)
+            yield line
+
+    documents = DummyLoader.iter_documents(lines())
+    first = next(documents)
+    assert first.index == 0
+    # up to the marker of the next document
+    assert len(read) == 4
+
+
+def test_iter_documents_from_file(tmpdir):
+    path = tmpdir.join('bundle.yml')
+    path.write_binary(STREAM.replace('\n', '\r\n').encode('utf-8'))
+
+    with open(str(path), 'rb') as f:
+        documents = list(DummyLoader.iter_documents(f))
+
+    assert [x.line_offset for x in documents] == [0, 3, 5]
+    assert [x.line for x in documents[1].errors] == [4]
+
+
+def test_iter_documents_context_copied():
+    class InjectingConfig(DummyConfig):
+        def _context_to_inject(self):
+            return {'seen': True}
+
+    class InjectingLoader(ConfigLoader):
+        config_root_class = InjectingConfig
+
+    context = {}
+    documents = list(InjectingLoader.iter_documents('foo: a\n---\nfoo: b\n', context=context))
+    assert [x.loader.context for x in documents] == [{'seen': True}, {'seen': True}]
+    assert context == {}
+
+
+def test_iter_documents_directive_after_end_marker():
+    documents = list(DummyLoader.iter_documents('foo: a\n...\n%YAML 1.1\n---\nfoo: b\n'))
+    assert [(x.line_offset, x.errors) for x in documents] == [(0, []), (2, [])]
+    assert documents[1].config_root.foo._value == 'b'
+
+
+SOURCE_TEXT = """\
+foo: [1]
+bar: baz
+# the end, without a line break"""
+
+
+@pytest.mark.parametrize('text', [SOURCE_TEXT, SOURCE_TEXT + '\r\n', 'foo: [1, 2]\nbar: é'])
+@pytest.mark.parametrize('backend', ['c', 'python'])
+def test_from_path(tmpdir, text, backend):
+    class BackendLoader(DummyLoader):
+        yaml_backend = backend
+
+    if backend == 'c' and not HAS_LIBYAML:
+        pytest.skip('PyYAML is built without libyaml')
+
+    path = tmpdir.join('config.yml')
+    path.write_binary(text.encode('utf-8'))
+
+    loader = BackendLoader.from_path(str(path))
+    expected = BackendLoader(text)
+
+    # nothing keeps the text
+    assert loader._config_text is None
+    assert loader.config_text == text
+    assert [x.as_dict() for x in loader.errors] == [x.as_dict() for x in expected.errors]
+    assert loader.config_root.foo._value_node.end_mark.column == expected.config_root.foo._value_node.end_mark.column
+    assert loader.as_text() == expected.as_text()
+
+
+def test_from_path_copies_the_file(tmpdir):
+    path = tmpdir.join('config.yml')
+    path.write('foo: [1]\n')
+    loader = DummyLoader.from_path(str(path))
+
+    # edited in place, then truncated
+    with open(str(path), 'r+b') as f:
+        f.write(b'bar')
+        f.truncate(2)
+
+    assert loader.config_text == 'foo: [1]\n'
+    assert loader.as_text() == DummyLoader('foo: [1]\n').as_text()
+
+
+def test_from_path_line_breaks(tmpdir):
+    text = 'bar: 1\rfoo: [1]\r\nbaz: 2\n'
+    path = tmpdir.join('config.yml')
+    path.write_binary(text.encode('utf-8'))
+
+    loader = DummyLoader.from_path(str(path))
+    assert list(loader.source.iter_lines()) == ['bar: 1\r', 'foo: [1]\r\n', 'baz: 2\n']
+    assert loader.as_text() == DummyLoader(text).as_text()
+
+
+@pytest.mark.parametrize('line_break', ['\u2028', '\u2029', '\x85'])
+def test_from_path_unicode_line_breaks(tmpdir, line_break):
+    # line breaks to the yaml reader, so the errors are on the lines after them
+    text = 'bar: 1{}foo: [1]\nbaz: 2{}'.format(line_break, line_break)
+    path = tmpdir.join('config.yml')
+    path.write_binary(text.encode('utf-8'))
+
+    loader = DummyLoader.from_path(str(path))
+    expected = DummyLoader(text)
+    assert [x.line for x in loader.errors] == [x.line for x in expected.errors]
+    assert sorted(x.line for x in loader.errors) == [0, 1, 2]
+    assert loader.source.ends_with_line_break()
+    assert loader.as_text() == expected.as_text()
+
+
+def test_from_path_empty(tmpdir):
+    path = tmpdir.join('config.yml')
+    path.write('\n  \n')
+    assert [x.title for x in DummyLoader.from_path(str(path)).errors] == ['YAML is empty']
+
+    path.write('')
+    assert [x.title for x in DummyLoader.from_path(str(path)).errors] == ['YAML is empty']
+
+
+def test_from_path_invalid_yaml(tmpdir):
+    path = tmpdir.join('config.yml')
+    path.write('foo: [\n')
+    loader = DummyLoader.from_path(str(path))
+    assert [(x.title, x.line) for x in loader.errors] == [('Basic YAML parsing error', 1)]
+
+
+def test_from_path_update(tmpdir):
+    path = tmpdir.join('config.yml')
+    path.write('foo: [1]\n')
+    loader = DummyLoader.from_path(str(path))
+    assert not loader.is_valid()
+
+    loader.update('foo: bar\n')
+    assert loader.source is None
+    assert loader.is_valid()
+
+
+def test_from_stream(tmpdir):
+    path = tmpdir.join('config.yml')
+    path.write(SOURCE_TEXT)
+
+    with open(str(path)) as f:
+        kept = DummyLoader.from_stream(f)
+    assert kept.source is not None
+    assert kept.as_text() == DummyLoader(SOURCE_TEXT).as_text()
+
+    with open(str(path), 'rb') as f:
+        f.read(3)
+        read = DummyLoader.from_stream(f)
+    assert read.source is None
+    assert read.config_text == SOURCE_TEXT[3:]
+
+    for stream in (io.StringIO(SOURCE_TEXT), io.BytesIO(SOURCE_TEXT.encode('utf-8'))):
+        loader = DummyLoader.from_stream(stream)
+        assert loader.source is None
+        assert loader.config_text == SOURCE_TEXT
+        assert len(loader.errors) == 2
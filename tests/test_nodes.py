@@ -1,4 +1,6 @@
-from configyaml.config import PositiveIntegerNode, StringNode, WildcardDictNode, BoolNode, RegexNode
+import pytest
+
+from configyaml.config import PositiveIntegerNode, StringNode, WildcardDictNode, BoolNode, RegexNode, ListNode
 from configyaml.loader import ConfigLoader
 
 
@@ -87,3 +89,71 @@ def test_regex_invalid():
     assert node._errors[0].title == 'Invalid regex'
     assert node._errors[0].description in ('unexpected end of regular expression', 'unterminated character set at position 0')
     assert node.regex == None
+
+
+class DummyStringsNode(WildcardDictNode):
+    def __init__(self, *args, **kwargs):
+        self._dict_fields = {
+            '*': {
+                'class': StringNode,
+            },
+        }
+        super(DummyStringsNode, self).__init__(*args, **kwargs)
+
+
+def test_wildcard_dict_non_string_key():
+    c = DummyStringsNode(value={1: 'one', '_two': 'two'})
+    assert not c.is_valid()
+    assert len(c._errors) == 1
+    assert c[1]._value == 'one'
+
+
+def test_errors_allocated_on_first_error():
+    valid = StringNode(value='a')
+    other = StringNode(value='b')
+    assert valid._errors == ()
+    assert valid._errors is other._errors
+
+    invalid = StringNode(value=1)
+    assert isinstance(invalid._errors, list)
+    assert len(invalid._errors) == 1
+
+
+class DummyStringListNode(ListNode):
+    _list_item_class = StringNode
+
+
+def test_errors_added_with_add_error_only():
+    class Appending(StringNode):
+        def _validate_value(self):
+            self._errors.append('error')
+
+    # _errors is the shared empty tuple until the first _add_error
+    with pytest.raises(AttributeError):
+        Appending(value='a')
+
+    class Adding(StringNode):
+        def _validate_value(self):
+            self._add_error(title='Error')
+
+    assert [x.title for x in Adding(value='a')._errors] == ['Error']
+
+
+def test_containers_start_with_their_own_children():
+    empty = DummyStringsNode(value={})
+    other = DummyStringsNode(value={})
+    assert len(empty) == 0
+    assert empty._children == {}
+    assert empty._children is not other._children
+
+    # so subclasses can add children like they could before
+    empty._children['a'] = StringNode(value='b')
+    assert len(empty) == 1
+    assert len(other) == 0
+
+    items = DummyStringListNode(value=[])
+    items._children.append(StringNode(value='b'))
+    assert len(items) == 1
+
+    # leaves have no children
+    assert StringNode(value='a')._children is None
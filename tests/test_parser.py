@@ -0,0 +1,158 @@
+from __future__ import unicode_literals
+
+import pytest
+import yaml
+
+from configyaml.config import DictNode
+from configyaml.config import WildcardDictNode
+from configyaml.config import IntegerNode
+from configyaml.loader import ConfigLoader
+from configyaml.parser import HAS_LIBYAML, parse, resolve_backend, split_documents
+
+
+class DummyIntegers(WildcardDictNode):
+    def __init__(self, *args, **kwargs):
+        self._dict_fields = {
+            '*': {
+                'class': IntegerNode,
+            },
+        }
+        super(DummyIntegers, self).__init__(*args, **kwargs)
+
+
+class DummyConfig(DictNode):
+    def __init__(self, *args, **kwargs):
+        self._dict_fields = {
+            'base': {
+                'class': DummyIntegers,
+            },
+            'child': {
+                'class': DummyIntegers,
+            },
+        }
+        super(DummyConfig, self).__init__(*args, **kwargs)
+
+
+class DummyLoader(ConfigLoader):
+    config_root_class = DummyConfig
+
+
+def test_parse_returns_data_and_nodes():
+    data, node = parse('foo: [1, 2]\nbar: baz')
+    assert data == {'foo': [1, 2], 'bar': 'baz'}
+    assert isinstance(node, yaml.MappingNode)
+    assert node.value[1][1].start_mark.line == 1
+
+
+def test_parse_empty():
+    assert parse('# just a comment') == (None, None)
+
+
+def test_loader_parses_once(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('text should only be parsed by configyaml.parser.parse')
+
+    monkeypatch.setattr(yaml, 'safe_load', fail)
+    monkeypatch.setattr(yaml, 'compose', fail)
+
+    loader = DummyLoader('base: {x: 1}')
+    assert loader.is_valid()
+    assert loader['base'] == {'x': 1}
+
+
+def test_merge_key_errors_point_at_source():
+    text = """\
+base: &base
+  x: one
+child:
+  <<: *base
+  y: 2"""
+    loader = DummyLoader(text)
+    assert not loader.is_valid()
+    assert loader['child'] == {'x': 'one', 'y': 2}
+    assert [(e.title, e.line) for e in loader.errors] == [
+        ('x has an invalid type', 1),
+        ('x has an invalid type', 1),
+    ]
+
+
+class DummyPythonLoader(DummyLoader):
+    yaml_backend = 'python'
+
+
+class DummyCLoader(DummyLoader):
+    yaml_backend = 'c'
+
+
+requires_libyaml = pytest.mark.skipif(not HAS_LIBYAML, reason='PyYAML was built without libyaml')
+
+
+def test_resolve_backend():
+    assert resolve_backend('python') == 'python'
+    assert resolve_backend() == ('c' if HAS_LIBYAML else 'python')
+
+    with pytest.raises(ValueError):
+        resolve_backend('rust')
+
+
+@pytest.mark.skipif(HAS_LIBYAML, reason='PyYAML was built with libyaml')
+def test_c_backend_unavailable():
+    with pytest.raises(ValueError):
+        resolve_backend('c')
+
+
+@requires_libyaml
+@pytest.mark.parametrize('text', [
+    'base: {x: 1}\nchild: {y: 2}\n',
+    'base:\n  x: 1\nchild:\n  y: nope',
+    'base:\n  x: 1\nchild:\n  y: nope\n# trailing comment',
+    'base:\n  x: 1\nchild:\n  y: nope\n\n  ',
+    'base: [1, 2]\nother: 1',
+    'child: {}\nbase:\n  - 1\n  - 2',
+    'base: {x: 1\nchild: 2',
+    'base: child: 2',
+    'base:\n  x: 1\n - 2',
+    'base: !2',
+    'base: {x: 1}\nchild: *missing',
+    '\t base: 1',
+])
+def test_backends_report_identical_errors(text):
+    python_loader = DummyPythonLoader(text)
+    c_loader = DummyCLoader(text)
+
+    assert c_loader.config_dict == python_loader.config_dict
+    assert [e.as_dict() for e in c_loader.errors] == [e.as_dict() for e in python_loader.errors]
+    assert c_loader.as_text() == python_loader.as_text()
+
+
+def test_split_documents():
+    text = '# bundle\n%YAML 1.1\n---\na: 1\n---\na: 2\n...\n# after\n--- {a: 3}\n'
+    documents = list(split_documents(text.splitlines(True)))
+    assert documents == [
+        (0, '# bundle\n%YAML 1.1\n---\na: 1\n'),
+        (4, '---\na: 2\n...\n'),
+        (7, '# after\n--- {a: 3}\n'),
+    ]
+
+
+def test_split_documents_directives_start_a_document():
+    lines = ['a: 1\n', '# a\n', '%YAML 1.1\n', '---\n', 'b: 2\n', '...\n', '%TAG ! tag:x,2000:\n', '---\n', 'c: 3\n']
+    assert list(split_documents(lines)) == [
+        (0, 'a: 1\n# a\n'),
+        (2, '%YAML 1.1\n---\nb: 2\n...\n'),
+        (6, '%TAG ! tag:x,2000:\n---\nc: 3\n'),
+    ]
+
+
+def test_split_documents_without_markers():
+    assert list(split_documents(['a: 1\n', 'b: 2'])) == [(0, 'a: 1\nb: 2')]
+    assert list(split_documents(['# nothing\n', '\n'])) == []
+
+
+def test_split_documents_markers_need_a_break():
+    lines = ['a: |\n', '  ---not a marker\n', '----\n', '---\n', 'b\n']
+    assert list(split_documents(lines)) == [(0, 'a: |\n  ---not a marker\n----\n'), (3, '---\nb\n')]
+
+
+def test_split_documents_bytes():
+    assert list(split_documents([b'a: 1\n', b'---\n', b'b: \xc3\xa9\n'])) == [(0, 'a: 1\n'), (1, '---\nb: \xe9\n')]
@@ -0,0 +1,103 @@
+from __future__ import unicode_literals
+
+import gc
+import weakref
+
+import yaml
+
+from configyaml import loader as loader_module
+from configyaml.config import DictNode
+from configyaml.config import IntegerNode
+from configyaml.config import ListNode
+from configyaml.loader import ConfigLoader
+from configyaml.positions import Position, PositionTable
+
+
+class Numbers(ListNode):
+    _list_item_class = IntegerNode
+
+
+class Root(DictNode):
+    _dict_fields = {
+        'numbers': {
+            'class': Numbers,
+            'required': True,
+        },
+        'count': {
+            'class': IntegerNode,
+        },
+    }
+
+
+class Loader(ConfigLoader):
+    config_root_class = Root
+
+
+class ReleasingLoader(Loader):
+    release_yaml_nodes = True
+
+
+TEXT = """\
+numbers:
+- 1
+- two
+- 3
+count: 4
+other: 5"""
+
+
+def test_position_table():
+    node = yaml.compose('a: [1, 2]')
+    table = PositionTable()
+    position = table.add(node.value[0][1])
+    assert len(table) == 1
+    assert tuple(position.start_mark) == (0, 3)
+    assert (position.end_mark.line, position.end_mark.column) == (0, 9)
+
+
+def test_released_errors_match():
+    loader = Loader(TEXT)
+    released = ReleasingLoader(TEXT)
+
+    assert [e.as_dict() for e in released.errors] == [e.as_dict() for e in loader.errors]
+    assert released.as_text() == loader.as_text()
+    assert released.as_dict() == loader.as_dict()
+
+
+def test_released_tree_has_no_yaml_nodes():
+    loader = ReleasingLoader(TEXT)
+    assert len(loader.positions) == 7
+
+    stack = [loader.config_root]
+    while stack:
+        node = stack.pop()
+        assert isinstance(node._value_node, Position)
+        for error in node._errors:
+            assert not isinstance(error.error_obj, yaml.Node)
+        stack.extend(node._child_nodes())
+
+
+def test_released_node_graph_is_freed(monkeypatch):
+    refs = []
+
+    def parse(*args, **kwargs):
+        data, node = yaml_parse(*args, **kwargs)
+        refs.append(weakref.ref(node))
+        return data, node
+
+    yaml_parse = loader_module.parse
+    monkeypatch.setattr(loader_module, 'parse', parse)
+
+    loader = ReleasingLoader(TEXT)
+    gc.collect()
+    assert refs[0]() is None
+    assert loader.config_root.numbers[1]._value == 'two'
+
+
+def test_add_error_after_release():
+    loader = ReleasingLoader(TEXT)
+    loader.config_root.count._add_error(title='Too many', description='Count is too high')
+
+    error = loader.errors[-1]
+    assert error.title == 'Too many'
+    assert (error.start_line, error.start_column, error.end_line, error.end_column) == (4, 7, 4, 8)
@@ -0,0 +1,236 @@
+from __future__ import unicode_literals
+
+import abc
+
+import pytest
+
+from configyaml.config import ChoiceNode
+from configyaml.config import DictNode
+from configyaml.config import ListNode
+from configyaml.config import StringNode
+from configyaml.config import WildcardDictNode
+from configyaml.config.base import NodeMeta
+from configyaml.config.schema import DictSchema
+
+
+class ClassFields(DictNode):
+    _dict_fields = {
+        'name': {
+            'class': StringNode,
+            'required': True,
+        },
+        'kind': {
+            'class': StringNode,
+            'default': 'basic',
+        },
+    }
+
+
+class InitFields(DictNode):
+    def __init__(self, *args, **kwargs):
+        self._dict_fields = {
+            'name': {
+                'class': StringNode,
+            },
+        }
+        super(InitFields, self).__init__(*args, **kwargs)
+
+
+class ClassStrings(WildcardDictNode):
+    _dict_fields = {
+        '*': {
+            'class': StringNode,
+        },
+    }
+
+
+class ClassList(ListNode):
+    _list_item_class = StringNode
+    _min_items_required = 1
+
+
+class ClassChoice(ChoiceNode):
+    _choices = ['foo', 'bar']
+
+
+class MutableDefault(DictNode):
+    _dict_fields = {
+        'tags': {
+            'class': ClassList,
+            'default': [],
+        },
+    }
+
+
+class Tree(DictNode):
+    pass
+
+
+def test_class_schema_compiled_once():
+    schema = ClassFields._schema
+    assert isinstance(schema, DictSchema)
+    assert schema.required == ('name',)
+    assert schema.defaults == (('kind', StringNode, 'basic'),)
+    assert schema.available_fields == 'kind, name'
+
+    node = ClassFields(value={'name': 'test'})
+    assert node.is_valid()
+    assert node.kind._value == 'basic'
+    assert node._get_schema() is schema
+
+
+def test_class_schema_errors():
+    node = ClassFields(value={'other': 'test'})
+    assert [e.title for e in node._errors] == ['Required field is missing', 'Invalid key']
+    assert node._errors[1].description == 'Available fields are: kind, name'
+
+
+def test_init_schema_reused():
+    first = InitFields(value={'name': 'test'})
+    second = InitFields(value={})
+    assert first.is_valid()
+    assert second.is_valid()
+    assert first._get_schema() is second._get_schema()
+    assert InitFields._schema is None
+
+
+def test_init_schema_changed():
+    node = InitFields(value={})
+    node._dict_fields = {'other': {'class': StringNode}}
+    assert node._get_schema().available_fields == 'other'
+
+
+class CountingFields(dict):
+    comparisons = 0
+
+    def __eq__(self, other):
+        CountingFields.comparisons += 1
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+
+class CountedInitFields(DictNode):
+    def __init__(self, *args, **kwargs):
+        self._dict_fields = CountingFields(name={'class': StringNode})
+        super(CountedInitFields, self).__init__(*args, **kwargs)
+
+
+def test_init_schema_kept_by_the_instance():
+    CountedInitFields(value={'name': 'test'})
+    node = CountedInitFields(value={'name': 'test'})
+    schema = node._get_schema()
+
+    # compared with the schema of the first instance once, then kept
+    CountingFields.comparisons = 0
+    assert node._get_schema() is schema
+    node._as_dict()
+    assert CountingFields.comparisons == 0
+
+
+class ABCNodeMeta(NodeMeta, abc.ABCMeta):
+    pass
+
+
+def test_node_class_with_another_metaclass():
+    # created with the metaclass the same way in python 2 and 3
+    Abstract = ABCNodeMeta(str('Abstract'), (StringNode,), {'check': abc.abstractmethod(lambda self: None)})
+    with pytest.raises(TypeError):
+        Abstract(value='a')
+
+    Concrete = ABCNodeMeta(str('Concrete'), (Abstract,), {'check': lambda self: None})
+    assert Concrete(value='a').is_valid()
+    assert isinstance(Concrete(value='a'), Abstract)
+
+
+def test_missing_dict_fields():
+    with pytest.raises(AttributeError):
+        DictNode(value={'name': 'test'})
+
+
+def test_invalid_schema_raises_at_class_creation():
+    with pytest.raises(TypeError):
+        class MissingClass(DictNode):
+            _dict_fields = {'name': {'required': True}}
+
+    with pytest.raises(TypeError):
+        class NotANode(DictNode):
+            _dict_fields = {'name': {'class': str}}
+
+    with pytest.raises(TypeError):
+        class BadListClass(ListNode):
+            _list_item_class = dict
+
+    with pytest.raises(TypeError):
+        class BadMinimum(ListNode):
+            _list_item_class = StringNode
+            _min_items_required = -1
+
+
+def test_class_wildcard():
+    node = ClassStrings(value={'a': 'x', 'b': 1})
+    assert node.is_valid()
+    assert node['a'].is_valid()
+    assert not node['b'].is_valid()
+
+
+def test_class_list():
+    assert not ClassList(value=[]).is_valid()
+    assert len(ClassList(value=['a', 'b'])) == 2
+
+
+def test_class_choice():
+    assert ClassChoice(value='foo').is_valid()
+
+    node = ClassChoice(value='baz')
+    assert not node.is_valid()
+    assert node._errors[0].description == 'Must be one of foo, bar'
+
+
+def test_unknown_options_warn():
+    with pytest.warns(UserWarning, match='requried'):
+        class UnknownOption(DictNode):
+            _dict_fields = {'name': {'class': StringNode, 'requried': True}}
+
+    node = UnknownOption(value={})
+    assert node.is_valid()
+
+
+def test_class_schema_returned_directly():
+    class Unslotted(ClassFields):
+        pass
+
+    node = Unslotted(value={'name': 'test'})
+    assert node._get_schema() is Unslotted._schema
+    assert Unslotted._instance_schema is None
+
+
+def test_schema_declared_after_the_class():
+    class Branch(Tree):
+        pass
+
+    Tree._dict_fields = {
+        'name': {
+            'class': StringNode,
+        },
+        'child': {
+            'class': Tree,
+        },
+    }
+    assert Tree._schema.available_fields == 'child, name'
+    assert Branch._schema.available_fields == 'child, name'
+
+    node = Tree(value={'child': {'name': 'x'}})
+    assert node.is_valid()
+    assert node._get_schema() is Tree._schema
+
+
+def test_mutable_defaults_copied():
+    first = MutableDefault(value={})
+    second = MutableDefault(value={})
+    first.tags._value.append('x')
+    assert second.tags._value == []
+    assert MutableDefault._dict_fields['tags']['default'] == []
@@ -0,0 +1,170 @@
+from __future__ import unicode_literals
+
+import datetime
+import io
+import json
+
+import pytest
+
+from configyaml.config import DictNode
+from configyaml.config import IntegerNode
+from configyaml.config import ListNode
+from configyaml.config import StringNode
+from configyaml.config import TypelessNode
+from configyaml.config import WildcardDictNode
+from configyaml.loader import ConfigLoader
+from configyaml.serialize import iter_json
+
+
+class Labels(WildcardDictNode):
+    _dict_fields = {
+        '*': {
+            'class': StringNode,
+        },
+    }
+
+
+class Tagged(StringNode):
+    def _as_dict_to_inject(self, redact=False):
+        return {'tag': 'tagged', 'redacted_too': redact}
+
+
+class Custom(StringNode):
+    def _as_dict(self, redact=False):
+        return {'custom': self._value}
+
+
+class Item(DictNode):
+    _dict_fields = {
+        'name': {
+            'class': Tagged,
+            'required': True,
+        },
+        'count': {
+            'class': IntegerNode,
+        },
+        'labels': {
+            'class': Labels,
+        },
+        'custom': {
+            'class': Custom,
+        },
+        'anything': {
+            'class': TypelessNode,
+        },
+    }
+
+
+class Items(ListNode):
+    _list_item_class = Item
+
+
+class Root(DictNode):
+    _dict_fields = {
+        'items': {
+            'class': Items,
+        },
+        'secret': {
+            'class': StringNode,
+        },
+        'empty': {
+            'class': Labels,
+        },
+    }
+
+
+class Loader(ConfigLoader):
+    config_root_class = Root
+
+
+TEXT = """\
+items:
+- name: one
+  count: many
+  labels: {a: b, 1: c, true: d}
+- name: $name
+  custom: x
+  anything: {nested: [1, 2.5, null]}
+- count: 3
+secret: $secret
+empty: {}
+typo: 1
+"""
+
+VARIABLES = {'name': 'two', 'secret': 'hunter2'}
+
+
+def as_json(loader, **kwargs):
+    return json.loads(''.join(loader.iter_json(**kwargs)))
+
+
+@pytest.mark.parametrize('redact', [False, True])
+def test_iter_json_matches_as_dict(redact):
+    loader = Loader(TEXT, variables=VARIABLES)
+    assert as_json(loader, redact=redact) == json.loads(json.dumps(loader.as_dict(redact=redact)))
+
+
+def test_iter_json_redacts():
+    loader = Loader(TEXT, variables=VARIABLES)
+    config = as_json(loader, redact=True)['config']
+    assert config['secret'] == {'value': '[REDACTED]', 'redacted': True}
+    assert config['items']['items'][1]['name'] == {'value': '[REDACTED]', 'redacted': True, 'tag': 'tagged', 'redacted_too': True}
+
+
+def test_iter_json_without_text():
+    loader = Loader(TEXT, variables=VARIABLES)
+    d = as_json(loader, include_text=False)
+    assert 'config_text' not in d
+    assert len(d['errors']) == 3
+
+
+def test_iter_json_omit_valid_leaves():
+    loader = Loader(TEXT, variables=VARIABLES)
+    config = as_json(loader, include_text=False, omit_valid_leaves=True)['config']
+
+    assert 'secret' not in config
+    first, second, third = config['items']['items']
+    assert sorted(first) == ['count', 'labels']
+    assert first['count']['value'] == 'many'
+    assert first['labels'] == {}
+    assert second == {'custom': {'custom': 'x'}}
+    assert [x['title'] for x in third['errors']] == ['Required field is missing']
+
+
+def test_iter_json_chunks():
+    loader = Loader(TEXT, variables=VARIABLES)
+    chunks = list(iter_json(loader, chunk_size=10))
+    assert len(chunks) > 1
+    assert all(len(x) >= 10 for x in chunks[:-1])
+    assert json.loads(''.join(chunks)) == as_json(loader)
+
+
+def test_write_json():
+    loader = Loader(TEXT, variables=VARIABLES)
+    f = io.StringIO()
+    loader.write_json(f, include_text=False)
+    assert json.loads(f.getvalue()) == as_json(loader, include_text=False)
+
+
+def test_iter_json_default():
+    class AnythingRoot(DictNode):
+        _dict_fields = {
+            'day': {
+                'class': TypelessNode,
+            },
+        }
+
+    class AnythingLoader(ConfigLoader):
+        config_root_class = AnythingRoot
+
+    loader = AnythingLoader('day: 2019-09-02')
+    assert loader.config_root.day._value == datetime.date(2019, 9, 2)
+
+    with pytest.raises(TypeError):
+        as_json(loader)
+    assert as_json(loader, default=str)['config'] == {'day': {'value': '2019-09-02'}}
+
+
+def test_iter_json_without_root():
+    loader = Loader('')
+    assert as_json(loader) == json.loads(json.dumps(loader.as_dict()))
@@ -0,0 +1,123 @@
+from __future__ import unicode_literals
+
+import sys
+
+import pytest
+
+from configyaml.config import BoolNode
+from configyaml.config import ChoiceNode
+from configyaml.config import DictNode
+from configyaml.config import IntegerNode
+from configyaml.config import ListNode
+from configyaml.config import PositiveIntegerNode
+from configyaml.config import RegexNode
+from configyaml.config import SlottedDictNode
+from configyaml.config import SlottedStringNode
+from configyaml.config import SlottedWildcardDictNode
+from configyaml.config import StringNode
+from configyaml.config import TypelessNode
+from configyaml.config import WildcardDictNode
+
+
+class SlottedString(SlottedStringNode):
+    __slots__ = ()
+
+
+class UnslottedString(StringNode):
+    pass
+
+
+class SlottedConfig(SlottedDictNode):
+    __slots__ = ()
+    _dict_fields = {
+        'foo': {
+            'class': SlottedString,
+        },
+        'bar': {
+            'class': SlottedString,
+            'default': 'baz',
+        },
+    }
+
+
+class SlottedWildcard(SlottedWildcardDictNode):
+    __slots__ = ()
+    _dict_fields = {
+        '*': {
+            'class': SlottedString,
+        },
+    }
+
+
+class Config(DictNode):
+    _dict_fields = {
+        'foo': {
+            'class': StringNode,
+        },
+    }
+
+
+def test_slotted_nodes_have_no_dict():
+    config = SlottedConfig(value={'foo': 'x'})
+    assert config.is_valid()
+    assert not hasattr(config, '__dict__')
+    assert not hasattr(config.foo, '__dict__')
+
+
+def test_slotted_nodes_are_smaller():
+    slotted = SlottedString(value='x')
+    unslotted = UnslottedString(value='x')
+    assert sys.getsizeof(slotted) < sys.getsizeof(unslotted) + sys.getsizeof(unslotted.__dict__)
+
+
+def test_slotted_dict_attribute_access():
+    config = SlottedConfig(value={'foo': 'x'})
+    assert config.foo is config['foo']
+    assert config.bar._value == 'baz'
+    assert not hasattr(config, 'missing')
+
+
+def test_wildcard_children_are_not_attributes():
+    config = SlottedWildcard(value={'foo': 'x'})
+    assert config['foo']._value == 'x'
+    assert not hasattr(config, 'foo')
+
+
+def test_unslotted_subclass_keeps_dict():
+    config = Config(value={'foo': 'x'})
+    assert config.__dict__['foo'] is config.foo
+    config.custom = 1
+    assert config.custom == 1
+
+
+class Strings(ListNode):
+    _list_item_class = StringNode
+
+
+class Choice(ChoiceNode):
+    _choices = ['a']
+
+
+@pytest.mark.parametrize('node_class, value', [
+    (StringNode, 'x'),
+    (IntegerNode, 1),
+    (PositiveIntegerNode, 1),
+    (BoolNode, True),
+    (TypelessNode, None),
+    (RegexNode, 'x+'),
+    (Config, {'foo': 'x'}),
+    (WildcardDictNode, {}),
+    (Strings, ['x']),
+    (Choice, 'a'),
+])
+def test_library_nodes_keep_dict(node_class, value):
+    node = node_class(value=value)
+    assert node.is_valid()
+    node.custom = 1
+    assert node.custom == 1
+
+
+def test_library_node_subclasses_unchanged():
+    assert issubclass(RegexNode, StringNode)
+    assert issubclass(PositiveIntegerNode, IntegerNode)
+    assert issubclass(WildcardDictNode, DictNode)
@@ -0,0 +1,155 @@
+from __future__ import unicode_literals
+
+import json
+import time
+
+from configyaml.cache import LoadCache
+from configyaml.config import DictNode
+from configyaml.config import ListNode
+from configyaml.config import StringNode
+from configyaml.loader import ConfigLoader
+from configyaml.timings import LoadTimings, NodeProfiler
+
+
+class Names(ListNode):
+    _list_item_class = StringNode
+
+
+class Root(DictNode):
+    _dict_fields = {
+        'names': {
+            'class': Names,
+        },
+    }
+
+
+class TimedLoader(ConfigLoader):
+    config_root_class = Root
+    timings_class = LoadTimings
+
+
+class RecordingTimings(LoadTimings):
+    def __init__(self):
+        super(RecordingTimings, self).__init__()
+        self.recorded = []
+
+    def record_phase(self, name, seconds):
+        self.recorded.append(name)
+        super(RecordingTimings, self).record_phase(name, seconds)
+
+
+def test_phases_recorded():
+    loader = TimedLoader('names: [a, b, [c]]')
+    assert loader.error_count == 1
+
+    phases = loader.timings.phases
+    assert list(phases) == ['compose', 'construct', 'parse', 'build', 'load', 'errors']
+    assert all(count == 1 and seconds >= 0 for count, seconds in phases.values())
+    assert phases['load'][1] >= phases['parse'][1] + phases['build'][1]
+
+
+def test_node_classes_recorded():
+    loader = TimedLoader('names: [a, b, [c]]')
+    node_classes = loader.timings.node_classes
+    assert node_classes[StringNode]['instances'] == 3
+    # the list item isn't a string, so it isn't validated further
+    assert node_classes[StringNode]['_validate_value'][0] == 2
+    assert node_classes[Names]['_validate_value'][0] == 1
+
+    data = json.loads(json.dumps(loader.timings.as_dict()))
+    assert data['node_classes']['configyaml.config.nodes.StringNode']['instances'] == 3
+    assert 'tests.test_timings.Names' in loader.timings.report()
+
+    # looked up once by the root, and shared by the tree
+    assert all(node._timings is loader.timings for node, _, _ in loader.config_root._iter_preorder())
+
+
+def test_timings_off_by_default():
+    class Loader(ConfigLoader):
+        config_root_class = Root
+
+    loader = Loader('names: [a]')
+    assert loader.timings is None
+    assert loader.config_root.names[0]._timings is None
+
+
+def test_timings_subclass_and_cache():
+    class Loader(TimedLoader):
+        timings_class = RecordingTimings
+        load_cache = LoadCache()
+
+    Loader('names: [a]')
+    loader = Loader('names: [a]')
+    assert loader.timings.recorded == ['cache', 'load']
+    assert loader.timings.node_classes == {}
+
+
+class Slow(StringNode):
+    def _validate_value(self):
+        time.sleep(0.01)
+
+
+class SlowNames(ListNode):
+    _list_item_class = Slow
+
+
+class Injecting(DictNode):
+    _dict_fields = {
+        'names': {
+            'class': SlowNames,
+        },
+        'other': {
+            'class': StringNode,
+        },
+    }
+
+    def _context_to_inject(self):
+        return {'count': len(self._value)}
+
+
+class Loader(ConfigLoader):
+    config_root_class = Injecting
+
+
+class ProfiledLoader(Loader):
+    timings_class = NodeProfiler
+
+
+def test_profiler_by_class():
+    loader = ProfiledLoader('names: [a, b]\nother: c')
+    rows = loader.timings.rows(by='class')
+
+    assert rows[0]['name'] == 'tests.test_timings.Slow'
+    assert rows[0]['calls'] == 2 * 4
+    assert rows[0]['seconds'] >= 0.02
+    # the time of the items isn't counted again in the list
+    assert rows[1]['seconds'] < 0.01
+
+    injecting = [row for row in rows if row['name'] == 'tests.test_timings.Injecting'][0]
+    assert injecting['calls'] == 4
+
+
+def test_profiler_by_path():
+    with NodeProfiler() as profiler:
+        Loader('names: [a, b]\nother: c')
+
+    paths = [row['name'] for row in profiler.rows(by='path')]
+    assert sorted(paths[:2]) == ['injecting.names.0', 'injecting.names.1']
+    assert set(paths[2:]) == set(['injecting', 'injecting.names', 'injecting.other'])
+
+    collapsed = NodeProfiler(collapse_indexes=True)
+    with collapsed:
+        Loader('names: [a, b]\nother: c')
+    assert collapsed.rows(by='path')[0]['name'] == 'injecting.names.*'
+    assert collapsed.rows(by='path')[0]['calls'] == 8
+
+
+def test_profiler_export():
+    loader = ProfiledLoader('names: [a]')
+    data = json.loads(json.dumps(loader.timings.as_dict()))
+    assert data['classes'][0]['name'] == 'tests.test_timings.Slow'
+    assert data['paths'][0]['name'] == 'injecting.names.0'
+
+    report = loader.timings.report(by='path', limit=1).splitlines()
+    assert len(report) == 2
+    assert report[1].startswith('injecting.names.0 ')
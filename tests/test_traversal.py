@@ -0,0 +1,254 @@
+from __future__ import unicode_literals
+
+import json
+import sys
+
+from configyaml.config import DictNode
+from configyaml.config import IntegerNode
+from configyaml.config import ListNode
+from configyaml.config import StringNode
+from configyaml.config import WildcardDictNode
+from configyaml.loader import ConfigLoader
+from configyaml.parser import HAS_LIBYAML
+
+
+class Labels(WildcardDictNode):
+    _dict_fields = {
+        '*': {
+            'class': StringNode,
+        },
+    }
+
+
+class Item(DictNode):
+    _dict_fields = {
+        'name': {
+            'class': StringNode,
+        },
+        'count': {
+            'class': IntegerNode,
+        },
+    }
+
+
+class Items(ListNode):
+    _list_item_class = Item
+
+
+class Upper(StringNode):
+    def _as_dict(self, redact=False):
+        d = super(Upper, self)._as_dict(redact=redact)
+        d['value'] = d['value'].upper()
+        return d
+
+
+class Root(DictNode):
+    _dict_fields = {
+        'items': {
+            'class': Items,
+        },
+        'labels': {
+            'class': Labels,
+        },
+        'title': {
+            'class': Upper,
+        },
+    }
+
+
+class Loader(ConfigLoader):
+    config_root_class = Root
+
+
+TEXT = """\
+items:
+- name: one
+  count: 1
+- name: two
+  count: two
+labels: {a: b}
+title: hello
+"""
+
+
+class Nested(DictNode):
+    pass
+
+
+Nested._dict_fields = {
+    'name': {
+        'class': StringNode,
+    },
+    'child': {
+        'class': Nested,
+    },
+}
+
+
+class NestedLoader(ConfigLoader):
+    config_root_class = Nested
+
+
+def test_iter_preorder():
+    root = Loader(TEXT).config_root
+    walked = [(path, depth) for _, path, depth in root._iter_preorder()]
+    assert walked == [
+        (('root',), 0),
+        (('root', 'items'), 1),
+        (('root', 'items', 0), 2),
+        (('root', 'items', 0, 'name'), 3),
+        (('root', 'items', 0, 'count'), 3),
+        (('root', 'items', 1), 2),
+        (('root', 'items', 1, 'name'), 3),
+        (('root', 'items', 1, 'count'), 3),
+        (('root', 'labels'), 1),
+        (('root', 'labels', 'a'), 2),
+        (('root', 'title'), 1),
+    ]
+
+    for node, path, _ in root._iter_preorder():
+        assert '.'.join(str(x) for x in path) == node._path()
+
+
+def test_iter_postorder():
+    root = Loader(TEXT).config_root
+    paths = [path for _, path, _ in root._iter_postorder()]
+    assert paths[:4] == [
+        ('root', 'items', 0, 'name'),
+        ('root', 'items', 0, 'count'),
+        ('root', 'items', 0),
+        ('root', 'items', 1, 'name'),
+    ]
+    assert paths[-1] == ('root',)
+    assert sorted(paths) == sorted(path for _, path, _ in root._iter_preorder())
+
+
+def test_iter_from_a_descendant():
+    root = Loader(TEXT).config_root
+    walked = [(node._value, path, depth) for node, path, depth in root.labels._iter_preorder()]
+    assert walked == [({'a': 'b'}, ('labels',), 0), ('b', ('labels', 'a'), 1)]
+
+
+def test_iter_without_paths():
+    root = Loader(TEXT).config_root
+    assert {path for _, path, _ in root._iter_preorder(paths=False)} == {None}
+    assert {path for _, path, _ in root._iter_postorder(paths=False)} == {None}
+
+
+def test_iter_descend():
+    root = Loader(TEXT).config_root
+
+    def descend(node):
+        return not isinstance(node, Items)
+
+    assert [path for _, path, _ in root._iter_preorder(descend=descend)] == [
+        ('root',),
+        ('root', 'items'),
+        ('root', 'labels'),
+        ('root', 'labels', 'a'),
+        ('root', 'title'),
+    ]
+    assert [path for _, path, _ in root._iter_postorder(descend=descend)][:2] == [
+        ('root', 'items'),
+        ('root', 'labels', 'a'),
+    ]
+
+
+def test_iter_builds_lazy_children():
+    class LazyLoader(Loader):
+        lazy = True
+
+    root = LazyLoader(TEXT).config_root
+    assert len(list(root._iter_preorder())) == len(list(Loader(TEXT).config_root._iter_preorder()))
+
+
+def test_errors():
+    loader = Loader(TEXT)
+    root = loader.config_root
+    count = root.items[1].count
+    assert root._get_all_errors() == count._errors
+    assert root._get_descendants_errors() == count._errors
+    assert count._get_descendants_errors() == []
+    assert root._count_all_errors() == 1
+
+
+def test_as_dict_uses_overrides():
+    loader = Loader(TEXT)
+    config = loader.as_dict()['config']
+    assert config['title'] == {'value': 'HELLO'}
+    assert config['items']['items'][0] == {'name': {'value': 'one'}, 'count': {'value': 1}}
+    assert config['labels'] == {'a': {'value': 'b'}}
+    assert json.loads(''.join(loader.iter_json())) == json.loads(json.dumps(loader.as_dict()))
+
+
+def test_deeper_than_the_recursion_limit():
+    depth = sys.getrecursionlimit() + 500
+    text = 'name: top\n' + ''.join('{}child:\n{}  name: n\n'.format('  ' * i, '  ' * i) for i in range(depth))
+    text += '  ' * depth + 'typo: 1\n'
+
+    if HAS_LIBYAML:
+        loader = NestedLoader(text)
+    else:
+        # only the python parser recurses
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(depth * 20)
+        try:
+            loader = NestedLoader(text)
+        finally:
+            sys.setrecursionlimit(limit)
+
+    root = loader.config_root
+    deepest, path, deepest_depth = list(root._iter_preorder())[-1]
+    assert deepest_depth == depth + 1
+    assert len(path) == depth + 2
+    assert deepest._path() == '.'.join(path)
+
+    errors = root._get_all_errors()
+    assert [x.title for x in errors] == ['Invalid key']
+    assert root._get_descendants_errors() == errors
+    assert root._count_all_errors() == 1
+
+    config = loader.as_dict()['config']
+    for _ in range(depth):
+        config = config['child']
+    assert config['name'] == {'value': 'n'}
+    assert config['errors'][0]['title'] == 'Invalid key'
+
+    # (too deep for json.loads)
+    text = ''.join(loader.iter_json(include_text=False))
+    assert text.startswith('{"config": {"name": {"value": "top"}, "child": {"name": {"value": "n"}, "child": ')
+    assert text.count('"title": "Invalid key"') == 2
+
+    assert loader.as_text().count('# Invalid key') == 1
+
+
+def test_build_order():
+    class Names(ListNode):
+        _list_item_class = StringNode
+
+        def _context_to_inject(self):
+            return {'names': self._context.get('names', ()) + tuple(x._value for x in self._children)}
+
+    class Reader(StringNode):
+        def _validate_value(self):
+            self._add_error(title='Seen', description=', '.join(self._context.get('names', ())))
+
+    class Group(DictNode):
+        _dict_fields = {
+            'names': {
+                'class': Names,
+            },
+            'reader': {
+                'class': Reader,
+            },
+        }
+
+    class Groups(ListNode):
+        _list_item_class = Group
+
+    class GroupsLoader(ConfigLoader):
+        config_root_class = Groups
+
+    # each subtree is built, and injects, before the next sibling is created
+    loader = GroupsLoader('- names: [a]\n  reader: x\n- reader: y\n  names: [b]\n- reader: z\n')
+    assert [x.description for x in loader.errors] == ['a', 'a', 'a, b']
@@ -1,6 +1,9 @@
 import pytest
 
-from configyaml.validator import ConfigValidator
+from configyaml.config import DictNode
+from configyaml.config import StringNode
+from configyaml.loader import ConfigLoader
+from configyaml.validator import ConfigValidator, ValidationStats
 
 
 def test_invalid_configvalidator_subclass():
@@ -9,3 +12,67 @@ def test_invalid_configvalidator_subclass():
 
     with pytest.raises(AttributeError):
         InvalidConfigValidator(config_text="foo: bar")
+
+
+class Name(StringNode):
+    def _context_to_inject(self):
+        return {'name': self._value}
+
+
+class Root(DictNode):
+    _dict_fields = {
+        'name': {
+            'class': Name,
+            'required': True,
+        },
+    }
+
+
+class Loader(ConfigLoader):
+    config_root_class = Root
+
+
+class Validator(ConfigValidator):
+    configyaml_class = Loader
+    context = {'dummy': True}
+
+
+TEXTS = ['name: a', 'name: [b]', 'other: c', 'name: d']
+
+
+def test_validate_many_in_process():
+    stats = ValidationStats()
+    results = list(Validator.validate_many(TEXTS, workers=1, stats=stats))
+
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert [r.is_valid() for r in results] == [True, False, False, True]
+    assert results[1].errors == [x.as_dict() for x in Validator(TEXTS[1]).errors]
+    assert stats.as_dict()['count'] == 4
+    assert stats.invalid == 2
+    assert stats.errors == 3
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_validate_many_in_pool(ordered):
+    stats = ValidationStats()
+    results = list(Validator.validate_many(iter(TEXTS * 10), workers=2, ordered=ordered, chunksize=3, stats=stats))
+
+    if ordered:
+        assert [r.index for r in results] == list(range(40))
+    results.sort()
+
+    expected = list(Validator.validate_many(TEXTS * 10, workers=1))
+    assert results == expected
+    assert stats.count == 40
+    assert stats.per_second > 0
+
+
+def test_validate_many_stops_early():
+    results = Validator.validate_many(TEXTS * 100, workers=2)
+    assert next(results).index == 0
+    results.close()
+
+
+def test_context_not_shared_between_validations():
+    Validator('name: a')
+    assert Validator.context == {'dummy': True}
@@ -1,4 +1,5 @@
 from __future__ import unicode_literals
+import io
 import sys
 
 from configyaml.config import AbstractNode
@@ -234,3 +235,42 @@ alist:
     - two
     - three"""
     assert expected_error == config.as_text()
+
+
+def test_iter_text_matches_as_text():
+    text = """\
+deadbeef: deadbeef
+alist:
+    - one
+    - two
+    - three
+"""
+    config = ProjectLoader(text)
+    assert ''.join(config.iter_text()) == config.as_text()
+
+    output = io.StringIO()
+    config.write_text(output)
+    assert output.getvalue() == config.as_text()
+
+
+def test_iter_text_valid():
+    text = "string_var: stringy\nint_var: 8\n"
+    config = DummyLoader(text)
+    assert config.is_valid()
+    assert ''.join(config.iter_text()) == text
+
+    output = io.StringIO()
+    config.write_text(output)
+    assert output.getvalue() == text
+
+
+def test_as_text_groups_errors_once(monkeypatch):
+    text = '\n'.join('key_{}: value'.format(i) for i in range(200))
+    config = ProjectLoader(text)
+    config.errors
+
+    def fail():
+        raise AssertionError('errors should not be collected again')
+
+    monkeypatch.setattr(config.config_root, '_iter_all_errors', fail)
+    assert config.as_text().count('# Invalid key') == 200